@@ -0,0 +1,106 @@
+"""Pack the hourly quote files into one random-access file for the Pico.
+
+Usage: python data/build_pack.py [quotes_gz dir] [output]
+       (defaults: data/quotes_gz -> data/quotes.pack)
+
+Layout (all integers little-endian), read by src/quotepack.py:
+
+    b"QPK2"
+    1441 x u32   offset of each minute's block (minute = h * 60 + m),
+                 then the end of the last block; equal offsets = no quotes
+    blocks       one raw-deflate stream per minute, 1 KB window (wbits 10,
+                 the default window of MicroPython's deflate RAW reader)
+
+A block inflates to:
+
+    u8 count, then per quote:
+    u8 flags (bit 0 = nsfw), u8 scale, u16 annot start, u16 annot end,
+    u8 line count, (u16 start, u16 end) per line,
+    then title, author and text, each as u16 byte length + ASCII
+
+text is prefix + annot + suffix normalised for bitmap8, and the lines and
+scale come from src/quotelayout.py, so the device just draws them; the
+annot offsets mark the time phrase for highlighting.
+
+Blocks are compressed independently, so one minute costs one seek and one
+small decompress instead of inflating and parsing a whole hour.
+"""
+
+import gzip
+import json
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import quotelayout
+
+MAGIC = b"QPK2"
+MINUTES = 1440
+WBITS = 10
+
+
+def _string(s):
+    data = s.encode()
+    return struct.pack("<H", len(data)) + data
+
+
+def encode_minute(q):
+    """One minute's {"annot": [...], ...} lists as an uncompressed block."""
+    n = len(q["annot"])
+    out = bytearray([n])
+    for i in range(n):
+        text, a0, a1, scale, lines = quotelayout.layout(q["prefix"][i], q["annot"][i], q["suffix"][i])
+        out.append(1 if q["nsfw"][i] == "nsfw" else 0)
+        out += struct.pack("<BHHB", scale, a0, a1, len(lines))
+        for start, end in lines:
+            out += struct.pack("<HH", start, end)
+        out += _string(quotelayout.normalize(q["title"][i]))
+        out += _string(quotelayout.normalize(q["author"][i]))
+        out += _string(text)
+    return bytes(out)
+
+
+def compress(block):
+    c = zlib.compressobj(9, zlib.DEFLATED, -WBITS)
+    return c.compress(block) + c.flush()
+
+
+def build(src_dir, out_path):
+    """Write the pack; returns (quotes, bytes written)."""
+    blocks = [b""] * MINUTES
+    quotes = 0
+    for hour in range(24):
+        with gzip.open(Path(src_dir) / ("%02d.json.gz" % hour), "rt", encoding="utf-8") as f:
+            hour_quotes = json.load(f)
+        for key, q in hour_quotes.items():
+            h, m = key.split(":")
+            blocks[int(h) * 60 + int(m)] = compress(encode_minute(q))
+            quotes += len(q["annot"])
+
+    offsets = []
+    pos = len(MAGIC) + 4 * (MINUTES + 1)
+    for b in blocks:
+        offsets.append(pos)
+        pos += len(b)
+    offsets.append(pos)
+
+    with open(out_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<%dI" % len(offsets), *offsets))
+        for b in blocks:
+            f.write(b)
+    return quotes, pos
+
+
+def main():
+    here = Path(__file__).parent
+    src = sys.argv[1] if len(sys.argv) > 1 else here / "quotes_gz"
+    out = sys.argv[2] if len(sys.argv) > 2 else here / "quotes.pack"
+    quotes, size = build(src, out)
+    print(f"{out}: {quotes} quotes, {size:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Build the hourly quote files (quotes_gz/HH.json.gz) from the quote list.
+
+Usage: python data/build_quotes.py [--source CSV|JSON] [--out DIR]
+                                   [--jobs N] [--force]
+
+This is the pipeline from index.ipynb as a script:
+
+    source   litclock_annotated.csv from JohannesNE/literature-clock
+             (time|annot|quote|title|author|nsfw, a path or URL), or
+             data/quotes.json, the notebook's all-hours output where each
+             quote is already split (the default, as it is in the repo)
+    split    quote -> prefix + annot + suffix, annot matched ignoring case
+             (the notebook's split_quote(), vectorised)
+    hours    one {"HH:MM": {"annot": [...], ...}} JSON object per hour,
+             quote column dropped, gzipped at compresslevel 9
+
+When the source is the CSV, data/quotes.json is rewritten too.
+
+Builds are incremental: each hour's rows are hashed and an hour is only
+re-encoded when its hash, or the build settings, differ from the last run
+(recorded in data/.build_quotes.json), or its output file is missing.
+Changed hours are encoded in a process pool. Output is byte-for-byte
+deterministic, and a rebuild reproduces the committed files: the same
+gzip level, mtime and file name in the header, rows in source order within
+each minute. --level 1 is there for quick local builds, but its files
+are bigger: don't commit them, they go on the Pico's flash.
+
+Requires pandas and NumPy >= 2.3 (see the dev dependency group).
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+HERE = Path(__file__).parent
+CSV_URL = "https://raw.githubusercontent.com/JohannesNE/literature-clock/master/litclock_annotated.csv"
+CSV_COLUMNS = ["time", "annot", "quote", "title", "author", "nsfw"]
+COLUMNS = ["time", "annot", "title", "author", "nsfw", "prefix", "suffix"]
+
+LEVEL = 9  # as the committed files are; --level 1 files are ~14% bigger
+MTIME = 1713743932  # the committed files' gzip timestamp, so rebuilds match them
+# Bump when the output format changes, to force a full rebuild
+VERSION = 1
+
+
+def split_quotes(df):
+    """df with the quote column split into prefix and suffix around annot.
+
+    Finds annot in quote with one case-insensitive search over the whole
+    column; the few rows where lowercasing changes the string's length (so
+    offsets wouldn't line up) fall back to the notebook's re.split.
+    """
+    S = np.dtypes.StringDType()
+    quote = np.asarray(df["quote"], dtype=S)
+    annot = np.asarray(df["annot"], dtype=S)
+    lower = np.strings.lower(quote)
+    start = np.strings.find(lower, np.strings.lower(annot))
+    end = start + np.strings.str_len(annot)
+    prefix = np.strings.slice(quote, 0, start)
+    suffix = np.strings.slice(quote, end, None)
+
+    odd = np.flatnonzero(np.strings.str_len(lower) != np.strings.str_len(quote))
+    for i in odd:
+        parts = re.split(re.escape(str(annot[i])), str(quote[i]), maxsplit=1, flags=re.IGNORECASE)
+        start[i] = 0 if len(parts) == 2 else -1
+        if len(parts) == 2:
+            prefix[i], suffix[i] = parts
+
+    missing = np.flatnonzero(start < 0)
+    if len(missing):
+        rows = df.iloc[missing]
+        raise ValueError(
+            f"{len(missing)} quotes don't contain their annot, e.g. "
+            + "; ".join(f"{t} {a!r}" for t, a in zip(rows["time"][:5], rows["annot"][:5]))
+        )
+
+    out = df.drop(columns=["quote"])
+    out["prefix"] = prefix.astype(object)
+    out["suffix"] = suffix.astype(object)
+    return out
+
+
+def read_source(source):
+    """The quotes as a frame with COLUMNS, one row per quote."""
+    source = str(source)
+    if source.endswith(".json"):
+        with open(source, encoding="utf-8") as f:
+            by_time = json.load(f)
+        df = pd.DataFrame.from_dict(by_time, orient="index")
+        df = df.explode(list(df.columns)).rename_axis("time").reset_index()
+        return df[COLUMNS]
+    df = pd.read_csv(source, sep="|", names=CSV_COLUMNS)
+    return split_quotes(df)[COLUMNS]
+
+
+def to_json(df):
+    """The notebook's per-time JSON: {"HH:MM": {"annot": [...], ...}}."""
+    return df.groupby("time").agg(list).to_json(orient="index")
+
+
+def gzip_bytes(data, name, level=LEVEL):
+    """data gzipped, with name ("07.json") in the header as the notebook wrote it."""
+    buf = io.BytesIO()
+    with gzip.GzipFile(filename=name, mode="wb", fileobj=buf, compresslevel=level, mtime=MTIME) as f:
+        f.write(data)
+    return buf.getvalue()
+
+
+def digest(df, level=LEVEL):
+    """Hash of an hour's rows and the settings its file is built with."""
+    h = hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    h.update(f"{VERSION}:{level}:{MTIME}:{','.join(df.columns)}".encode())
+    return h.hexdigest()
+
+
+def _write(path, data):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def encode_hour(job):
+    """Write one hour's file; job is (frame, path, level). Runs in a worker."""
+    df, path, level = job
+    data = gzip_bytes(to_json(df).encode(), Path(path).stem, level)
+    _write(Path(path), data)
+    return len(data)
+
+
+def build(source, out_dir, jobs=None, force=False, level=LEVEL, manifest=None, combined=None):
+    """Rebuild the hour files in out_dir whose rows changed.
+
+    Returns a dict of timings (s) and counts. combined, if given, is a path
+    for the all-hours JSON, rewritten when its content changes.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = Path(manifest) if manifest else out_dir.parent / ".build_quotes.json"
+    try:
+        old = json.loads(manifest.read_text())
+    except (OSError, ValueError):
+        old = {}
+
+    t0 = time.perf_counter()
+    df = read_source(source)
+    t1 = time.perf_counter()
+
+    hours = df["time"].str[:2]
+    todo = []
+    new = {}
+    for hour in range(24):
+        name = f"{hour:02d}.json.gz"
+        part = df[hours == f"{hour:02d}"]
+        new[name] = digest(part, level)
+        if force or old.get(name) != new[name] or not (out_dir / name).exists():
+            todo.append((part, str(out_dir / name), level))
+    t2 = time.perf_counter()
+
+    written = 0
+    if todo:
+        if jobs == 1 or len(todo) == 1:
+            written = sum(map(encode_hour, todo))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                written = sum(pool.map(encode_hour, todo))
+    if combined is not None:
+        data = to_json(df).encode()
+        combined = Path(combined)
+        if not combined.exists() or combined.read_bytes() != data:
+            _write(combined, data)
+    _write(manifest, (json.dumps(new, indent=1, sort_keys=True) + "\n").encode())
+    t3 = time.perf_counter()
+
+    return {
+        "quotes": len(df),
+        "rebuilt": len(todo),
+        "bytes": written,
+        "read_s": t1 - t0,
+        "hash_s": t2 - t1,
+        "encode_s": t3 - t2,
+        "total_s": t3 - t0,
+    }
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Build data/quotes_gz from the quote list.")
+    p.add_argument("--source", default=str(HERE / "quotes.json"), help=f"quotes.json, or the annotated CSV ({CSV_URL})")
+    p.add_argument("--out", default=str(HERE / "quotes_gz"), help="output directory")
+    p.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    p.add_argument("--force", action="store_true", help="rebuild every hour")
+    p.add_argument("--level", type=int, default=LEVEL, help="gzip compresslevel (1 for quick local builds)")
+    args = p.parse_args(argv)
+
+    combined = None if args.source.endswith(".json") else HERE / "quotes.json"
+    r = build(args.source, args.out, args.jobs, args.force, args.level, combined=combined)
+    print(
+        f"{args.out}: {r['quotes']} quotes, rebuilt {r['rebuilt']}/24 hours ({r['bytes']:,} bytes) "
+        f"in {r['total_s']:.2f} s (read {r['read_s']:.2f}, hash {r['hash_s']:.2f}, encode {r['encode_s']:.2f})"
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
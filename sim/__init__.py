@@ -0,0 +1,185 @@
+"""Headless stand-ins for the Pico hardware, so the apps run on CPython.
+
+    import sim
+
+    clock = sim.install()  # picographics, pimoroni, machine, ... + time
+    dev = sim.Device(clock)
+    app = dev.load("app_clock")  # imported fresh, init() called
+    dev.press("X", at=1000)
+    dev.run(app, 60_000)  # a minute of main.py's loop, in simulated time
+    print(dev.panel.calls, dev.panel.pixels)
+    sim.uninstall()
+
+install() puts the modules below into sys.modules under their MicroPython
+names and points time's ticks/sleep/time/localtime functions at a Clock.
+run_main() boots src/main.py itself.
+
+    clock.py        Clock: simulated time, scheduled events, tick wrap
+    machine.py      Pin with IRQs over simulated GPIO levels, Timer, idle()
+    pimoroni.py     Button (firmware read() semantics), RGBLED
+    picographics.py PicoGraphics on a NumPy RGB565 framebuffer
+    network.py      WLAN that is always connected
+    ntptime.py      no-op settime()
+    device.py       Device: the board as main.py wires it up
+
+Needs NumPy, from the dev dependency group: tests on the simulator fail
+without it rather than skip.
+"""
+
+import gc
+import sys
+import time
+import types
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from sim.clock import Clock, Stop  # noqa: E402
+
+MODULES = ("machine", "picographics", "pimoroni", "network", "ntptime")
+_TIME = ("ticks_ms", "ticks_us", "ticks_add", "ticks_diff", "time", "localtime", "mktime", "sleep", "sleep_ms", "sleep_us")
+HEAP = 192 * 1024  # about what a Pico W has free after boot
+
+clock = None  # the installed Clock
+_undo = []  # (obj, name, old value or _MISSING)
+_MISSING = object()
+
+
+def _set(obj, name, value):
+    if isinstance(obj, dict):
+        _undo.append((obj, name, obj.get(name, _MISSING)))
+        obj[name] = value
+    else:
+        _undo.append((obj, name, getattr(obj, name, _MISSING)))
+        setattr(obj, name, value)
+
+
+def _mem_alloc():
+    import tracemalloc
+
+    return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+def install(c=None):
+    """Install the stand-ins and a clock (a new Clock by default); returns it."""
+    global clock
+    if _undo:
+        uninstall()
+    import importlib
+
+    from sim import machine
+
+    machine.reset()
+    clock = c or Clock()
+    for name in MODULES:
+        _set(sys.modules, name, importlib.import_module("sim." + name))
+    for name in _TIME:
+        _set(time, name, getattr(clock, name))
+    # MicroPython's gc reports heap use; tracemalloc's count stands in
+    _set(gc, "mem_alloc", _mem_alloc)
+    _set(gc, "mem_free", lambda: HEAP - _mem_alloc())
+    try:
+        import env  # noqa: F401
+    except ImportError:
+        env = types.ModuleType("env")
+        env.WIFI_SSID = env.WIFI_PASSWORD = ""
+        env.OPENAI_API_KEY = env.OPENROUTER_API_KEY = ""
+        _set(sys.modules, "env", env)
+    return clock
+
+
+def uninstall():
+    """Undo install(), restoring the real modules and time functions."""
+    global clock
+    from sim import machine
+
+    while _undo:
+        obj, name, old = _undo.pop()
+        if isinstance(obj, dict):
+            if old is _MISSING:
+                obj.pop(name, None)
+            else:
+                obj[name] = old
+        elif old is _MISSING:
+            delattr(obj, name)
+        else:
+            setattr(obj, name, old)
+    machine.reset()
+    clock = None
+
+
+def _fresh():
+    """Drop every module loaded from src/, so the next import starts clean."""
+    for name, mod in list(sys.modules.items()):
+        f = getattr(mod, "__file__", None)
+        if isinstance(f, str) and Path(f).parent == SRC:
+            del sys.modules[name]
+
+
+def charge(steps, us):
+    """Iterate steps (a generator doing work in slices), moving the clock
+    on us per step: work that is instant on the host but not on the board,
+    so time budgets per update() behave as they would there."""
+    for step in steps:
+        clock.advance_us(us)
+        yield step
+
+
+def clock_runtime(runtime):
+    """Make src/runtime.py's sleeps run the installed clock on instead of
+    waiting: sleep_ms() advances it, idle_ms() advances it event by event
+    until its time is up or a button IRQ's wake() ends it. Undone by
+    uninstall()."""
+    c = clock
+
+    async def sleep_ms(ms):
+        c.sleep_ms(ms)
+        await runtime.asyncio.sleep(0)
+
+    async def idle_ms(ms):
+        end = c.us + ms * 1000
+        while c.us < end and not runtime._flag.is_set():
+            due = c.next_event_us()
+            c.advance_us((end if due is None or due > end else due) - c.us)
+        runtime._flag.clear()
+        await runtime.asyncio.sleep(0)
+
+    _set(runtime, "sleep_ms", sleep_ms)
+    _set(runtime, "idle_ms", idle_ms)
+
+
+def run_main(ms, c=None, setup=None):
+    """Boot src/main.py and run it for ms of simulated time.
+
+    setup(clock), if given, runs before the boot, e.g. to schedule button
+    presses (sim.machine.drive(12, 0) is button A). Returns main.py's
+    globals when the clock stops it, for inspecting display, wakeup_rates
+    and the like. Leaves the stand-ins installed; call uninstall() after.
+    """
+    c = install(c)
+    _fresh()
+    # main.py drops these from sys.modules once booted; put them back after
+    for name in ("env", "network", "ntptime"):
+        if name in sys.modules:
+            _set(sys.modules, name, sys.modules[name])
+    import runtime
+
+    clock_runtime(runtime)
+    c.limit_us = c.us + ms * 1000
+    if setup is not None:
+        setup(c)
+    path = SRC / "main.py"
+    main = types.ModuleType("main")
+    main.__file__ = str(path)
+    _set(sys.modules, "main", main)  # so scheduled events can reach it
+    try:
+        exec(compile(path.read_text(), str(path), "exec"), main.__dict__)
+    except Stop:
+        pass
+    c.limit_us = None
+    return main.__dict__
+
+
+from sim.device import Device  # noqa: E402
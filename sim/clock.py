@@ -0,0 +1,111 @@
+"""A controllable clock behind MicroPython's time functions.
+
+Nothing sleeps for real: sleep()/sleep_ms() move the clock forward, and
+events scheduled with at()/after() (button presses, say) fire as it
+passes them. ticks_ms/ticks_us wrap at 2**30 like on the Pico, and
+ticks_diff/ticks_add do the modular arithmetic, so code that subtracts
+ticks directly shows up as wrong near a wrap (start the clock there with
+Clock(ticks=...)).
+"""
+
+import calendar
+import heapq
+import time as _time
+
+TICKS_PERIOD = 1 << 30
+_MASK = TICKS_PERIOD - 1
+_HALF = TICKS_PERIOD // 2
+
+EPOCH = 1767225600  # 2026-01-01 00:00:00 UTC
+
+
+class Stop(BaseException):
+    """Raised when the clock passes its limit. A BaseException so an app's
+    or main.py's `except Exception` doesn't swallow it."""
+
+
+class Clock:
+    def __init__(self, start=EPOCH, ticks=0, limit_ms=None):
+        self.us = 0  # simulated time since the clock was made
+        self.start = start  # time.time() at us == 0
+        self._ticks0 = ticks
+        self._events = []  # heap of (us, seq, fn)
+        self._seq = 0
+        self.limit_us = None if limit_ms is None else limit_ms * 1000
+        self.slept_us = 0  # total asked for through sleep*()
+
+    @property
+    def ms(self):
+        return self.us // 1000
+
+    # MicroPython's time API
+
+    def ticks_ms(self):
+        return (self._ticks0 + self.us // 1000) & _MASK
+
+    def ticks_us(self):
+        return (self._ticks0 * 1000 + self.us) & _MASK
+
+    @staticmethod
+    def ticks_add(ticks, delta):
+        return (ticks + delta) & _MASK
+
+    @staticmethod
+    def ticks_diff(a, b):
+        return ((a - b + _HALF) & _MASK) - _HALF
+
+    def time(self):
+        return self.start + self.us // 1_000_000
+
+    def localtime(self, secs=None):
+        """8-tuple as on the Pico, whose RTC runs in UTC."""
+        return tuple(_time.gmtime(self.time() if secs is None else secs))[:8]
+
+    @staticmethod
+    def mktime(t):
+        return calendar.timegm(tuple(t)[:6])
+
+    def sleep(self, s):
+        self.sleep_us(int(s * 1_000_000))
+
+    def sleep_ms(self, ms):
+        self.sleep_us(ms * 1000)
+
+    def sleep_us(self, us):
+        self.slept_us += max(us, 0)
+        self.advance_us(us)
+
+    # Driving the clock
+
+    def advance_us(self, us):
+        """Move forward us, firing due events at their own times."""
+        target = self.us + max(us, 0)
+        while self._events and self._events[0][0] <= target:
+            when, _, fn = heapq.heappop(self._events)
+            self.us = max(self.us, when)
+            self._check()
+            fn()
+        self.us = target
+        self._check()
+
+    def advance(self, ms):
+        self.advance_us(ms * 1000)
+
+    def at(self, ms, fn):
+        """Call fn() when the clock reaches ms (since it was made)."""
+        self.at_us(ms * 1000, fn)
+
+    def at_us(self, us, fn):
+        heapq.heappush(self._events, (us, self._seq, fn))
+        self._seq += 1
+
+    def after(self, ms, fn):
+        self.at(self.ms + ms, fn)
+
+    def next_event_us(self):
+        """When the next scheduled event is due, or None."""
+        return self._events[0][0] if self._events else None
+
+    def _check(self):
+        if self.limit_us is not None and self.us >= self.limit_us:
+            raise Stop(self.us)
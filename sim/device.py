@@ -0,0 +1,125 @@
+"""The board as src/main.py wires it up, for driving one app at a time."""
+
+import sys
+import time
+
+from pacing import Pacer
+from screen import Screen
+from sim import machine
+from sim.picographics import DISPLAY_PICO_DISPLAY_2, PicoGraphics
+from sim.pimoroni import RGBLED, Button
+
+GPIO = {"A": 12, "B": 13, "X": 14, "Y": 15}
+_DEFAULT_DELAY_MS = 50  # main.py's poll when update() returns None
+
+
+class Device:
+    """Display (a Screen over a simulated PicoGraphics), buttons, LED and
+    pens as main.py makes them. run() repeats main.py's loop: call update(),
+    sleep what it returned (on the FRAME_MS grid if the app has one), wake
+    early when a WAKE_ON button changes.
+
+    spi_hz makes panel pushes take time (see picographics.py); frames_at
+    holds the ticks_us() of every update() that pushed, for frame pacing."""
+
+    def __init__(self, clock, record=False, draw=True, spi_hz=None):
+        self.clock = clock
+        self.panel = PicoGraphics(display=DISPLAY_PICO_DISPLAY_2, rotate=0, draw=draw, spi_hz=spi_hz)
+        self.display = Screen(self.panel)
+        self.WIDTH, self.HEIGHT = self.display.get_bounds()
+        self.buttons = {name: Button(GPIO[name]) for name in ("B", "X", "Y")}
+        self.led = RGBLED(6, 7, 8)
+        self.colors = {
+            "RED": self.display.create_pen(209, 34, 41),
+            "ORANGE": self.display.create_pen(246, 138, 30),
+            "WHITE": self.display.create_pen(255, 255, 255),
+            "BLACK": self.display.create_pen(0, 0, 0),
+            "CYAN": self.display.create_pen(0, 255, 255),
+            "MAGENTA": self.display.create_pen(255, 0, 255),
+            "YELLOW": self.display.create_pen(255, 255, 0),
+            "GREEN": self.display.create_pen(0, 255, 0),
+            "BLUE": self.display.create_pen(50, 50, 255),
+        }
+        self.record = record  # capture a frame after every pushing update()
+        self.updates = 0  # update() calls made by step()/run()
+        self.frames_at = []
+        self._pacer = None
+        self._wake_pins = {name: machine.Pin(GPIO[name], machine.Pin.IN, machine.Pin.PULL_UP) for name in ("B", "X", "Y")}
+        self._woken = False
+        self.panel.reset_stats()
+
+    @property
+    def args(self):
+        return (self.display, self.buttons, self.led, self.colors, self.WIDTH, self.HEIGHT)
+
+    def press(self, name, at=None, hold=80):
+        """Hold button name down for hold ms from at (ms on the clock; now
+        if None)."""
+        at = self.clock.ms if at is None else at
+        gpio = GPIO[name]
+        self.clock.at(at, lambda: machine.drive(gpio, 0))
+        self.clock.at(at + hold, lambda: machine.drive(gpio, 1))
+
+    def _wake(self, pin):
+        self._woken = True
+
+    def load(self, name):
+        """Import app module name afresh and init() it."""
+        sys.modules.pop(name, None)
+        app = __import__(name)
+        wake_on = getattr(app, "WAKE_ON", ())
+        for button, pin in self._wake_pins.items():
+            if button in wake_on:
+                pin.irq(trigger=machine.Pin.IRQ_FALLING | machine.Pin.IRQ_RISING, handler=self._wake)
+            else:
+                pin.irq(handler=None)
+        frame_ms = getattr(app, "FRAME_MS", None)
+        self._pacer = Pacer(frame_ms) if frame_ms else None
+        pushed = self.panel.updates
+        app.init(*self.args)
+        if self.record and self.panel.updates != pushed:
+            self.panel.capture()
+        return app
+
+    def step(self, app):
+        """One update(); returns its delay."""
+        pushed = self.panel.updates
+        delay = app.update(*self.args)
+        self.updates += 1
+        if self.panel.updates != pushed:
+            self.frames_at.append(time.ticks_us())
+            if self.record:
+                self.panel.capture()
+        return delay
+
+    def intervals(self):
+        """us between consecutive frames (frames_at)."""
+        t = self.frames_at
+        return [self.clock.ticks_diff(t[i], t[i - 1]) for i in range(1, len(t))]
+
+    def run(self, app, ms):
+        """Run app's update loop for ms of simulated time; returns the
+        number of update() calls."""
+        clock = self.clock
+        end = clock.us + ms * 1000
+        n = 0
+        while clock.us < end:
+            woke = clock.us
+            start = time.ticks_ms()
+            delay = self.step(app)
+            n += 1
+            if self._pacer is not None:
+                delay = self._pacer.delay(start, delay)
+            if delay is None:
+                delay = _DEFAULT_DELAY_MS
+            # On the board update() itself takes time; here it may take
+            # none, so an app asking to run again at once still lets 1 ms pass
+            deadline = min(woke + max(delay, 1) * 1000, end)
+            self._woken = False
+            while clock.us < deadline and not self._woken:
+                due = clock.next_event_us()
+                if due is None or due > deadline:
+                    clock.advance_us(deadline - clock.us)
+                else:
+                    clock.advance_us(due - clock.us)
+        return n
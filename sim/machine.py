@@ -0,0 +1,125 @@
+"""machine.Pin over a table of simulated GPIO levels, and Timer and idle()
+on the installed sim clock.
+
+drive(gpio, level) is the outside world: it sets an input's level and runs
+the IRQ handlers of every Pin on that GPIO whose trigger matches the edge,
+synchronously, as a hard IRQ would interrupt the running code. idle() is
+the core waiting for an interrupt: the clock runs on to the next event
+(a Timer firing, a scheduled button press).
+"""
+
+_levels = {}  # gpio -> 0/1
+_pins = {}  # gpio -> [Pin]
+
+irq_count = 0
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.mode = mode
+        self._handler = None
+        self._trigger = 0
+        if value is not None:
+            _levels[id] = 1 if value else 0
+        elif id not in _levels:
+            _levels[id] = 0 if pull == Pin.PULL_DOWN else 1
+        _pins.setdefault(id, []).append(self)
+
+    def value(self, v=None):
+        if v is None:
+            return _levels.get(self.id, 1)
+        drive(self.id, v)
+
+    __call__ = value
+
+    def on(self):
+        drive(self.id, 1)
+
+    def off(self):
+        drive(self.id, 0)
+
+    def toggle(self):
+        drive(self.id, 1 - _levels.get(self.id, 1))
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING):
+        self._handler = handler
+        self._trigger = trigger
+
+
+def drive(gpio, level):
+    """Set gpio to level (0/1) and fire the IRQs its edge triggers."""
+    global irq_count
+    level = 1 if level else 0
+    old = _levels.get(gpio, 1)
+    _levels[gpio] = level
+    if level == old:
+        return
+    edge = Pin.IRQ_RISING if level else Pin.IRQ_FALLING
+    for pin in _pins.get(gpio, ()):
+        if pin._handler is not None and pin._trigger & edge:
+            irq_count += 1
+            pin._handler(pin)
+
+
+def level(gpio):
+    return _levels.get(gpio, 1)
+
+
+def reset():
+    """Forget every pin, level and handler (between simulated boots)."""
+    global irq_count
+    _levels.clear()
+    _pins.clear()
+    irq_count = 0
+
+
+def freq(hz=None):
+    return 125_000_000
+
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, **kw):
+        self._gen = 0
+        if kw:
+            self.init(**kw)
+
+    def init(self, mode=PERIODIC, period=-1, callback=None, freq=-1):
+        import sim
+
+        self._gen += 1
+        gen = self._gen
+        us = period * 1000 if period >= 0 else 1_000_000 // freq
+
+        def fire():
+            if self._gen != gen:
+                return  # deinit() or init() since
+            if mode == Timer.PERIODIC:
+                sim.clock.at_us(sim.clock.us + us, fire)
+            if callback is not None:
+                callback(self)
+
+        sim.clock.at_us(sim.clock.us + us, fire)
+
+    def deinit(self):
+        self._gen += 1
+
+
+def idle():
+    """Wait for the next interrupt: run the clock to its next event (or 1 ms
+    on, if none is scheduled)."""
+    import sim
+
+    due = sim.clock.next_event_us()
+    sim.clock.advance_us(1000 if due is None else due - sim.clock.us)
@@ -0,0 +1,33 @@
+"""network.WLAN that connects at once."""
+
+STA_IF = 0
+AP_IF = 1
+STAT_GOT_IP = 3
+
+
+class WLAN:
+    def __init__(self, interface=STA_IF):
+        self._active = False
+        self._status = 0
+        self.ssid = None
+
+    def active(self, on=None):
+        if on is None:
+            return self._active
+        self._active = bool(on)
+
+    def connect(self, ssid=None, key=None):
+        self.ssid = ssid
+        self._status = STAT_GOT_IP
+
+    def disconnect(self):
+        self._status = 0
+
+    def isconnected(self):
+        return self._status == STAT_GOT_IP
+
+    def status(self):
+        return self._status
+
+    def ifconfig(self):
+        return ("10.0.0.2", "255.255.255.0", "10.0.0.1", "10.0.0.1")
@@ -0,0 +1,7 @@
+"""ntptime without the network: the simulated clock is already set."""
+
+host = "pool.ntp.org"
+
+
+def settime():
+    pass
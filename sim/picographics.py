@@ -0,0 +1,294 @@
+"""PicoGraphics over a NumPy RGB565 framebuffer.
+
+Drawing goes into fb (height x width, uint16); update() copies it to
+panel, which is what the LCD would show. partial_update() does nothing, as
+on the board: PicoGraphics only implements it in the e-ink drivers, and
+the ST7789 behind the Pico Display 2 inherits the empty base method. With
+partial=True (a driver that does implement it) it copies the region, and
+a partial update that misses a changed area leaves the old pixels on the
+panel.
+
+Text is approximate: every glyph is a solid cell as wide as its bitmap8
+advance (less the 1 px letter spacing) and 8 px tall, times scale, so
+layout, widths, wrapping and pixel counts match the real font closely but
+the letters themselves aren't drawn. measure_text() uses the same advance
+table as quotelayout.py.
+
+For profiling, each instance counts calls by name (calls), pixels written
+by drawing (pixels), pushes to the panel (updates) and pixels pushed
+(pushed), and keeps the strings drawn by text() (texts). capture()
+appends a copy of the panel to frames, for diffing.
+
+With draw=False every call returns at once without touching the
+framebuffer or the counters, so tracemalloc sees only the caller's
+allocations, not NumPy's.
+
+Pushes are free unless spi_hz is given: then each one sleeps (on the
+simulated clock) as long as sending its pixels to the LCD would take, 16
+bits each, as the blocking SPI transfer does on the board.
+"""
+
+import time
+
+import numpy as np
+
+from quotelayout import ADVANCE
+
+DISPLAY_PICO_DISPLAY = 0
+DISPLAY_PICO_DISPLAY_2 = 1
+DISPLAY_PICO_EXPLORER = 2
+
+PEN_RGB565 = 5
+
+_BOUNDS = {
+    DISPLAY_PICO_DISPLAY: (240, 135),
+    DISPLAY_PICO_DISPLAY_2: (320, 240),
+    DISPLAY_PICO_EXPLORER: (240, 240),
+}
+_GLYPH_H = 8
+SPI_HZ = 62_500_000  # the ST7789 driver's SPI clock: a full 320x240 push is ~20 ms
+
+
+def rgb565(r, g, b):
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+
+def to_rgb(frame):
+    """An RGB565 frame as a height x width x 3 uint8 array."""
+    f = frame.astype(np.uint32)
+    rgb = np.empty(frame.shape + (3,), np.uint8)
+    rgb[..., 0] = (f >> 11 & 0x1F) * 255 // 31
+    rgb[..., 1] = (f >> 5 & 0x3F) * 255 // 63
+    rgb[..., 2] = (f & 0x1F) * 255 // 31
+    return rgb
+
+
+def save_ppm(frame, path):
+    """Write an RGB565 frame as a binary PPM, viewable without extra deps."""
+    rgb = to_rgb(frame)
+    with open(path, "wb") as f:
+        f.write(b"P6 %d %d 255\n" % (rgb.shape[1], rgb.shape[0]))
+        f.write(rgb.tobytes())
+
+
+def diff(a, b):
+    """(pixels that differ, (x, y, w, h) bounding them or None)."""
+    changed = a != b
+    n = int(changed.sum())
+    if not n:
+        return 0, None
+    ys = np.flatnonzero(changed.any(axis=1))
+    xs = np.flatnonzero(changed.any(axis=0))
+    return n, (int(xs[0]), int(ys[0]), int(xs[-1] - xs[0] + 1), int(ys[-1] - ys[0] + 1))
+
+
+class PicoGraphics:
+    def __init__(self, display=DISPLAY_PICO_DISPLAY_2, rotate=0, pen_type=PEN_RGB565, draw=True, spi_hz=None,
+                 partial=False):
+        w, h = _BOUNDS[display]
+        if rotate in (90, 270):
+            w, h = h, w
+        self.width = w
+        self.height = h
+        self.fb = np.zeros((h, w), np.uint16)
+        self.panel = np.zeros((h, w), np.uint16)
+        self.pen = 0
+        self.font = "bitmap8"
+        self.backlight = 1.0
+        self.frames = []
+        self.draw = draw
+        self.spi_hz = spi_hz
+        self.partial = partial
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.calls = {}
+        self.pixels = 0
+        self.updates = 0
+        self.pushed = 0
+        self.texts = []
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def draw_calls(self):
+        """Calls that draw or push pixels (everything but pen/font/config)."""
+        return sum(n for k, n in self.calls.items() if k not in ("set_pen", "create_pen", "set_font", "set_backlight"))
+
+    # Setup
+
+    def get_bounds(self):
+        return self.width, self.height
+
+    def create_pen(self, r, g, b):
+        if self.draw:
+            self._count("create_pen")
+        return rgb565(r, g, b)
+
+    def set_pen(self, pen):
+        if not self.draw:
+            return
+        self._count("set_pen")
+        self.pen = pen
+
+    def set_font(self, font):
+        if not self.draw:
+            return
+        self._count("set_font")
+        self.font = font
+
+    def set_backlight(self, level):
+        if not self.draw:
+            return
+        self._count("set_backlight")
+        self.backlight = level
+
+    # Drawing
+
+    def _fill(self, x, y, w, h):
+        x0 = max(int(x), 0)
+        y0 = max(int(y), 0)
+        x1 = min(int(x + w), self.width)
+        y1 = min(int(y + h), self.height)
+        if x0 < x1 and y0 < y1:
+            self.fb[y0:y1, x0:x1] = self.pen
+            self.pixels += (x1 - x0) * (y1 - y0)
+
+    def _mask(self, x0, y0, mask):
+        """Set the pen where mask (whose top-left is x0, y0) is true."""
+        h, w = mask.shape
+        cx0 = max(x0, 0)
+        cy0 = max(y0, 0)
+        cx1 = min(x0 + w, self.width)
+        cy1 = min(y0 + h, self.height)
+        if cx0 >= cx1 or cy0 >= cy1:
+            return
+        m = mask[cy0 - y0 : cy1 - y0, cx0 - x0 : cx1 - x0]
+        self.fb[cy0:cy1, cx0:cx1][m] = self.pen
+        self.pixels += int(m.sum())
+
+    def clear(self):
+        if not self.draw:
+            return
+        self._count("clear")
+        self.fb[:] = self.pen
+        self.pixels += self.width * self.height
+
+    def pixel(self, x, y):
+        if not self.draw:
+            return
+        self._count("pixel")
+        self._fill(x, y, 1, 1)
+
+    def rectangle(self, x, y, w, h):
+        if not self.draw:
+            return
+        self._count("rectangle")
+        self._fill(x, y, w, h)
+
+    def circle(self, x, y, r):
+        if not self.draw:
+            return
+        self._count("circle")
+        x, y, r = int(x), int(y), int(r)
+        yy, xx = np.ogrid[-r : r + 1, -r : r + 1]
+        self._mask(x - r, y - r, xx * xx + yy * yy <= r * r)
+
+    def triangle(self, x1, y1, x2, y2, x3, y3):
+        if not self.draw:
+            return
+        self._count("triangle")
+        pts = [(int(x1), int(y1)), (int(x2), int(y2)), (int(x3), int(y3))]
+        x0 = min(p[0] for p in pts)
+        y0 = min(p[1] for p in pts)
+        w = max(p[0] for p in pts) - x0 + 1
+        h = max(p[1] for p in pts) - y0 + 1
+        yy, xx = np.mgrid[y0 : y0 + h, x0 : x0 + w]
+        edges = []
+        for (ax, ay), (bx, by) in ((pts[0], pts[1]), (pts[1], pts[2]), (pts[2], pts[0])):
+            edges.append((bx - ax) * (yy - ay) - (by - ay) * (xx - ax))
+        inside = ((edges[0] >= 0) & (edges[1] >= 0) & (edges[2] >= 0)) | (
+            (edges[0] <= 0) & (edges[1] <= 0) & (edges[2] <= 0)
+        )
+        self._mask(x0, y0, inside)
+
+    def line(self, x1, y1, x2, y2, thickness=1):
+        if not self.draw:
+            return
+        self._count("line")
+        n = max(abs(int(x2) - int(x1)), abs(int(y2) - int(y1))) + 1
+        xs = np.rint(np.linspace(x1, x2, n)).astype(int)
+        ys = np.rint(np.linspace(y1, y2, n)).astype(int)
+        t = max(int(thickness), 1)
+        x0 = int(xs.min()) - t // 2
+        y0 = int(ys.min()) - t // 2
+        mask = np.zeros((int(ys.max()) - int(ys.min()) + t, int(xs.max()) - int(xs.min()) + t), bool)
+        for dy in range(t):
+            for dx in range(t):
+                mask[ys - y0 - t // 2 + dy, xs - x0 - t // 2 + dx] = True
+        self._mask(x0, y0, mask)
+
+    def measure_text(self, text, scale=2, spacing=1, fixed_width=False):
+        w = 0
+        for c in text:
+            o = ord(c) - 32
+            w += ADVANCE[o] if 0 <= o < len(ADVANCE) else ADVANCE[31]  # "?"
+        return w * scale
+
+    def text(self, text, x, y, wordwrap=-1, scale=2, angle=0, spacing=1, fixed_width=False):
+        if not self.draw:
+            return
+        self._count("text")
+        self.texts.append(text)
+        x, y, scale = int(x), int(y), max(int(scale), 1)
+        limit = wordwrap if wordwrap > 0 else None
+        space = self.measure_text(" ", scale)
+        cy = y
+        for para in text.split("\n"):
+            cx = 0
+            for word in para.split(" "):
+                ww = self.measure_text(word, scale)
+                if limit is not None and cx and cx + ww > limit:
+                    cx = 0
+                    cy += _GLYPH_H * scale
+                for c in word:
+                    adv = self.measure_text(c, scale)
+                    self._fill(x + cx, cy, adv - scale, _GLYPH_H * scale)
+                    cx += adv
+                cx += space
+            cy += _GLYPH_H * scale
+
+    # Pushing to the panel
+
+    def update(self):
+        if not self.draw:
+            return
+        self._count("update")
+        self.panel[:] = self.fb
+        self.updates += 1
+        self.pushed += self.width * self.height
+        self._transfer(self.width * self.height)
+
+    def partial_update(self, x, y, w, h):
+        if not self.draw:
+            return
+        self._count("partial_update")
+        if not self.partial:
+            return
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, self.width), min(y + h, self.height)
+        if x0 < x1 and y0 < y1:
+            self.panel[y0:y1, x0:x1] = self.fb[y0:y1, x0:x1]
+            self.pushed += (x1 - x0) * (y1 - y0)
+            self._transfer((x1 - x0) * (y1 - y0))
+        self.updates += 1
+
+    def _transfer(self, n):
+        if self.spi_hz:
+            time.sleep_us(n * 16 * 1_000_000 // self.spi_hz)
+
+    def capture(self):
+        """Keep a copy of what the panel shows now; returns it."""
+        frame = self.panel.copy()
+        self.frames.append(frame)
+        return frame
@@ -0,0 +1,68 @@
+"""pimoroni.Button and RGBLED.
+
+Button reads its GPIO through sim.machine, so a press driven there is seen
+both by the Button and by any Pin IRQ on the same GPIO, as on the board.
+read() follows the firmware: True on the press edge, then again every
+repeat_time ms while held (twice as often after hold_time ms).
+"""
+
+import time
+
+from sim.machine import Pin
+
+BUTTON_A = 12
+BUTTON_B = 13
+BUTTON_X = 14
+BUTTON_Y = 15
+
+
+class Button:
+    def __init__(self, button, invert=True, repeat_time=200, hold_time=1000):
+        self.pin = Pin(button, Pin.IN, Pin.PULL_UP if invert else Pin.PULL_DOWN)
+        self._invert = invert
+        self._repeat_time = repeat_time
+        self._hold_time = hold_time
+        self._last_state = False
+        self._pressed = False
+        self._pressed_time = 0
+        self._last_time = 0
+
+    def raw(self):
+        return (self.pin.value() == 0) == self._invert
+
+    @property
+    def is_pressed(self):
+        return self.raw()
+
+    def read(self):
+        now = time.ticks_ms()
+        state = self.raw()
+        if state != self._last_state:
+            self._last_state = state
+            if state:
+                self._pressed = True
+                self._pressed_time = self._last_time = now
+                return True
+            self._pressed = False
+        if not self._repeat_time or not self._pressed:
+            return False
+        rate = self._repeat_time
+        if self._hold_time and time.ticks_diff(now, self._pressed_time) > self._hold_time:
+            rate //= 2
+        if time.ticks_diff(now, self._last_time) > rate:
+            self._last_time = now
+            return True
+        return False
+
+
+class RGBLED:
+    def __init__(self, r, g, b, invert=True, gamma=1):
+        self.pins = (r, g, b)
+        self.rgb = (0, 0, 0)
+        self.changes = 0
+
+    def set_rgb(self, r, g, b):
+        rgb = (int(r), int(g), int(b))
+        if rgb != self.rgb:
+            self.changes += 1
+        self.rgb = rgb
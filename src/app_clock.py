@@ -1,8 +1,40 @@
-import time
+from array import array
 
+from pico_utils import local_time
+
+_last_hour = None
 _last_min = None
 _last_sec = None
 _colon_on = True
+_SEC_LEAD_MS = 30  # wake this early for the next second, then poll briefly
+_POLL_MS = 10
+
+# Big HH:MM digits are blitted from pre-rendered rectangle runs instead of
+# rasterising display.text(..., scale=8) on every change.
+_SCALE = 8
+_DIGIT_Y = 55
+_DIGIT_X = (30, 78, 148, 196)  # H, H, M, M cells, 6-column advance
+_COLON_X = 118  # where text(":", 118, 50, ..., 8) drew it
+_COLON_Y = 50
+_COLON_W = 1 * _SCALE  # one column of ink, as quotelayout.ADVANCE[":"] = 2
+_GLYPH_W = 5 * _SCALE
+_GLYPH_H = 7 * _SCALE
+
+# 5x7 glyphs matching bitmap8's digits, one int per row (MSB = left column)
+_FONT = {
+    "0": (0x0E, 0x11, 0x13, 0x15, 0x19, 0x11, 0x0E),
+    "1": (0x04, 0x0C, 0x04, 0x04, 0x04, 0x04, 0x0E),
+    "2": (0x0E, 0x11, 0x01, 0x02, 0x04, 0x08, 0x1F),
+    "3": (0x1F, 0x02, 0x04, 0x02, 0x01, 0x11, 0x0E),
+    "4": (0x02, 0x06, 0x0A, 0x12, 0x1F, 0x02, 0x02),
+    "5": (0x1F, 0x10, 0x1E, 0x01, 0x01, 0x11, 0x0E),
+    "6": (0x06, 0x08, 0x10, 0x1E, 0x11, 0x11, 0x0E),
+    "7": (0x1F, 0x01, 0x02, 0x04, 0x08, 0x08, 0x08),
+    "8": (0x0E, 0x11, 0x11, 0x0E, 0x11, 0x11, 0x0E),
+    "9": (0x0E, 0x11, 0x11, 0x0F, 0x01, 0x02, 0x0C),
+    ":": (0x00, 0x10, 0x10, 0x00, 0x10, 0x10, 0x00),
+}
+_glyphs = None  # char -> array("h") of x, y, w, h rects at _SCALE
 
 _DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 _MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
@@ -18,37 +50,6 @@ _TIME_COLORS = [
 ]
 
 
-def _first_sunday(year, month):
-    """Day of first Sunday in given month."""
-    t = time.localtime(time.mktime((year, month, 1, 0, 0, 0, 0, 0)))
-    wday = t[6]
-    return 1 + (6 - wday) % 7
-
-
-def _utc_offset():
-    """Sydney: UTC+11 (AEDT) Oct first Sun 2am -> Apr first Sun 3am, else UTC+10."""
-    utc = time.localtime()
-    year, month, day, hour = utc[0], utc[1], utc[2], utc[3]
-
-    if month > 4 and month < 10:
-        return 10
-    if month == 4:
-        boundary = _first_sunday(year, 4)
-        if day < boundary or (day == boundary and hour < 16):
-            return 11
-        return 10
-    if month == 10:
-        boundary = _first_sunday(year, 10)
-        if day > boundary or (day == boundary and hour >= 16):
-            return 11
-        return 10
-    return 11
-
-
-def _get_local():
-    return time.localtime(time.time() + _utc_offset() * 3600)
-
-
 def _time_color(colors, hour):
     if hour < 6:
         return colors["BLUE"]
@@ -58,38 +59,134 @@ def _time_color(colors, hour):
     return colors["BLUE"]
 
 
+def _build_glyphs():
+    """Turn each glyph bitmap into merged rectangles at _SCALE.
+
+    Horizontal runs in a row become one rect, and a run repeated in the next
+    row extends that rect downwards, so a digit is ~6-12 rectangle calls.
+    Rects don't depend on pen, so one cache serves every time-of-day colour.
+    """
+    global _glyphs
+    _glyphs = {}
+    size = 0
+    for ch, rows in _FONT.items():
+        rects = []
+        open_runs = {}  # (x, w) -> rect still growing downwards
+        for y, bits in enumerate(rows):
+            runs = {}
+            x = 0
+            while x < 5:
+                if bits & (0x10 >> x):
+                    start = x
+                    while x < 5 and bits & (0x10 >> x):
+                        x += 1
+                    key = (start, x - start)
+                    rect = open_runs.get(key)
+                    if rect is None:
+                        rect = [start, y, x - start, 0]
+                        rects.append(rect)
+                    rect[3] += 1
+                    runs[key] = rect
+                x += 1
+            open_runs = runs
+        flat = array("h")
+        for r in rects:
+            for v in r:
+                flat.append(v * _SCALE)
+        _glyphs[ch] = flat
+        size += len(flat) * 2
+    print(f"Clock glyph cache: {len(_glyphs)} glyphs, {size} bytes")
+
+
+def _blit(display, ch, x, y):
+    g = _glyphs[ch]
+    for i in range(0, len(g), 4):
+        display.rectangle(x + g[i], y + g[i + 1], g[i + 2], g[i + 3])
+
+
+def _draw_digits(display, pen, digits, cells):
+    display.set_pen(pen)
+    for i in cells:
+        _blit(display, digits[i], _DIGIT_X[i], _DIGIT_Y)
+
+
 def init(display, buttons, led, colors, WIDTH, HEIGHT):
-    global _last_min, _last_sec, _colon_on
+    global _last_hour, _last_min, _last_sec, _colon_on
+    if _glyphs is None:
+        _build_glyphs()
+    _last_hour = None
     _last_min = None
     _last_sec = None
     _colon_on = True
     _draw(display, colors, WIDTH, HEIGHT)
 
 
+def _draw_colon(display, time_color):
+    if _colon_on:
+        display.set_pen(time_color)
+        _blit(display, ":", _COLON_X, _COLON_Y)
+
+
+def _draw_seconds(display, colors, WIDTH, sec, time_color):
+    # Seconds - small, top right
+    display.set_pen(colors["WHITE"])
+    display.text(f":{sec:02}", 268, 70, WIDTH, 3)
+
+    # Seconds progress bar
+    bar_y = 180
+    bar_w = 280
+    bar_x = (WIDTH - bar_w) // 2
+    bar_h = 4
+    display.set_pen(colors["WHITE"])
+    display.rectangle(bar_x, bar_y, bar_w, bar_h)
+    fill_w = int(bar_w * sec / 59) if sec < 60 else bar_w
+    display.set_pen(time_color)
+    if fill_w > 0:
+        display.rectangle(bar_x, bar_y, fill_w, bar_h)
+
+
+def _draw_tick(display, colors, WIDTH, t):
+    """Redraw only what changes every second: colon, seconds and bar.
+
+    On a minute change the minute cells that differ are re-blitted too.
+    """
+    global _last_min
+    time_color = _time_color(colors, t[3])
+    black = colors["BLACK"]
+    if t[4] != _last_min:
+        digits = f"{t[3]:02}{t[4]:02}"
+        cells = (2, 3) if _last_min is None or t[4] // 10 != _last_min // 10 else (3,)
+        for i in cells:
+            display.clear_rect(_DIGIT_X[i], _DIGIT_Y, _GLYPH_W, _GLYPH_H, black)
+        _draw_digits(display, time_color, digits, cells)
+        _last_min = t[4]
+    display.clear_rect(_COLON_X, _COLON_Y, _COLON_W, _GLYPH_H, black)
+    display.clear_rect(268, 70, WIDTH - 268, 24, black)
+    _draw_colon(display, time_color)
+    _draw_seconds(display, colors, WIDTH, t[5], time_color)
+    display.update()
+
+
 def _draw(display, colors, WIDTH, HEIGHT):
-    t = _get_local()
+    global _last_hour, _last_min
+    t = local_time()
     hour, minute, sec = t[3], t[4], t[5]
     wday = t[6]
     day, month, year = t[2], t[1], t[0]
 
+    _last_hour = hour
+    _last_min = minute
     display.set_pen(colors["BLACK"])
     display.clear()
 
     # Time - large, color based on time of day
     time_color = _time_color(colors, hour)
-    display.set_pen(time_color)
 
     # Draw hours and minutes separately with blinking colon
-    h_str = f"{hour:02}"
-    m_str = f"{minute:02}"
-    display.text(h_str, 30, 55, WIDTH, 8)
-    if _colon_on:
-        display.text(":", 118, 50, WIDTH, 8)
-    display.text(m_str, 148, 55, WIDTH, 8)
+    _draw_digits(display, time_color, f"{hour:02}{minute:02}", (0, 1, 2, 3))
+    _draw_colon(display, time_color)
 
-    # Seconds - small, top right
-    display.set_pen(colors["WHITE"])
-    display.text(f":{sec:02}", 268, 70, WIDTH, 3)
+    _draw_seconds(display, colors, WIDTH, sec, time_color)
 
     # Date line
     display.set_pen(colors["CYAN"])
@@ -97,18 +194,6 @@ def _draw(display, colors, WIDTH, HEIGHT):
     month_name = _MONTHS[month - 1]
     display.text(f"{day_name} {day} {month_name} {year}", 55, 145, WIDTH, 3)
 
-    # Seconds progress bar
-    bar_y = 180
-    bar_w = 280
-    bar_x = (WIDTH - bar_w) // 2
-    bar_h = 4
-    display.set_pen(colors["WHITE"])
-    display.rectangle(bar_x, bar_y, bar_w, bar_h)
-    fill_w = int(bar_w * sec / 59) if sec < 60 else bar_w
-    display.set_pen(time_color)
-    if fill_w > 0:
-        display.rectangle(bar_x, bar_y, fill_w, bar_h)
-
     # Greeting based on time of day
     display.set_pen(colors["GREEN"])
     if hour < 6:
@@ -127,12 +212,22 @@ def _draw(display, colors, WIDTH, HEIGHT):
 
 
 def update(display, buttons, led, colors, WIDTH, HEIGHT):
-    global _last_min, _last_sec, _colon_on
+    global _last_sec, _colon_on
 
-    t = _get_local()
-    minute, sec = t[4], t[5]
+    t = local_time()
+    hour, sec = t[3], t[5]
 
-    if sec != _last_sec:
-        _colon_on = not _colon_on
-        _last_sec = sec
+    if sec == _last_sec:
+        return _POLL_MS
+
+    _colon_on = not _colon_on
+    _last_sec = sec
+    # Hour change can move colour, date and greeting: repaint everything
+    if hour != _last_hour:
         _draw(display, colors, WIDTH, HEIGHT)
+    else:
+        _draw_tick(display, colors, WIDTH, t)
+
+    # Seconds come from the RTC with no sub-second phase, so sleep until just
+    # before the next one is due and poll the last few ms.
+    return 1000 - _SEC_LEAD_MS
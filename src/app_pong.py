@@ -1,10 +1,31 @@
 import time
 
-# Ball
-_ball_x = 0.0
-_ball_y = 0.0
-_ball_dx = 0.0
-_ball_dy = 0.0
+WAKE_ON = ("X",)
+_FRAME_MS = 16  # ~60 fps while playing, when the push keeps up
+FRAME_MS = _FRAME_MS  # main.py paces our frames on a fixed grid
+_IDLE_MS = 200  # title / game-over screens just wait for X
+
+# Physics runs in fixed steps of _STEP_US, as many as the time since the
+# last update() holds, so a bounce doesn't depend on when frames happen.
+# Rendering is once per update(), after the steps.
+_HZ = 120
+_STEP_US = 1_000_000 // _HZ
+_MAX_STEPS = 6  # per update(); time beyond that (a stall) is dropped
+_acc_us = 0  # time owed to the physics
+_last_us = 0
+_steps = 0  # physics steps since the game started
+
+# Ball physics is fixed point, _FP fractional bits: MicroPython boxes every
+# float, so float maths would allocate on each operation. 20.12 keeps every
+# product below (including the paddle angle) inside a 31-bit small int.
+_FP = 12
+_ONE = 1 << _FP
+
+# Ball: position in px << _FP, velocity in (px << _FP) per step
+_ball_x = 0
+_ball_y = 0
+_ball_dx = 0
+_ball_dy = 0
 _ball_size = 8
 
 # Paddle
@@ -12,7 +33,8 @@ _paddle_x = 0
 _paddle_w = 50
 _paddle_h = 5
 _paddle_dir = 0
-_PADDLE_SPEED = 12
+# The paddle moved 12 px a frame at the old ~15 fps loop: keep its 240 px/s
+_PADDLE_SPEED = 240 // _HZ  # px per step
 _PADDLE_Y_OFFSET = 12
 
 # Game state
@@ -20,96 +42,135 @@ _score = 0
 _lives = 3
 _game_over = False
 _game_started = False
-_speed = 3.5
-_last_tick = 0
+_SPEED = 7 * _ONE * 1000 // (32 * _HZ)  # 3.5 px per 16 ms at the start
+_SPEED_UP = 50 * _ONE // (16 * _HZ)  # + 0.05 px per 16 ms per brick
+_speed = _SPEED
 
-# Bricks: list of (x, y, color_name, alive)
-_bricks = []
+# Bricks: one byte per row, bit col set while that brick is standing.
+# Brick (row, col) is at x = _brick_x0 + col * _BRICK_DX,
+# y = _BRICK_TOP + row * _BRICK_DY.
 _BRICK_W = 38
 _BRICK_H = 10
 _BRICK_PAD = 2
 _BRICK_TOP = 30
-_BRICK_COLS = 8
+_BRICK_COLS = 8  # at most 8, one bit each
 _BRICK_ROWS = 5
-_BRICK_COLORS = ["RED", "MAGENTA", "YELLOW", "GREEN", "CYAN"]
-
-
-def _make_bricks(WIDTH):
-    global _bricks
-    _bricks = []
-    total_w = _BRICK_COLS * (_BRICK_W + _BRICK_PAD) - _BRICK_PAD
-    x_off = (WIDTH - total_w) // 2
+_BRICK_DX = _BRICK_W + _BRICK_PAD
+_BRICK_DY = _BRICK_H + _BRICK_PAD
+_BRICK_COLORS = ("RED", "MAGENTA", "YELLOW", "GREEN", "CYAN")
+_ROW_FULL = (1 << _BRICK_COLS) - 1
+_alive = bytearray(_BRICK_ROWS)
+_bricks_left = 0
+_brick_x0 = 0
+_cleared = 0  # bit row set when that row was emptied this update
+# The ball moves at most this far per collision test: less than the ball
+# and a brick are tall, so it can't pass through one between tests
+_SWEEP_STEP = 4
+
+# Pens, resolved from colors in init()
+_row_pens = [0] * _BRICK_ROWS
+_black = _white = _red = _green = _yellow = 0
+_score_text = "0"  # str(_score), rebuilt only when the score changes
+
+
+def _make_bricks():
+    global _bricks_left
     for row in range(_BRICK_ROWS):
-        color = _BRICK_COLORS[row % len(_BRICK_COLORS)]
-        for col in range(_BRICK_COLS):
-            x = x_off + col * (_BRICK_W + _BRICK_PAD)
-            y = _BRICK_TOP + row * (_BRICK_H + _BRICK_PAD)
-            _bricks.append([x, y, color, True])
+        _alive[row] = _ROW_FULL
+    _bricks_left = _BRICK_ROWS * _BRICK_COLS
+
+
+def _knock(bx, by):
+    """Knock out the bricks the ball overlaps with its top-left corner at
+    (bx, by); returns how many. Only the grid cells under the ball (at most
+    2 x 2) are looked at, however many bricks there are."""
+    global _bricks_left, _cleared, _speed
+    top = by - _BRICK_TOP
+    r0 = top // _BRICK_DY
+    r1 = (top + _ball_size - 1) // _BRICK_DY
+    if r1 < 0 or r0 >= _BRICK_ROWS:
+        return 0
+    left = bx - _brick_x0
+    c0 = left // _BRICK_DX
+    c1 = (left + _ball_size - 1) // _BRICK_DX
+    if c1 < 0 or c0 >= _BRICK_COLS:
+        return 0
+    if r0 < 0:
+        r0 = 0
+    if r1 >= _BRICK_ROWS:
+        r1 = _BRICK_ROWS - 1
+    if c0 < 0:
+        c0 = 0
+    if c1 >= _BRICK_COLS:
+        c1 = _BRICK_COLS - 1
+    n = 0
+    for row in range(r0, r1 + 1):
+        bits = _alive[row]
+        # The cell's top _BRICK_H px are brick, the rest is gap
+        if not bits or top >= row * _BRICK_DY + _BRICK_H:
+            continue
+        for col in range(c0, c1 + 1):
+            bit = 1 << col
+            if bits & bit and left < col * _BRICK_DX + _BRICK_W:
+                bits &= ~bit
+                n += 1
+        if bits != _alive[row]:
+            _alive[row] = bits
+            if not bits:
+                _cleared |= 1 << row
+    if n:
+        _bricks_left -= n
+        _set_score(_score + n)
+        _speed += _SPEED_UP * n
+    return n
+
+
+def _set_score(score):
+    global _score, _score_text
+    _score = score
+    _score_text = str(score)
 
 
 def _reset_ball(WIDTH, HEIGHT):
-    global _ball_x, _ball_y, _ball_dx, _ball_dy, _speed, _last_tick, _paddle_dir
-    _ball_x = float(WIDTH // 2)
-    _ball_y = float(HEIGHT // 2 + 30)
-    _speed = 3.5
-    _ball_dx = _speed * 0.7
+    global _ball_x, _ball_y, _ball_dx, _ball_dy, _speed, _paddle_dir, _acc_us
+    _ball_x = (WIDTH // 2) << _FP
+    _ball_y = (HEIGHT // 2 + 30) << _FP
+    _speed = _SPEED
+    _ball_dx = _speed * 7 // 10
     _ball_dy = _speed
     _paddle_dir = 0
-    _last_tick = time.ticks_ms()
+    _acc_us = 0
 
 
-def init(display, buttons, led, colors, WIDTH, HEIGHT):
-    global _game_started, _game_over
-    _game_started = False
+def new_game(WIDTH, HEIGHT):
+    """Set up a fresh game, ready to step (what pressing X does)."""
+    global _game_started, _game_over, _brick_x0, _paddle_x, _lives, _steps
+    _brick_x0 = (WIDTH - (_BRICK_COLS * _BRICK_DX - _BRICK_PAD)) // 2
+    _game_started = True
     _game_over = False
     _reset_ball(WIDTH, HEIGHT)
-    _make_bricks(WIDTH)
-
-    global _paddle_x, _score, _lives
+    _make_bricks()
     _paddle_x = WIDTH // 2 - _paddle_w // 2
-    _score = 0
+    _set_score(0)
     _lives = 3
+    _steps = 0
 
-    display.set_pen(colors["BLACK"])
-    display.clear()
-    display.set_pen(colors["WHITE"])
-    display.text("BREAKOUT", 60, 60, WIDTH, 5)
-    display.set_pen(colors["GREEN"])
-    display.text("Press X to start", 70, 130, WIDTH, 2)
-    display.set_pen(colors["WHITE"])
-    display.text("B: left  Y: right", 80, 170, WIDTH, 2)
-    display.update()
-
-
-def update(display, buttons, led, colors, WIDTH, HEIGHT):
-    global _ball_x, _ball_y, _ball_dx, _ball_dy
-    global _paddle_x, _paddle_dir, _score, _lives
-    global _game_over, _game_started, _speed, _last_tick
-
-    now = time.ticks_ms()
-
-    if not _game_started or _game_over:
-        if buttons["X"].is_pressed:
-            _game_started = True
-            _game_over = False
-            _reset_ball(WIDTH, HEIGHT)
-            _make_bricks(WIDTH)
-            _paddle_x = WIDTH // 2 - _paddle_w // 2
-            _score = 0
-            _lives = 3
-        else:
-            return
 
-    dt = time.ticks_diff(now, _last_tick) / 16.0
-    dt = min(dt, 3.0)
-    _last_tick = now
+def _lose_ball(WIDTH, HEIGHT):
+    """The ball went off the bottom; True when that was the last life."""
+    global _lives, _game_over
+    _lives -= 1
+    if _lives <= 0:
+        _game_over = True
+        return True
+    _reset_ball(WIDTH, HEIGHT)
+    return False
 
-    # Paddle: toggle direction on press
-    if buttons["B"].read():
-        _paddle_dir = 0 if _paddle_dir == -1 else -1
-    if buttons["Y"].read():
-        _paddle_dir = 0 if _paddle_dir == 1 else 1
 
+def _step(WIDTH, HEIGHT):
+    """Advance paddle and ball by one physics step."""
+    global _ball_x, _ball_y, _ball_dx, _ball_dy, _paddle_x, _paddle_dir, _steps
+    _steps += 1
     _paddle_x += _paddle_dir * _PADDLE_SPEED
     if _paddle_x <= 0:
         _paddle_x = 0
@@ -118,132 +179,234 @@ def update(display, buttons, led, colors, WIDTH, HEIGHT):
         _paddle_x = WIDTH - _paddle_w
         _paddle_dir = 0
 
-    # Ball movement
-    _ball_x += _ball_dx * dt
-    _ball_y += _ball_dy * dt
+    # Ball movement, swept through the wall in moves of at most
+    # _SWEEP_STEP px: x then y each move, so a hit bounces the ball off the
+    # face it came through, and several bricks can go in one step
+    mx = _ball_dx
+    my = _ball_dy
+    moves = max(abs(mx), abs(my)) // (_SWEEP_STEP << _FP) + 1
+    sx = mx // moves
+    sy = my // moves
+    for _ in range(moves):
+        _ball_x += sx
+        if _knock(_ball_x >> _FP, _ball_y >> _FP):
+            _ball_x -= sx
+            sx = -sx
+            _ball_dx = -_ball_dx
+        _ball_y += sy
+        if _knock(_ball_x >> _FP, _ball_y >> _FP):
+            _ball_y -= sy
+            sy = -sy
+            _ball_dy = -_ball_dy
 
     # Wall bounces
     if _ball_x <= 0:
-        _ball_x = 0.0
+        _ball_x = 0
         _ball_dx = abs(_ball_dx)
-    elif _ball_x >= WIDTH - _ball_size:
-        _ball_x = float(WIDTH - _ball_size)
+    elif _ball_x >= (WIDTH - _ball_size) << _FP:
+        _ball_x = (WIDTH - _ball_size) << _FP
         _ball_dx = -abs(_ball_dx)
     if _ball_y <= 0:
-        _ball_y = 0.0
+        _ball_y = 0
         _ball_dy = abs(_ball_dy)
 
     # Paddle collision
     paddle_top = HEIGHT - _PADDLE_Y_OFFSET - _paddle_h
+    ball_bottom = _ball_y + (_ball_size << _FP)
     if (_ball_dy > 0
-            and _ball_y + _ball_size >= paddle_top
-            and _ball_y + _ball_size <= paddle_top + _paddle_h + 4
-            and _ball_x + _ball_size >= _paddle_x
-            and _ball_x <= _paddle_x + _paddle_w):
+            and ball_bottom >= paddle_top << _FP
+            and ball_bottom <= (paddle_top + _paddle_h + 4) << _FP
+            and _ball_x + (_ball_size << _FP) >= _paddle_x << _FP
+            and _ball_x <= (_paddle_x + _paddle_w) << _FP):
         _ball_dy = -abs(_ball_dy)
-        _ball_y = float(paddle_top - _ball_size)
-        # Angle based on where ball hits paddle
-        hit = (_ball_x + _ball_size / 2 - _paddle_x) / _paddle_w
-        _ball_dx = _speed * (hit - 0.5) * 2
-
-    # Brick collisions
-    bx = int(_ball_x)
-    by = int(_ball_y)
-    hit_row = -1
-    for i, brick in enumerate(_bricks):
-        if not brick[3]:
-            continue
-        # AABB overlap
-        if (bx + _ball_size > brick[0]
-                and bx < brick[0] + _BRICK_W
-                and by + _ball_size > brick[1]
-                and by < brick[1] + _BRICK_H):
-            brick[3] = False
-            _score += 1
-            hit_row = i // _BRICK_COLS
-            _ball_dy = -_ball_dy
-            _speed += 0.05
-            break
+        _ball_y = (paddle_top - _ball_size) << _FP
+        # Angle based on where ball hits paddle: off is twice the ball
+        # centre's distance from the paddle centre, so off / _paddle_w
+        # runs -1 .. +1 across it
+        off = 2 * _ball_x + ((_ball_size - 2 * _paddle_x - _paddle_w) << _FP)
+        _ball_dx = _speed * (off // _paddle_w) >> _FP
+
+
+def init(display, buttons, led, colors, WIDTH, HEIGHT):
+    global _game_started
+    global _black, _white, _red, _green, _yellow
+    _black = colors["BLACK"]
+    _white = colors["WHITE"]
+    _red = colors["RED"]
+    _green = colors["GREEN"]
+    _yellow = colors["YELLOW"]
+    for row in range(_BRICK_ROWS):
+        _row_pens[row] = colors[_BRICK_COLORS[row % len(_BRICK_COLORS)]]
+    new_game(WIDTH, HEIGHT)
+    _game_started = False  # until X
+
+    display.set_pen(_black)
+    display.clear()
+    display.set_pen(_white)
+    display.text("BREAKOUT", 60, 60, WIDTH, 5)
+    display.set_pen(_green)
+    display.text("Press X to start", 70, 130, WIDTH, 2)
+    display.set_pen(_white)
+    display.text("B: left  Y: right", 80, 170, WIDTH, 2)
+    display.update()
+
+
+def update(display, buttons, led, colors, WIDTH, HEIGHT):
+    global _paddle_dir, _game_over, _acc_us, _last_us, _cleared
+
+    if not _game_started or _game_over:
+        if buttons["X"].is_pressed:
+            new_game(WIDTH, HEIGHT)
+            _last_us = time.ticks_us()
+        else:
+            return _IDLE_MS
+
+    now = time.ticks_us()
+    _acc_us += min(time.ticks_diff(now, _last_us), _MAX_STEPS * _STEP_US)
+    _last_us = now
+
+    # Paddle: toggle direction on press
+    if buttons["B"].read():
+        _paddle_dir = 0 if _paddle_dir == -1 else -1
+    if buttons["Y"].read():
+        _paddle_dir = 0 if _paddle_dir == 1 else 1
+
+    _cleared = 0
+    while _acc_us >= _STEP_US and _bricks_left and _ball_y < HEIGHT << _FP:
+        _acc_us -= _STEP_US
+        _step(WIDTH, HEIGHT)
 
     # Row cleared effect
-    if hit_row >= 0:
-        row_start = hit_row * _BRICK_COLS
-        row_clear = True
-        for j in range(row_start, row_start + _BRICK_COLS):
-            if _bricks[j][3]:
-                row_clear = False
-                break
-        if row_clear:
-            # Flash the row white
-            ry = _bricks[row_start][1]
-            display.set_pen(colors["WHITE"])
-            display.rectangle(0, ry, WIDTH, _BRICK_H)
-            display.update()
-            led.set_rgb(255, 255, 255)
-            time.sleep_ms(80)
-            led.set_rgb(0, 0, 0)
+    if _cleared:
+        # Flash the emptied rows white
+        display.set_pen(_white)
+        for row in range(_BRICK_ROWS):
+            if _cleared & (1 << row):
+                display.rectangle(0, _BRICK_TOP + row * _BRICK_DY, WIDTH, _BRICK_H)
+        display.update()
+        led.set_rgb(255, 255, 255)
+        time.sleep_ms(80)
+        led.set_rgb(0, 0, 0)
+        _last_us = time.ticks_us()  # the flash pauses the game
+
+    bx = _ball_x >> _FP
+    by = _ball_y >> _FP
 
     # All bricks cleared — win!
-    alive = False
-    for brick in _bricks:
-        if brick[3]:
-            alive = True
-            break
-    if not alive:
+    if not _bricks_left:
         _game_over = True
-        display.set_pen(colors["BLACK"])
+        display.set_pen(_black)
         display.clear()
-        display.set_pen(colors["YELLOW"])
+        display.set_pen(_yellow)
         display.text("YOU WIN!", 60, 80, WIDTH, 5)
-        display.set_pen(colors["WHITE"])
+        display.set_pen(_white)
         display.text(f"Score: {_score}", 100, 150, WIDTH, 3)
-        display.set_pen(colors["GREEN"])
+        display.set_pen(_green)
         display.text("Press X to play again", 50, 200, WIDTH, 2)
         display.update()
-        return
+        return _IDLE_MS
 
     # Ball missed paddle — lose a life
-    if _ball_y >= HEIGHT:
-        _lives -= 1
-        if _lives <= 0:
-            _game_over = True
-            display.set_pen(colors["BLACK"])
+    if _ball_y >= HEIGHT << _FP:
+        if _lose_ball(WIDTH, HEIGHT):
+            display.set_pen(_black)
             display.clear()
-            display.set_pen(colors["RED"])
+            display.set_pen(_red)
             display.text("GAME OVER", 50, 80, WIDTH, 5)
-            display.set_pen(colors["WHITE"])
+            display.set_pen(_white)
             display.text(f"Score: {_score}", 100, 150, WIDTH, 3)
-            display.set_pen(colors["GREEN"])
+            display.set_pen(_green)
             display.text("Press X to restart", 60, 200, WIDTH, 2)
             display.update()
-            return
-        else:
-            _reset_ball(WIDTH, HEIGHT)
-            return
+            return _IDLE_MS
+        return _FRAME_MS
 
     # Draw
-    display.set_pen(colors["BLACK"])
+    display.set_pen(_black)
     display.clear()
 
     # HUD: score + lives
-    display.set_pen(colors["WHITE"])
-    display.text(str(_score), 5, 2, WIDTH, 2)
+    display.set_pen(_white)
+    display.text(_score_text, 5, 2, WIDTH, 2)
+    display.set_pen(_red)
     for i in range(_lives):
-        display.set_pen(colors["RED"])
         display.circle(WIDTH - 15 - i * 18, 10, 6)
 
     # Bricks
-    for brick in _bricks:
-        if brick[3]:
-            display.set_pen(colors[brick[2]])
-            display.rectangle(brick[0], brick[1], _BRICK_W, _BRICK_H)
+    for row in range(_BRICK_ROWS):
+        bits = _alive[row]
+        if not bits:
+            continue
+        display.set_pen(_row_pens[row])
+        y = _BRICK_TOP + row * _BRICK_DY
+        x = _brick_x0
+        while bits:
+            if bits & 1:
+                display.rectangle(x, y, _BRICK_W, _BRICK_H)
+            x += _BRICK_DX
+            bits >>= 1
 
     # Ball
-    display.set_pen(colors["WHITE"])
+    display.set_pen(_white)
     display.rectangle(bx, by, _ball_size, _ball_size)
 
     # Paddle
-    display.set_pen(colors["GREEN"])
+    paddle_top = HEIGHT - _PADDLE_Y_OFFSET - _paddle_h
+    display.set_pen(_green)
     display.rectangle(_paddle_x, paddle_top, _paddle_w, _paddle_h)
 
     display.update()
+    return _FRAME_MS
+
+
+# Headless play: the game logic alone, no display or clock, for fuzzing the
+# physics and timing it apart from drawing (here or on the board). An input
+# log is one byte per physics step, the paddle direction + 1.
+
+LEFT = 0
+STILL = 1
+RIGHT = 2
+
+
+def play(WIDTH=320, HEIGHT=240, inputs=None, log=None, seed=1, max_steps=200_000, check=None):
+    """Play one game at one physics step per input.
+
+    inputs is an input log to replay; the game stops if it runs out.
+    Without it an autopilot plays: it keeps the paddle under the ball,
+    aiming off centre by a pseudo-random amount from seed after each
+    return. The input used each step is appended to log (a bytearray) if
+    given, so play(inputs=log) replays the game exactly. check(n), if
+    given, is called after every step, to test invariants. Returns the
+    steps played; the outcome is in _score, _lives and _bricks_left.
+    """
+    global _paddle_dir, _game_over
+    new_game(WIDTH, HEIGHT)
+    seed = seed % 65537
+    aim = seed % 41 - 20
+    falling = True
+    n = 0
+    while n < max_steps:
+        if inputs is not None:
+            if n >= len(inputs):
+                break
+            d = inputs[n] - 1
+        else:
+            if _ball_dy < 0 and falling:
+                seed = (seed * 75 + 74) % 65537  # ZX81's LCG: small ints only
+                aim = seed % 41 - 20
+            falling = _ball_dy > 0
+            off = (_ball_x >> _FP) + _ball_size // 2 + aim - _paddle_x - _paddle_w // 2
+            d = RIGHT - 1 if off > _PADDLE_SPEED // 2 else LEFT - 1 if off < -(_PADDLE_SPEED // 2) else 0
+        if log is not None:
+            log.append(d + 1)
+        _paddle_dir = d
+        _step(WIDTH, HEIGHT)
+        n += 1
+        if check is not None:
+            check(n)
+        if _ball_y >= HEIGHT << _FP and _lose_ball(WIDTH, HEIGHT):
+            break
+        if not _bricks_left:
+            _game_over = True
+            break
+    return n
@@ -0,0 +1,209 @@
+import gc
+import time
+
+from pico_utils import local_time
+
+# Literary clock: each minute shows a line from a book that names the time.
+# Quotes come from quotes.pack (see quotepack.py) when it is on flash, else
+# from quotes_gz/HH.json.gz, one gzipped JSON object per hour:
+#   {"HH:MM": {"annot": [...], "title": [...], "author": [...],
+#              "nsfw": [...], "prefix": [...], "suffix": [...]}, ...}
+# An hour file is 40-60 KB of JSON, so it is stream-parsed a minute at a
+# time and laid out with quotelayout; the pack has layouts built in. Either
+# way only one quote per minute is kept. The next hour is
+# loaded in small steps during the last few minutes of this one, so the
+# hour change is a dict swap and each minute change is a dict lookup.
+
+_PACK_FILE = "quotes.pack"
+_QUOTES_DIR = "quotes_gz"
+_PREFETCH_S = 180  # start loading the next hour this long before it starts
+_STEP_US = 8000  # loader time per update() while prefetching
+_STEP_MS = 20  # update() interval while prefetching
+
+# Must match quotelayout's box, which the pack was built with
+_BOX_X = 10
+_BOX_Y = 40
+_LINE = 10
+
+_hour = None  # hour whose quotes are in _quotes
+_quotes = {}  # "HH:MM" -> (title, author, text, a0, a1, scale, lines)
+_next_hour = None
+_next = None  # being filled for _next_hour
+_loader = None  # generator filling _next
+_last_min = None
+_worst_us = 0  # slowest update() this hour
+_swap_us = 0  # the update() that changed the hour
+
+
+def _inflate(f):
+    """A read()able stream of the gunzipped file f."""
+    try:
+        import deflate
+
+        return deflate.DeflateIO(f, deflate.GZIP)
+    except ImportError:
+        pass
+    import zlib
+
+    if hasattr(zlib, "DecompIO"):  # MicroPython before 1.21
+        return zlib.DecompIO(f, 31)
+    import gzip  # CPython
+
+    return gzip.GzipFile(fileobj=f)
+
+
+def _pick(recs, day):
+    """One quote for a minute: rotates daily through the sfw ones.
+    recs are tuples whose first item is the nsfw flag."""
+    ok = [r for r in recs if not r[0]] or recs
+    return ok[day % len(ok)]
+
+
+def _load(hour, into):
+    """Fill into with the quotes for hour, yielding after each minute so the
+    caller can spread the work across frames."""
+    day = local_time()[7]
+    try:
+        from quotepack import QuotePack
+
+        pack = QuotePack(_PACK_FILE)
+    except (OSError, ValueError):
+        pack = None
+    if pack is not None:
+        try:
+            for m in range(60):
+                recs = pack.get(hour * 60 + m)
+                if recs:
+                    into["%02d:%02d" % (hour, m)] = _pick(recs, day)[1:]
+                yield
+        finally:
+            pack.close()
+        return
+
+    import jsonstream
+    import quotelayout
+
+    try:
+        f = open("%s/%02d.json.gz" % (_QUOTES_DIR, hour), "rb")
+    except OSError as e:
+        print(f"No quotes for {hour:02d}: {e}")
+        return
+    try:
+        for key, q in jsonstream.items(_inflate(f).read):
+            recs = [
+                (q["nsfw"][i] == "nsfw", q["title"][i], q["author"][i], q["prefix"][i], q["annot"][i], q["suffix"][i])
+                for i in range(len(q["annot"]))
+            ]
+            del q
+            _, title, author, prefix, annot, suffix = _pick(recs, day)
+            into[key] = (quotelayout.normalize(title), quotelayout.normalize(author)) + quotelayout.layout(
+                prefix, annot, suffix
+            )
+            yield
+    finally:
+        f.close()
+
+
+def _run(loader, budget_us=None):
+    """Step loader until it is done (True) or budget_us has passed (False)."""
+    start = time.ticks_us()
+    for _ in loader:
+        if budget_us is not None and time.ticks_diff(time.ticks_us(), start) > budget_us:
+            return False
+    return True
+
+
+def _set_hour(hour):
+    global _hour, _quotes, _next_hour, _next, _loader
+    if _next_hour == hour:
+        if _loader is not None:
+            _run(_loader)  # prefetch didn't finish in time: finish it now
+        _quotes = _next
+    else:
+        _quotes = {}
+        _run(_load(hour, _quotes))
+    _hour = hour
+    _next_hour = _next = _loader = None
+    gc.collect()
+
+
+def _draw(display, colors, WIDTH, HEIGHT, t):
+    display.set_pen(colors["BLACK"])
+    display.clear()
+
+    display.set_pen(colors["YELLOW"])
+    display.text("%02d:%02d" % (t[3], t[4]), 10, 5, WIDTH, 3)
+
+    q = _quotes.get("%02d:%02d" % (t[3], t[4]))
+    if q is None:
+        display.set_pen(colors["WHITE"])
+        display.text("No quote for this minute.", 10, 60, WIDTH - 20, 2)
+        display.update()
+        return
+
+    # Pre-wrapped lines; the time phrase text[a0:a1] is drawn in yellow
+    title, author, text, a0, a1, scale, lines = q
+    y = _BOX_Y
+    for start, end in lines:
+        x = _BOX_X
+        for s, e, pen in ((start, a0, "WHITE"), (a0, a1, "YELLOW"), (a1, end, "WHITE")):
+            s = max(s, start)
+            e = min(e, end)
+            if s < e:
+                part = text[s:e]
+                display.set_pen(colors[pen])
+                display.text(part, x, y, -1, scale)
+                x += display.measure_text(part, scale)
+        y += _LINE * scale
+
+    display.set_pen(colors["CYAN"])
+    display.text(f"- {title}, {author}", 10, HEIGHT - 36, WIDTH - 20, 1)
+
+    display.update()
+
+
+def init(display, buttons, led, colors, WIDTH, HEIGHT):
+    global _last_min, _worst_us, _hour, _next_hour, _next, _loader
+    _hour = _next_hour = _next = _loader = None
+    _last_min = None
+    _worst_us = 0
+    display.set_pen(colors["BLACK"])
+    display.clear()
+    display.set_pen(colors["WHITE"])
+    display.text("Loading quotes...", 10, 100, WIDTH, 2)
+    display.update()
+
+
+def update(display, buttons, led, colors, WIDTH, HEIGHT):
+    global _last_min, _next_hour, _next, _loader, _worst_us, _swap_us
+    start = time.ticks_us()
+    t = local_time()
+    hour, minute, sec = t[3], t[4], t[5]
+
+    swapped = hour != _hour
+    if swapped:
+        _set_hour(hour)
+    elif _next_hour is None and (60 - minute) * 60 - sec <= _PREFETCH_S:
+        _next_hour = (hour + 1) % 24
+        _next = {}
+        _loader = _load(_next_hour, _next)
+
+    if _loader is not None and _run(_loader, _STEP_US):
+        _loader = None
+
+    if minute != _last_min:
+        _last_min = minute
+        _draw(display, colors, WIDTH, HEIGHT, t)
+
+    took = time.ticks_diff(time.ticks_us(), start)
+    if swapped:
+        if _worst_us:
+            print(f"Quotes: hour change {took} us, worst frame last hour {_worst_us} us")
+        _swap_us = took
+        _worst_us = took
+    elif took > _worst_us:
+        _worst_us = took
+
+    if _loader is not None:
+        return _STEP_MS
+    return (60 - sec) * 1000
@@ -1,5 +1,8 @@
 import time
 
+WAKE_ON = ("X",)
+_IDLE_MS = 1000  # waiting on a press; the X IRQ wakes us straight away
+
 # States: "idle", "waiting", "go", "result", "too_early"
 _state = "idle"
 _wait_start = 0
@@ -81,7 +84,7 @@ def update(display, buttons, led, colors, WIDTH, HEIGHT):
             display.text("X: try again", 90, 200, WIDTH, 2)
             display.update()
             led.set_rgb(0, 0, 0)
-            return
+            return _IDLE_MS
 
         now = time.ticks_ms()
         if time.ticks_diff(now, _wait_start) >= _delay_ms:
@@ -144,3 +147,8 @@ def update(display, buttons, led, colors, WIDTH, HEIGHT):
             display.set_pen(colors["RED"])
             display.text("Don't press yet!", 70, 160, WIDTH, 2)
             display.update()
+
+    if _state == "waiting":
+        # Sleep right up to the moment GO is due
+        return max(1, _delay_ms - time.ticks_diff(time.ticks_ms(), _wait_start))
+    return _IDLE_MS
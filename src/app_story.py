@@ -1,9 +1,26 @@
 import gc
 import time
 
+from screen import spinner
+
+WAKE_ON = ("X",)
+_IDLE_MS = 1000
+_SPIN_MS = 100
+
 _story = "Press X for a story!"
 _loading = False
 _x_was_pressed = False
+_async = False  # True once run() owns the LLM call under the asyncio runtime
+_spin = 0
+_tail = ""  # streamed text not yet painted (the unfinished line)
+_row = 0  # next story line to paint
+
+_TEXT_X = 10
+_TEXT_Y = 40
+_TEXT_BOTTOM = 220  # above the button hint
+_LINE_H = 16  # bitmap8 at scale 2
+
+_PROMPT = "Tell me something amazing about science, animals, space, or history"
 
 _SYSTEM = (
     "You are a funny storyteller for kids. "
@@ -13,7 +30,68 @@ _SYSTEM = (
 )
 
 
+def _wrap(display, text, width):
+    """Greedy word wrap. Returns (lines, rest): lines are final, rest is the
+    last line, which may still grow while a reply streams in."""
+    lines = []
+    start = end = i = 0  # line start, end of its last fitting word, cursor
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c == "\n":
+            lines.append(text[start:i])
+            i += 1
+            start = end = i
+            continue
+        if c == " ":
+            if start == i:
+                start = end = i + 1  # no leading spaces
+            i += 1
+            continue
+        j = i
+        while j < n and text[j] not in " \n":
+            j += 1
+        if end > start and display.measure_text(text[start:j], 2) > width:
+            lines.append(text[start:end])
+            start = i
+        end = j
+        i = j
+    return lines, text[start:]
+
+
+def _paint_line(display, line):
+    global _row
+    y = _TEXT_Y + _row * _LINE_H
+    if y + _LINE_H <= _TEXT_BOTTOM:
+        display.text(line, _TEXT_X, y, -1, 2)
+    _row += 1
+
+
+def _on_delta(display, colors, WIDTH, text):
+    """Paint each story line as soon as the streamed reply completes it."""
+    global _story, _tail, _row
+    if _row == 0 and not _tail:
+        # First words: replace "Searching..."
+        _story = ""
+        display.clear_rect(0, _TEXT_Y, WIDTH, _TEXT_BOTTOM - _TEXT_Y, colors["BLUE"])
+    _story += text
+    lines, _tail = _wrap(display, _tail + text, WIDTH - 20)
+    if lines:
+        display.set_pen(colors["WHITE"])
+        for line in lines:
+            _paint_line(display, line)
+        display.update()
+
+
+def _stream_to(display, colors, WIDTH):
+    global _tail, _row
+    _tail = ""
+    _row = 0
+    return lambda text: _on_delta(display, colors, WIDTH, text)
+
+
 def _draw(display, colors, WIDTH, HEIGHT):
+    global _row
     # Dark blue background
     display.set_pen(colors["BLUE"])
     display.clear()
@@ -28,7 +106,11 @@ def _draw(display, colors, WIDTH, HEIGHT):
 
     # Story text — white on dark blue for readability
     display.set_pen(colors["WHITE"])
-    display.text(_story, 10, 40, WIDTH - 20, 2)
+    lines, rest = _wrap(display, _story, WIDTH - 20)
+    _row = 0
+    for line in lines:
+        _paint_line(display, line)
+    _paint_line(display, rest)
 
     # Button hint
     display.set_pen(colors["CYAN"])
@@ -45,8 +127,36 @@ def init(display, buttons, led, colors, WIDTH, HEIGHT):
     _draw(display, colors, WIDTH, HEIGHT)
 
 
+async def run(display, buttons, led, colors, WIDTH, HEIGHT):
+    """Background LLM calls under the asyncio runtime."""
+    global _story, _loading, _async
+    import runtime
+
+    _async = True
+    while True:
+        if _loading:
+            try:
+                import llm
+                gc.collect()
+                _story = await llm.prompt_async(
+                    _PROMPT,
+                    system=_SYSTEM,
+                    max_tokens=400,
+                    web_search=True,
+                    on_delta=_stream_to(display, colors, WIDTH),
+                )
+            except Exception as e:
+                _story = f"Error: {e}"
+                print(f"LLM error: {e}")
+            finally:
+                led.set_rgb(0, 0, 0)
+            _loading = False
+            _draw(display, colors, WIDTH, HEIGHT)
+        await runtime.sleep_ms(_SPIN_MS)
+
+
 def update(display, buttons, led, colors, WIDTH, HEIGHT):
-    global _story, _loading, _x_was_pressed
+    global _story, _loading, _x_was_pressed, _spin
 
     x_pressed = buttons["X"].read()
     x_edge = x_pressed and not _x_was_pressed
@@ -58,14 +168,18 @@ def update(display, buttons, led, colors, WIDTH, HEIGHT):
         _draw(display, colors, WIDTH, HEIGHT)
         led.set_rgb(0, 0, 255)
 
+        if _async:
+            return _SPIN_MS  # run() picks it up
+
         try:
             import llm
             gc.collect()
             _story = llm.prompt(
-                "Tell me something amazing about science, animals, space, or history",
+                _PROMPT,
                 system=_SYSTEM,
                 max_tokens=400,
                 web_search=True,
+                on_delta=_stream_to(display, colors, WIDTH),
             )
         except Exception as e:
             _story = f"Error: {e}"
@@ -74,3 +188,10 @@ def update(display, buttons, led, colors, WIDTH, HEIGHT):
         led.set_rgb(0, 0, 0)
         _loading = False
         _draw(display, colors, WIDTH, HEIGHT)
+
+    if _loading:
+        _spin += 1
+        spinner(display, WIDTH - 20, 16, _spin, colors["WHITE"], colors["BLUE"])
+        return _SPIN_MS
+
+    return _IDLE_MS
@@ -1,5 +1,9 @@
 import math
 import time
+from array import array
+
+WAKE_ON = ("B", "X", "Y")
+_IDLE_MS = 1000  # nothing to animate; button presses wake us early
 
 _duration_options = [1, 2, 3, 5, 10, 15, 20, 25, 30, 45, 60]
 _duration_idx = 3  # default 5 min
@@ -25,6 +29,31 @@ _DONE_MSGS = [
 ]
 _done_msg_idx = 0
 
+# Countdown pie on the left. The used-up part is a black wedge, filled with
+# triangles from the centre out to _PIE_EDGE: at up to _PIE_SPAN degrees a
+# triangle still covers the rim (88 * cos 22.5 > 80), and the edge stays
+# clear of the text on the right. Each second paints just the new slice.
+_CX = 90
+_CY = 120
+_RADIUS = 80
+_PIE_EDGE = 88
+_PIE_SPAN = 45
+# Time left, drawn over the middle of the pie: the box "00:00" covers in
+# bitmap8 at scale 4. Repainting the wedge inside it only has to reach its
+# far corner, so wider triangles do (88 * cos 30 > 73).
+_TIME_X = _CX - 35
+_TIME_Y = _CY - 10
+_TIME_W = 104
+_TIME_H = 32
+_TIME_SPAN = 60
+# sin of 0-90 degrees << 10, for wedge corners without float maths per tick
+_SIN = array("h", [int(math.sin(d * math.pi / 180) * 1024 + 0.5) for d in range(91)])
+_BAR_X, _BAR_Y, _BAR_W, _BAR_H = 195, 135, 115, 12
+
+_pie_pen = None  # what the pie was last drawn as: colour,
+_pie_deg = 0  # degrees used up,
+_bar_fill = 0  # and px of progress bar still coloured
+
 
 def _pie_color(colors, fraction):
     if fraction > 0.5:
@@ -34,37 +63,59 @@ def _pie_color(colors, fraction):
     return colors["RED"]
 
 
-def _draw_pie(display, colors, cx, cy, radius, fraction_remaining):
-    """Draw a countdown pie with color based on time left."""
-    display.set_pen(_pie_color(colors, fraction_remaining))
-    display.circle(cx, cy, radius)
+def _pie_point(deg):
+    """Where the line deg degrees clockwise from 12 o'clock meets _PIE_EDGE."""
+    q, d = divmod(deg % 360, 90)
+    s = _SIN[d]
+    c = _SIN[90 - d]
+    if q == 0:
+        x, y = s, -c
+    elif q == 1:
+        x, y = c, s
+    elif q == 2:
+        x, y = -s, c
+    else:
+        x, y = -c, -s
+    return _CX + ((x * _PIE_EDGE + 512) >> 10), _CY + ((y * _PIE_EDGE + 512) >> 10)
 
-    if fraction_remaining >= 1.0:
-        return
 
-    fraction_consumed = 1.0 - fraction_remaining
-    if fraction_consumed <= 0:
-        return
+def _fill_wedge(display, deg0, deg1, span):
+    """Fill the wedge from deg0 to deg1 degrees, span degrees a triangle."""
+    x0, y0 = _pie_point(deg0)
+    while deg0 < deg1:
+        deg = min(deg0 + span, deg1)
+        x, y = _pie_point(deg)
+        display.triangle(_CX, _CY, x0, y0, x, y)
+        deg0, x0, y0 = deg, x, y
 
-    display.set_pen(colors["BLACK"])
 
-    if fraction_consumed >= 1.0:
-        display.circle(cx, cy, radius)
+def _used_deg():
+    if _duration_secs <= 0:
+        return 360
+    return (_duration_secs - _remaining) * 360 // _duration_secs
+
+
+def _draw_pie(display, colors, pen, deg):
+    """Draw a countdown pie with deg degrees used up."""
+    display.set_pen(pen)
+    display.circle(_CX, _CY, _RADIUS)
+    if deg <= 0:
         return
+    display.set_pen(colors["BLACK"])
+    if deg >= 360:
+        display.circle(_CX, _CY, _RADIUS)
+    else:
+        _fill_wedge(display, 0, deg, _PIE_SPAN)
 
-    start_angle = -math.pi / 2
-    end_angle = start_angle + fraction_consumed * 2 * math.pi
-    steps = max(4, int(fraction_consumed * 60))
 
-    for i in range(steps):
-        a1 = start_angle + (end_angle - start_angle) * i / steps
-        a2 = start_angle + (end_angle - start_angle) * (i + 1) / steps
-        r = radius * 1.5
-        x1 = int(cx + r * math.cos(a1))
-        y1 = int(cy + r * math.sin(a1))
-        x2 = int(cx + r * math.cos(a2))
-        y2 = int(cy + r * math.sin(a2))
-        display.triangle(cx, cy, x1, y1, x2, y2)
+def _draw_time(display, colors, WIDTH):
+    mins = _remaining // 60
+    secs = _remaining % 60
+    display.set_pen(colors["WHITE"])
+    if mins > 0:
+        display.text(f"{mins}:{secs:02}", _TIME_X, _TIME_Y, WIDTH, 4)
+    else:
+        display.text(f"{secs}", _CX - 18, _TIME_Y, WIDTH, 4)
 
 
 def init(display, buttons, led, colors, WIDTH, HEIGHT):
@@ -90,6 +141,7 @@ def init(display, buttons, led, colors, WIDTH, HEIGHT):
 
 
 def _draw_screen(display, colors, WIDTH, HEIGHT):
+    global _pie_pen, _pie_deg, _bar_fill
     display.set_pen(colors["BLACK"])
     display.clear()
 
@@ -113,20 +165,12 @@ def _draw_screen(display, colors, WIDTH, HEIGHT):
         display.update()
         return
 
-    mins = _remaining // 60
-    secs = _remaining % 60
-
-    # Pie chart on the left
-    cx, cy, radius = 90, 120, 80
+    # Pie chart on the left, time remaining inside it
     fraction = _remaining / _duration_secs if _duration_secs > 0 else 0
-    _draw_pie(display, colors, cx, cy, radius, fraction)
-
-    # Time remaining inside pie
-    display.set_pen(colors["WHITE"])
-    if mins > 0:
-        display.text(f"{mins}:{secs:02}", cx - 35, cy - 10, WIDTH, 4)
-    else:
-        display.text(f"{secs}", cx - 18, cy - 10, WIDTH, 4)
+    _pie_pen = _pie_color(colors, fraction)
+    _pie_deg = _used_deg()
+    _draw_pie(display, colors, _pie_pen, _pie_deg)
+    _draw_time(display, colors, WIDTH)
 
     # Duration label on the right
     display.set_pen(colors["CYAN"])
@@ -142,13 +186,12 @@ def _draw_screen(display, colors, WIDTH, HEIGHT):
         display.text("READY", 210, 100, WIDTH, 2)
 
     # Progress bar under the right side
-    bar_x, bar_y, bar_w, bar_h = 195, 135, 115, 12
     display.set_pen(colors["WHITE"])
-    display.rectangle(bar_x, bar_y, bar_w, bar_h)
-    display.set_pen(_pie_color(colors, fraction))
-    fill_w = max(0, int(bar_w * fraction))
-    if fill_w > 0:
-        display.rectangle(bar_x, bar_y, fill_w, bar_h)
+    display.rectangle(_BAR_X, _BAR_Y, _BAR_W, _BAR_H)
+    display.set_pen(_pie_pen)
+    _bar_fill = max(0, int(_BAR_W * fraction))
+    if _bar_fill > 0:
+        display.rectangle(_BAR_X, _BAR_Y, _bar_fill, _BAR_H)
 
     # Controls
     display.set_pen(colors["WHITE"])
@@ -157,6 +200,33 @@ def _draw_screen(display, colors, WIDTH, HEIGHT):
     display.update()
 
 
+def _draw_tick(display, colors, WIDTH, HEIGHT):
+    """A second less while running: paint the newly used slice, the time
+    and the bar's end, unless the pie changes colour (then everything)."""
+    global _pie_deg, _bar_fill
+    fraction = _remaining / _duration_secs
+    if _pie_color(colors, fraction) != _pie_pen:
+        _draw_screen(display, colors, WIDTH, HEIGHT)
+        return
+    deg = _used_deg()
+    if deg > _pie_deg:
+        display.set_pen(colors["BLACK"])
+        _fill_wedge(display, _pie_deg, deg, _PIE_SPAN)
+        _pie_deg = deg
+    # The digits sit on the pie: put back what they covered, then redraw
+    display.clear_rect(_TIME_X, _TIME_Y, _TIME_W, _TIME_H, _pie_pen)
+    if deg > 0:
+        display.set_pen(colors["BLACK"])
+        _fill_wedge(display, 0, deg, _TIME_SPAN)
+    _draw_time(display, colors, WIDTH)
+    fill = max(0, int(_BAR_W * fraction))
+    if fill < _bar_fill:
+        display.set_pen(colors["WHITE"])
+        display.rectangle(_BAR_X + fill, _BAR_Y, _bar_fill - fill, _BAR_H)
+        _bar_fill = fill
+    display.update()
+
+
 def update(display, buttons, led, colors, WIDTH, HEIGHT):
     global _duration_idx, _duration_secs, _remaining, _running
     global _start_ticks, _elapsed_at_pause, _finished
@@ -175,6 +245,7 @@ def update(display, buttons, led, colors, WIDTH, HEIGHT):
     _y_was_pressed = y_pressed
 
     needs_redraw = False
+    ticked = False
 
     if _finished:
         now = time.ticks_ms()
@@ -197,7 +268,9 @@ def update(display, buttons, led, colors, WIDTH, HEIGHT):
 
         if needs_redraw:
             _draw_screen(display, colors, WIDTH, HEIGHT)
-        return
+        if not _finished:
+            return _IDLE_MS
+        return max(1, 301 - time.ticks_diff(time.ticks_ms(), _last_flash))
 
     # X: start/pause
     if x_edge:
@@ -226,12 +299,13 @@ def update(display, buttons, led, colors, WIDTH, HEIGHT):
         needs_redraw = True
 
     # Update remaining time
+    elapsed_ms = 0
     if _running:
         elapsed_ms = _elapsed_at_pause + time.ticks_diff(time.ticks_ms(), _start_ticks)
         new_remaining = max(0, _duration_secs - elapsed_ms // 1000)
         if new_remaining != _remaining:
             _remaining = new_remaining
-            needs_redraw = True
+            ticked = True
         if _remaining <= 0:
             _finished = True
             _running = False
@@ -243,3 +317,12 @@ def update(display, buttons, led, colors, WIDTH, HEIGHT):
 
     if needs_redraw:
         _draw_screen(display, colors, WIDTH, HEIGHT)
+    elif ticked:
+        _draw_tick(display, colors, WIDTH, HEIGHT)
+
+    if _finished:
+        return 301
+    if _running:
+        # Wake exactly when the next whole second has elapsed
+        return 1000 - elapsed_ms % 1000
+    return _IDLE_MS
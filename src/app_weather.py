@@ -1,11 +1,29 @@
 import gc
 import time
 
+from screen import spinner
+
+WAKE_ON = ("X",)
+_IDLE_MS = 1000
+_SPIN_MS = 100
+
 _data = None
-_last_fetch = 0
+_fetched_at = 0  # time.time() of the data in _data (0 = none)
+_tried_at = 0  # time.time() of the last fetch attempt
+_saved_at = 0  # _fetched_at of the copy on flash
 _x_was_pressed = False
 _FETCH_INTERVAL = 600_000  # 10 minutes
 
+# Last good forecast on flash, so switching back in draws at once. Written
+# via a temp file + rename (atomic on littlefs) and at most every 30 min.
+_CACHE_FILE = "weather.json"
+_CACHE_TMP = "weather.tmp"
+_SAVE_INTERVAL = 1800  # seconds
+_refresh = False  # a fetch is wanted
+_async = False  # True once run() owns fetching under the asyncio runtime
+_fetching = False
+_spin = 0
+
 _DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 
 _URL = (
@@ -17,6 +35,19 @@ _URL = (
     "&forecast_days=3"
 )
 
+# The only values _draw() uses; everything else is skipped while parsing
+_FIELDS = (
+    "current.temperature_2m",
+    "current.weather_code",
+    "current.relative_humidity_2m",
+    "current.wind_speed_10m",
+    "daily.time[0..2]",
+    "daily.temperature_2m_max[0..2]",
+    "daily.temperature_2m_min[0..2]",
+    "daily.weather_code[0..2]",
+    "daily.precipitation_probability_max[0..2]",
+)
+
 # WMO weather codes to short descriptions and colors
 _WMO = {
     0: ("Clear", "YELLOW"),
@@ -43,20 +74,94 @@ _WMO = {
 }
 
 
+def _load():
+    """Read the cached forecast into _data, if there is a usable one."""
+    global _data, _fetched_at, _saved_at
+    try:
+        import json
+
+        with open(_CACHE_FILE) as f:
+            ts, data = json.load(f)
+    except OSError:
+        return  # nothing cached yet
+    except (ValueError, TypeError) as e:
+        print(f"Weather cache unreadable: {e}")
+        return
+    _data = data
+    _fetched_at = _saved_at = ts
+
+
+def _save():
+    """Write _data to flash, unless the copy there is recent enough."""
+    global _saved_at
+    if 0 <= _fetched_at - _saved_at < _SAVE_INTERVAL:
+        return
+    import json
+    import os
+
+    try:
+        with open(_CACHE_TMP, "w") as f:
+            json.dump([_fetched_at, _data], f)
+        try:
+            os.rename(_CACHE_TMP, _CACHE_FILE)
+        except OSError:
+            os.remove(_CACHE_FILE)  # filesystems that won't rename over a file
+            os.rename(_CACHE_TMP, _CACHE_FILE)
+        _saved_at = _fetched_at
+    except OSError as e:
+        print(f"Weather cache not saved: {e}")
+
+
+def _stale():
+    age = time.time() - _fetched_at
+    return _data is None or not 0 <= age * 1000 < _FETCH_INTERVAL
+
+
+def _got(data):
+    global _data, _fetched_at
+    _data = data
+    _fetched_at = time.time()
+    _save()
+
+
+def _failed(e):
+    global _data
+    print(f"Weather error: {e}")
+    if _data is None or "error" in _data:
+        _data = {"error": str(e)}
+    # else keep showing the last good forecast
+
+
 def _fetch():
-    global _data, _last_fetch
+    global _tried_at
     gc.collect()
+    _tried_at = time.time()
     try:
         import requests
         response = requests.get(_URL)
-        _data = response.json()
+        data = response.json(fields=_FIELDS)
         response.close()
         del response
         gc.collect()
-        _last_fetch = time.ticks_ms()
+        _got(data)
     except Exception as e:
-        _data = {"error": str(e)}
-        print(f"Weather error: {e}")
+        _failed(e)
+
+
+async def _fetch_async():
+    global _tried_at
+    gc.collect()
+    _tried_at = time.time()
+    try:
+        import arequests
+        response = await arequests.get(_URL, stream=True)
+        data = await response.json(fields=_FIELDS)
+        response.close()
+        del response
+        gc.collect()
+        _got(data)
+    except Exception as e:
+        _failed(e)
 
 
 def _day_name(date_str):
@@ -151,25 +256,58 @@ def _draw(display, colors, WIDTH, HEIGHT):
 
 
 def init(display, buttons, led, colors, WIDTH, HEIGHT):
-    global _data, _last_fetch, _x_was_pressed
+    global _data, _fetched_at, _tried_at, _saved_at, _x_was_pressed, _refresh
     _data = None
-    _last_fetch = 0
+    _fetched_at = _tried_at = _saved_at = 0
     _x_was_pressed = False
+    _load()
+    _tried_at = _fetched_at
+    # Draw what's cached now; first update() or run() refetches if it's old
+    _refresh = _stale()
     _draw(display, colors, WIDTH, HEIGHT)
-    _fetch()
-    _draw(display, colors, WIDTH, HEIGHT)
+
+
+async def run(display, buttons, led, colors, WIDTH, HEIGHT):
+    """Background fetch loop under the asyncio runtime."""
+    global _async, _refresh, _fetching
+    import runtime
+
+    _async = True
+    while True:
+        if _refresh:
+            _refresh = False
+            _fetching = True
+            try:
+                await _fetch_async()
+            finally:
+                _fetching = False
+            _draw(display, colors, WIDTH, HEIGHT)
+        await runtime.sleep_ms(_SPIN_MS)
 
 
 def update(display, buttons, led, colors, WIDTH, HEIGHT):
-    global _x_was_pressed
+    global _x_was_pressed, _refresh, _spin
 
     x_pressed = buttons["X"].read()
     x_edge = x_pressed and not _x_was_pressed
     _x_was_pressed = x_pressed
 
-    now = time.ticks_ms()
-    auto_refresh = _last_fetch > 0 and time.ticks_diff(now, _last_fetch) > _FETCH_INTERVAL
+    auto_refresh = (time.time() - _tried_at) * 1000 > _FETCH_INTERVAL
 
-    if x_edge or auto_refresh:
+    if (x_edge or auto_refresh) and not _fetching:
+        _refresh = True
+
+    if _async:
+        # run() is fetching in the background; just keep the spinner moving
+        if _fetching or _refresh:
+            _spin += 1
+            spinner(display, WIDTH - 16, 14, _spin, colors["WHITE"], colors["BLACK"])
+            return _SPIN_MS
+        return _IDLE_MS
+
+    if _refresh:
+        _refresh = False
         _fetch()
         _draw(display, colors, WIDTH, HEIGHT)
+
+    return _IDLE_MS
@@ -0,0 +1,163 @@
+"""Minimal asyncio HTTP client for apps running under runtime.py.
+
+Same call shape as requests.get/post, but every socket wait is awaited so
+the UI keeps running during DNS, the TLS handshake and a slow body.
+Uses HTTP/1.0 so responses are never chunked. With stream=True the body
+is left on the connection and read line by line with await readline(),
+or parsed piece by piece as it arrives with await json(fields).
+"""
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+_READ_SIZE = 256  # body bytes per await while stream-parsing
+
+
+class Response:
+    def __init__(self, status_code, reason, headers, content):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.encoding = "utf-8"
+        self._reader = None  # set for stream=True until the body is read
+        self._writer = None
+
+    def close(self):
+        self.content = None
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
+
+    async def readline(self):
+        """Next line of a stream=True body, ending included; b"" at the end."""
+        if self._reader is None:
+            return b""
+        line = await self._reader.readline()
+        if not line:
+            self.close()
+        return line
+
+    @property
+    def text(self):
+        return str(self.content, self.encoding)
+
+    async def json(self, fields=None):
+        """Parse the body. With fields (dotted key paths, see jsonstream) and
+        stream=True, the body is parsed as it arrives, keeping only those
+        values, and is never held whole."""
+        if fields is None:
+            import json
+
+            body = self.content
+            if self._reader is not None:
+                body = await self._reader.read(-1)
+                self.close()
+            return json.loads(body)
+
+        import jsonstream
+
+        if self._reader is None:
+            return jsonstream.select(self.content, fields)
+        sel = jsonstream.Selector(fields)
+        try:
+            while True:
+                chunk = await self._reader.read(_READ_SIZE)
+                if not chunk:
+                    break
+                sel.feed(chunk)
+        finally:
+            self.close()
+        return sel.result()
+
+
+async def request(method, url, data=None, json=None, headers=None, stream=False):
+    if headers is None:
+        headers = {}
+
+    try:
+        proto, _, host, path = url.split("/", 3)
+    except ValueError:
+        proto, _, host = url.split("/", 2)
+        path = ""
+    if proto == "http:":
+        port = 80
+        ctx = None
+    elif proto == "https:":
+        import netcache
+
+        port = 443
+        ctx = netcache.context()
+    else:
+        raise ValueError("Unsupported protocol: " + proto)
+
+    if ":" in host:
+        host, port = host.split(":", 1)
+        port = int(port)
+
+    if json is not None:
+        from json import dumps
+
+        data = dumps(json)
+        if "Content-Type" not in headers:
+            headers["Content-Type"] = "application/json"
+    if isinstance(data, str):
+        data = data.encode()
+
+    reader, writer = await asyncio.open_connection(host, port, ssl=ctx)
+    try:
+        writer.write(b"%s /%s HTTP/1.0\r\nHost: %s\r\n" % (method.encode(), path.encode(), host.encode()))
+        if data:
+            writer.write(b"Content-Length: %d\r\n" % len(data))
+        for k in headers:
+            writer.write(("%s: %s\r\n" % (k, headers[k])).encode())
+        writer.write(b"Connection: close\r\n\r\n")
+        if data:
+            writer.write(data)
+        await writer.drain()
+
+        line = await reader.readline()
+        parts = line.split(None, 2)
+        if len(parts) < 2:
+            raise ValueError("HTTP error: BadStatusLine:\n%s" % line)
+        status = int(parts[1])
+        reason = str(parts[2].rstrip(), "utf-8") if len(parts) > 2 else ""
+
+        resp_headers = {}
+        length = -1
+        while True:
+            line = await reader.readline()
+            if not line or line == b"\r\n":
+                break
+            k, v = str(line, "utf-8").split(":", 1)
+            resp_headers[k] = v.strip()
+            if k.lower() == "content-length":
+                length = int(v)
+
+        if stream:
+            resp = Response(status, reason, resp_headers, None)
+            resp._reader = reader
+            resp._writer = writer
+            writer = None  # now owned by resp
+            return resp
+
+        if length >= 0:
+            content = await reader.readexactly(length) if length else b""
+        else:
+            content = await reader.read(-1)
+    finally:
+        if writer is not None:
+            writer.close()
+            await writer.wait_closed()
+
+    return Response(status, reason, resp_headers, content)
+
+
+async def get(url, **kw):
+    return await request("GET", url, **kw)
+
+
+async def post(url, **kw):
+    return await request("POST", url, **kw)
@@ -0,0 +1,434 @@
+"""Streaming JSON pull-parser that keeps only the values you ask for.
+
+json.loads needs the whole body in RAM and then builds every nested dict
+and list in it. select() instead pulls bytes from read(n) a block at a
+time (or walks a buffer in place), skips anything not on a requested key
+path without building it, and returns a small nested structure holding
+just the wanted values:
+
+    select(resp.read, ("current.temperature_2m", "daily.time[0..2]"))
+    -> {"current": {"temperature_2m": 22.4}, "daily": {"time": [...]}}
+
+A path ending in [a..b] keeps array elements a to b inclusive; [n] keeps
+one element (ranges only apply to the last key). A path that stops at an
+object or array keeps all of it.
+
+Selector does the same push-style, for a body that arrives through
+feed() calls rather than a read(n) function (asyncio streams).
+"""
+
+_WS = b" \t\r\n"
+_NUM = b"+-0123456789.eE"
+
+
+def _spec(fields):
+    """Turn dotted paths into a tree: dict = descend, True = keep whole
+    value, (lo, hi) = keep that inclusive slice of an array."""
+    tree = {}
+    for path in fields:
+        want = True
+        if path.endswith("]"):
+            path, rng = path[:-1].split("[", 1)
+            lo, _, hi = rng.partition("..")
+            want = (int(lo), int(hi or lo))
+        node = tree
+        keys = path.split(".")
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = want
+    return tree
+
+
+def _eof(n):
+    return b""
+
+
+class _Stream:
+    def __init__(self, source, size):
+        if callable(source):
+            self._read = source
+            self._buf = b""
+        else:
+            # Body already in RAM: walk it in place through a memoryview
+            self._read = _eof
+            self._buf = memoryview(source)
+        self._size = size
+        self._i = 0
+
+    def _fill(self):
+        self._buf = self._read(self._size)
+        self._i = 0
+        return len(self._buf) > 0
+
+    def peek(self):
+        """Next non-whitespace byte (as int) without consuming it, -1 at EOF."""
+        while True:
+            if self._i >= len(self._buf) and not self._fill():
+                return -1
+            c = self._buf[self._i]
+            if c not in _WS:
+                return c
+            self._i += 1
+
+    def take(self):
+        c = self.peek()
+        if c < 0:
+            raise ValueError("Unexpected end of JSON")
+        self._i += 1
+        return c
+
+    def expect(self, c):
+        if self.take() != c:
+            raise ValueError("Malformed JSON")
+
+    def string(self, keep):
+        """Consume a string after its opening quote; return it if keep."""
+        parts = [] if keep else None
+        escaped = False
+        while True:
+            if self._i >= len(self._buf) and not self._fill():
+                raise ValueError("Unterminated string")
+            buf = self._buf
+            j = self._i
+            n = len(buf)
+            while j < n:
+                c = buf[j]
+                if escaped:
+                    escaped = False
+                elif c == 0x5C:  # backslash
+                    escaped = True
+                elif c == 0x22:  # closing quote
+                    break
+                j += 1
+            if keep:
+                parts.append(bytes(buf[self._i : j]))
+            if j < n:
+                self._i = j + 1
+                break
+            self._i = n
+        if not keep:
+            return None
+        raw = b"".join(parts)
+        if b"\\" in raw:
+            import json
+
+            return json.loads(b'"' + raw + b'"')
+        return str(raw, "utf-8")
+
+    def scalar(self, keep):
+        """Consume a number or true/false/null; return it if keep."""
+        out = [] if keep else None
+        while True:
+            if self._i >= len(self._buf) and not self._fill():
+                break
+            c = self._buf[self._i]
+            if c not in _NUM and not 0x61 <= c <= 0x7A:  # digits, sign, a-z
+                break
+            if keep:
+                out.append(c)
+            self._i += 1
+        if not keep:
+            return None
+        tok = bytes(out)
+        if tok == b"true":
+            return True
+        if tok == b"false":
+            return False
+        if tok == b"null":
+            return None
+        if b"." in tok or b"e" in tok or b"E" in tok:
+            return float(tok)
+        return int(tok)
+
+
+def _value(s, want):
+    """Parse the next value. want: None = skip, True = build, dict = descend
+    into an object, (lo, hi) = build a slice of an array."""
+    c = s.peek()
+    if c == 0x22:
+        s.take()
+        return s.string(want is True)
+    if c == 0x7B:  # {
+        s.take()
+        out = {} if want is not None else None
+        if s.peek() == 0x7D:
+            s.take()
+            return out
+        while True:
+            s.expect(0x22)
+            key = s.string(want is not None)
+            s.expect(0x3A)  # :
+            if want is True:
+                out[key] = _value(s, True)
+            elif isinstance(want, dict) and key in want:
+                out[key] = _value(s, want[key])
+            else:
+                _value(s, None)
+            c = s.take()
+            if c == 0x7D:
+                return out
+            if c != 0x2C:
+                raise ValueError("Malformed JSON object")
+    if c == 0x5B:  # [
+        s.take()
+        out = [] if want is not None else None
+        if s.peek() == 0x5D:
+            s.take()
+            return out
+        i = 0
+        while True:
+            if want is True:
+                out.append(_value(s, True))
+            elif isinstance(want, tuple) and want[0] <= i <= want[1]:
+                out.append(_value(s, True))
+            else:
+                _value(s, None)
+            i += 1
+            c = s.take()
+            if c == 0x5D:
+                return out
+            if c != 0x2C:
+                raise ValueError("Malformed JSON array")
+    if c < 0:
+        raise ValueError("Unexpected end of JSON")
+    return s.scalar(want is not None)
+
+
+def select(source, fields, bufsize=256):
+    """Parse JSON from source, returning only the values on fields.
+
+    source is either a read(n) function (a socket or response) or a
+    bytes-like buffer (bytes, bytearray, memoryview) already in RAM.
+    """
+    return _value(_Stream(source, bufsize), _spec(fields))
+
+
+def items(source, bufsize=256):
+    """Yield (key, value) for each member of a top-level JSON object.
+
+    Only one member's value is built at a time, so a large object can be
+    consumed (and trimmed) piece by piece.
+    """
+    s = _Stream(source, bufsize)
+    s.expect(0x7B)  # {
+    if s.peek() == 0x7D:
+        return
+    while True:
+        s.expect(0x22)
+        key = s.string(True)
+        s.expect(0x3A)  # :
+        yield key, _value(s, True)
+        c = s.take()
+        if c == 0x7D:
+            return
+        if c != 0x2C:
+            raise ValueError("Malformed JSON object")
+
+
+# Selector modes: between tokens, skipping a string, skipping a number or
+# literal, reading an object key, copying out a wanted value
+_IDLE, _STR, _LIT, _KEY, _CAP = 0, 1, 2, 3, 4
+_OPEN = b"{["
+_CLOSE = b"}]"
+
+
+class Selector:
+    """select() for a body that arrives in pieces: feed() each chunk as it
+    comes (say from an asyncio stream, which can't be read from inside a
+    parse), then result(). Nothing is held between chunks but the open
+    containers, the current key and the bytes of the wanted value being
+    copied out, so a large body never sits in RAM.
+    """
+
+    def __init__(self, fields):
+        self._want = _spec(fields)
+        self._root = None
+        # open containers: [is_object, want, out, key, key's want, index, expecting_key]
+        self._stack = []
+        self._mode = _IDLE
+        self._esc = False
+        self._key = None
+        self._cap = None  # bytes of the wanted value so far
+        self._depth = 0
+        self._in_str = False
+        self._drop = False  # a string where an object/array was wanted
+
+    def _child_want(self):
+        if not self._stack:
+            return self._want
+        f = self._stack[-1]
+        if f[0]:
+            return f[4]
+        want = f[1]
+        if isinstance(want, tuple) and want[0] <= f[5] <= want[1]:
+            return True
+        return None
+
+    def _put(self, v):
+        if not self._stack:
+            self._root = v
+            return
+        f = self._stack[-1]
+        if f[0]:
+            f[2][f[3]] = v
+        else:
+            f[2].append(v)
+
+    def _end_capture(self):
+        if self._drop:
+            self._put(None)
+        else:
+            import json
+
+            self._put(json.loads(bytes(self._cap)))
+        self._cap = None
+        self._mode = _IDLE
+
+    def _capture(self, chunk, i, n):
+        """Copy the wanted value out of chunk from i; return where it stopped."""
+        start = i
+        depth = self._depth
+        in_str = self._in_str
+        esc = self._esc
+        done = False
+        while i < n:
+            c = chunk[i]
+            if in_str:
+                if esc:
+                    esc = False
+                elif c == 0x5C:
+                    esc = True
+                elif c == 0x22:
+                    in_str = False
+                    if depth == 0:
+                        i += 1
+                        done = True
+                        break
+            elif c == 0x22:
+                in_str = True
+            elif c in _OPEN:
+                depth += 1
+            elif depth == 0 and c not in _NUM and not 0x61 <= c <= 0x7A:
+                done = True  # end of a number or literal: c is not part of it
+                break
+            elif c in _CLOSE:
+                depth -= 1
+                if depth == 0:
+                    i += 1
+                    done = True
+                    break
+            i += 1
+        self._cap.extend(chunk[start:i])
+        self._depth, self._in_str, self._esc = depth, in_str, esc
+        if done:
+            self._end_capture()
+        return i
+
+    def feed(self, chunk):
+        n = len(chunk)
+        i = 0
+        while i < n:
+            mode = self._mode
+            if mode == _CAP:
+                i = self._capture(chunk, i, n)
+                continue
+            if mode == _STR or mode == _KEY:
+                j = i
+                esc = self._esc
+                while j < n:
+                    c = chunk[j]
+                    if esc:
+                        esc = False
+                    elif c == 0x5C:
+                        esc = True
+                    elif c == 0x22:
+                        break
+                    j += 1
+                self._esc = esc
+                if mode == _KEY and self._key is not None:
+                    self._key.extend(chunk[i:j])
+                if j == n:
+                    return
+                i = j + 1
+                self._mode = _IDLE
+                if mode == _KEY:
+                    self._got_key()
+                continue
+            if mode == _LIT:
+                while i < n:
+                    c = chunk[i]
+                    if c not in _NUM and not 0x61 <= c <= 0x7A:
+                        self._mode = _IDLE
+                        break
+                    i += 1
+                continue
+
+            c = chunk[i]
+            i += 1
+            if c in _WS:
+                continue
+            f = self._stack[-1] if self._stack else None
+            if c in _CLOSE:
+                if f is None:
+                    raise ValueError("Malformed JSON")
+                self._stack.pop()
+            elif c == 0x2C:  # ,
+                if f is None:
+                    raise ValueError("Malformed JSON")
+                if f[0]:
+                    f[6] = True
+                else:
+                    f[5] += 1
+            elif c == 0x3A:  # :
+                if f is None or not f[0]:
+                    raise ValueError("Malformed JSON")
+                f[6] = False
+            elif c == 0x22 and f is not None and f[0] and f[6]:
+                self._mode = _KEY
+                self._esc = False
+                self._key = bytearray() if isinstance(f[1], dict) else None
+            else:
+                want = self._child_want()
+                if want is True or (want is not None and c not in _OPEN):
+                    self._mode = _CAP
+                    self._cap = bytearray()
+                    self._depth = 0
+                    self._in_str = self._esc = False
+                    self._drop = c == 0x22 and want is not True
+                    i -= 1  # copy c too
+                elif c in _OPEN:
+                    obj = c == 0x7B
+                    out = None
+                    if want is not None:
+                        out = {} if obj else []
+                        self._put(out)
+                    self._stack.append([obj, want, out, None, None, 0, obj])
+                elif c == 0x22:
+                    self._mode = _STR
+                    self._esc = False
+                else:
+                    self._mode = _LIT
+
+    def _got_key(self):
+        f = self._stack[-1]
+        key = self._key
+        self._key = None
+        if key is None:
+            f[4] = None
+            return
+        if b"\\" in key:
+            import json
+
+            key = json.loads(b'"' + key + b'"')
+        else:
+            key = str(key, "utf-8")
+        f[3] = key
+        f[4] = f[1].get(key)
+
+    def result(self):
+        """The selected values, once the whole body has been fed."""
+        if self._mode == _CAP and self._depth == 0 and not self._in_str:
+            self._end_capture()  # a number running to the end of the body
+        if self._stack or self._mode not in (_IDLE, _LIT):
+            raise ValueError("Unexpected end of JSON")
+        return self._root
@@ -11,76 +11,174 @@ _HEADERS = {
 
 MODEL = "google/gemini-3-flash-preview"
 
+# Keep-alive connection so back-to-back prompts skip the TLS handshake
+_session = None
+
+# Receive buffer shared by every prompt(). Allocated once at import, while
+# the heap is still tidy; it grows in place to the largest reply and stays,
+# so replies don't leave body-sized holes behind.
+_rxbuf = bytearray(4096)
+
 DEFAULT_SYSTEM = (
     "You are a helpful and funny assistant talking to a 10 year old kid. "
     "Keep answers short - max 2 sentences."
 )
 
 
-def _extract_content(raw):
-    """Extract content string from API response without full JSON parse."""
+# Single-character JSON escapes; \uXXXX is handled separately
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", '"': '"', "\\": "\\", "/": "/"}
+_FIND_STEP = 256  # bytes per find() window over a memoryview
+
+
+def _find(raw, sub, start, end):
+    """raw.find(sub, start, end), for a memoryview too (it has no find()):
+    searched _FIND_STEP bytes at a time, so the body is never copied whole."""
+    if not isinstance(raw, memoryview):
+        return raw.find(sub, start, end)
+    over = len(sub) - 1  # so a match straddling two windows is seen
+    while start < end:
+        i = bytes(raw[start : min(start + _FIND_STEP + over, end)]).find(sub)
+        if i != -1:
+            return start + i
+        start += _FIND_STEP
+    return -1
+
+
+def _char(raw, i):
+    """raw[i:i + 1] as str or bytes (not a memoryview), for comparing."""
+    c = raw[i : i + 1]
+    return bytes(c) if isinstance(c, memoryview) else c
+
+
+def _json_string(raw, i, end, is_bytes):
+    """Decode the JSON string whose opening quote is at raw[i].
+
+    Jumps between backslashes with find() and keeps whole runs as slices,
+    so the cost is per escape, not per character. Bytes are decoded a run
+    at a time; runs never split a UTF-8 sequence since escapes are ASCII.
+    """
+    quote, bslash = (b'"', b"\\") if is_bytes else ('"', "\\")
+
+    def value(start, stop):
+        v = raw[start:stop]
+        if not is_bytes:
+            return v
+        return str(bytes(v) if isinstance(v, memoryview) else v, "utf-8")
+
+    i += 1
+    q = _find(raw, quote, i, end)
+    e = _find(raw, bslash, i, end)
+    if e == -1 or (q != -1 and q < e):
+        # No escapes: one slice
+        if q == -1:
+            raise OSError("Unterminated string in response")
+        return value(i, q)
+
+    parts = []
+    while True:
+        if q != -1 and q < i:
+            q = _find(raw, quote, i, end)  # the last one found was escaped
+        if q == -1:
+            raise OSError("Unterminated string in response")
+        e = _find(raw, bslash, i, q)
+        if e == -1:
+            parts.append(value(i, q))
+            return "".join(parts)
+        if e > i:
+            parts.append(value(i, e))
+        c = value(e + 1, e + 2)
+        if c != "u":
+            parts.append(_ESCAPES.get(c, c))
+            i = e + 2
+            continue
+        cp = int(value(e + 2, e + 6), 16)
+        i = e + 6
+        if 0xD800 <= cp < 0xDC00 and value(i, i + 2) == "\\u":
+            lo = int(value(i + 2, i + 6), 16)
+            if 0xDC00 <= lo < 0xE000:
+                cp = 0x10000 + ((cp - 0xD800) << 10) + (lo - 0xDC00)
+                i += 6
+        if 0xD800 <= cp < 0xE000:
+            cp = 0xFFFD  # lone surrogate
+        parts.append(chr(cp))
+
+
+def _extract_content(raw, end=None):
+    """Extract content string from API response without full JSON parse.
+
+    raw is the reply as str, or as bytes/bytearray/memoryview (e.g. the
+    receive buffer or content_into()'s view of it, of which only raw[:end]
+    is looked at); then only the content value itself is decoded to a str.
+    """
+    if end is None:
+        end = len(raw)
+    is_bytes = not isinstance(raw, str)
+
+    def find(sub, start=0):
+        return _find(raw, sub.encode() if is_bytes else sub, start, end)
+
+    def string_after(key):
+        # Position of the value's first character after "key":
+        i = find(":", key) + 1
+        while i < end and _char(raw, i) in (b" \t\n\r" if is_bytes else " \t\n\r"):
+            i += 1
+        return i
+
     # Check for error first
-    err = raw.find('"error"')
-    choices = raw.find('"choices"')
+    err = find('"error"')
+    choices = find('"choices"')
     if err != -1 and (choices == -1 or err < choices):
-        msg_start = raw.find('"message"', err)
-        if msg_start != -1:
-            msg_start = raw.find(':"', msg_start) + 2
-            msg_end = raw.find('"', msg_start)
-            raise OSError(raw[msg_start:msg_end])
+        msg = find('"message"', err)
+        if msg != -1:
+            i = string_after(msg)
+            if _char(raw, i) in (b'"', '"'):
+                raise OSError(_json_string(raw, i, end, is_bytes))
         raise OSError("API error")
 
     # Find "content": "..." in the first choice's message
     # Look for "content" that follows "message"
-    msg = raw.find('"message"')
+    msg = find('"message"')
     if msg == -1:
         raise OSError("No message in response")
 
-    ct = raw.find('"content"', msg)
+    ct = find('"content"', msg)
     if ct == -1:
         raise OSError("No content in response")
 
-    # Skip past "content":
-    i = raw.find(":", ct + 9) + 1
-    # Skip whitespace
-    while raw[i] in " \t\n\r":
-        i += 1
-
-    if raw[i] == "n":  # null
+    i = string_after(ct)
+    first = _char(raw, i)
+    if first in (b"n", "n"):  # null
         raise OSError("Empty response from model")
 
-    if raw[i] != '"':
+    if first not in (b'"', '"'):
         raise OSError("Unexpected content format")
 
-    # Extract the JSON string value, handling escapes
-    i += 1
-    n = len(raw)
-    parts = []
-    while i < n and raw[i] != '"':
-        if raw[i] == "\\":
-            i += 1
-            if i >= n:
-                break
-            c = raw[i]
-            if c == "n":
-                parts.append("\n")
-            elif c == "t":
-                parts.append("\t")
-            elif c == '"':
-                parts.append('"')
-            elif c == "\\":
-                parts.append("\\")
-            else:
-                parts.append(c)
-        else:
-            parts.append(raw[i])
-        i += 1
-    return "".join(parts)
-
-
-def prompt(user_msg, system=None, model=None, max_tokens=150, web_search=False):
-    """Send a prompt via OpenRouter and return the reply text."""
-    gc.collect()
+    return _json_string(raw, i, end, is_bytes)
+
+
+def _delta(line):
+    """Text carried by one server-sent-events line of a streamed completion.
+
+    Comments (": OPENROUTER PROCESSING"), blank separators, the final
+    "data: [DONE]" and usage-only events all give "".
+    """
+    if not line.startswith(b"data:"):
+        return ""
+    data = line[5:].strip()
+    if data == b"[DONE]":
+        return ""
+    import json
+
+    event = json.loads(data)
+    if "error" in event:
+        raise OSError(event["error"].get("message", "API error"))
+    choices = event.get("choices")
+    if not choices:
+        return ""
+    return choices[0].get("delta", {}).get("content") or ""
+
+
+def _body(user_msg, system, model, max_tokens, web_search):
     body = {
         "model": model or MODEL,
         "messages": [
@@ -98,9 +196,78 @@ def prompt(user_msg, system=None, model=None, max_tokens=150, web_search=False):
                 "max_results": 3,
             }
         ]
+    return body
+
+
+def prompt(user_msg, system=None, model=None, max_tokens=150, web_search=False, on_delta=None):
+    """Send a prompt via OpenRouter and return the reply text.
+
+    With on_delta, the reply is streamed and on_delta(text) is called with
+    each piece as it arrives; only one event line is held at a time.
+    """
+    gc.collect()
+    global _session
+    body = _body(user_msg, system, model, max_tokens, web_search)
+
+    if _session is None:
+        _session = requests.Session()
+
+    if on_delta is not None:
+        body["stream"] = True
+        response = _session.post(_ENDPOINT, headers=_HEADERS, json=body)
+        try:
+            if response.status_code != 200:
+                _extract_content(response.text)  # raises with the API's message
+            parts = []
+            for line in response.iter_lines():
+                text = _delta(line)
+                if text:
+                    parts.append(text)
+                    on_delta(text)
+        finally:
+            response.close()
+        return "".join(parts)
+
+    response = _session.post(_ENDPOINT, headers=_HEADERS, json=body)
+    n = len(response.content_into(_rxbuf))
+    response.close()
+    del response
+    gc.collect()
+
+    return _extract_content(_rxbuf, n)
+
+
+async def prompt_async(user_msg, system=None, model=None, max_tokens=150, web_search=False, on_delta=None):
+    """Like prompt(), but awaits the network so the UI keeps running."""
+    import arequests
+
+    gc.collect()
+    body = _body(user_msg, system, model, max_tokens, web_search)
+
+    if on_delta is not None:
+        body["stream"] = True
+        response = await arequests.post(_ENDPOINT, headers=_HEADERS, json=body, stream=True)
+        try:
+            parts = []
+            while True:
+                line = await response.readline()
+                if not line:
+                    break
+                if response.status_code != 200:
+                    parts.append(str(line, "utf-8"))  # JSON error body, not events
+                    continue
+                text = _delta(line)
+                if text:
+                    parts.append(text)
+                    on_delta(text)
+        finally:
+            response.close()
+        if response.status_code != 200:
+            _extract_content("".join(parts))  # raises with the API's message
+        return "".join(parts)
 
-    response = requests.post(_ENDPOINT, headers=_HEADERS, json=body)
-    raw = response.text
+    response = await arequests.post(_ENDPOINT, headers=_HEADERS, json=body)
+    raw = response.content
     response.close()
     del response
     gc.collect()
@@ -10,26 +10,51 @@ from picographics import DISPLAY_PICO_DISPLAY_2, PicoGraphics
 from pimoroni import RGBLED, Button
 
 import env
+import perf
+from pacing import Pacer
+from screen import Screen
 
-# Hardware setup
-display = PicoGraphics(display=DISPLAY_PICO_DISPLAY_2, rotate=0)
+# Hardware setup — apps get the dirty-region wrapper, not the raw display
+display = Screen(PicoGraphics(display=DISPLAY_PICO_DISPLAY_2, rotate=0))
 WIDTH, HEIGHT = display.get_bounds()
 
-# Button A (GPIO 12) is the global app-cycle button via IRQ
+# Button A (GPIO 12) is the global app-cycle button via IRQ. A press
+# switches apps on release; held for _LONG_PRESS_MS it toggles the perf
+# overlay (see perf.py) instead. Apps own B, X and Y, but never see A.
 button_a_pin = machine.Pin(12, machine.Pin.IN, machine.Pin.PULL_UP)
+_A_EDGES = machine.Pin.IRQ_FALLING | machine.Pin.IRQ_RISING
+_LONG_PRESS_MS = 1000
+_BOUNCE_MS = 20  # a release sooner than this is contact bounce
 _switch_requested = False
+_perf_toggle = False
 _last_irq_time = 0
+_a_down_at = None  # ticks_ms when the press being held began
+_wake_loop = None  # runtime.wake under the asyncio runtime
 
 
 def _button_a_handler(pin):
-    global _switch_requested, _last_irq_time
+    global _switch_requested, _perf_toggle, _last_irq_time, _a_down_at
     now = time.ticks_ms()
-    if time.ticks_diff(now, _last_irq_time) > 300:  # debounce
+    if not pin.value():
+        if time.ticks_diff(now, _last_irq_time) > 300:  # debounce
+            _a_down_at = now
+            _last_irq_time = now
+        return
+    if _a_down_at is None:
+        return
+    held = time.ticks_diff(now, _a_down_at)
+    if held < _BOUNCE_MS:
+        return
+    _a_down_at = None
+    if held >= _LONG_PRESS_MS:
+        _perf_toggle = True
+    else:
         _switch_requested = True
-        _last_irq_time = now
+    if _wake_loop is not None:
+        _wake_loop()
 
 
-button_a_pin.irq(trigger=machine.Pin.IRQ_FALLING, handler=_button_a_handler)
+button_a_pin.irq(trigger=_A_EDGES, handler=_button_a_handler)
 
 # Remaining buttons available to apps
 buttons = {
@@ -38,6 +63,38 @@ buttons = {
     "Y": Button(15),
 }
 
+# Second Pin on the same GPIOs so a press can wake the idle loop early.
+# Both edges, so apps doing their own edge detection also see the release.
+# The IRQs stay on for every app; only WAKE_ON buttons wake the loop.
+_wake_pins = {
+    "B": machine.Pin(13, machine.Pin.IN, machine.Pin.PULL_UP),
+    "X": machine.Pin(14, machine.Pin.IN, machine.Pin.PULL_UP),
+    "Y": machine.Pin(15, machine.Pin.IN, machine.Pin.PULL_UP),
+}
+_input_event = False
+_wake_names = ()  # buttons the current app wants to be woken by
+
+
+def _input_handler(name):
+    def handler(pin):
+        global _input_event
+        if name in _wake_names:
+            _input_event = True
+        if _wake_loop is not None and _pending():
+            _wake_loop()
+
+    return handler
+
+
+for _name, _pin in _wake_pins.items():
+    _pin.irq(trigger=machine.Pin.IRQ_FALLING | machine.Pin.IRQ_RISING, handler=_input_handler(_name))
+
+
+def _set_wake_buttons(names):
+    global _wake_names
+    _wake_names = names
+
+
 led = RGBLED(6, 7, 8)
 pico_led = machine.Pin("LED", machine.Pin.OUT, value=0)
 
@@ -124,22 +181,57 @@ gc.collect()
 print(f"Ready to load apps (free: {gc.mem_free()})")
 
 # App switcher — lazy imports to save memory
-app_names = ["Clock", "Weather", "Timer", "Breakout", "Reaction", "Story"]
-app_modules = ["app_clock", "app_weather", "app_timer", "app_pong", "app_react", "app_story"]
+#
+# Scheduling contract: update() may return the number of ms (counted from
+# when it was called) until it next needs to run. Returning None keeps the
+# old fixed poll. An app can also set WAKE_ON = ("X", ...) to be woken
+# early when one of those buttons changes state. A game can set
+# FRAME_MS = n to have its frames paced on a fixed grid instead of from
+# each call (see pacing.py). Under the asyncio runtime an app may also
+# define async run(...) for network work (see runtime.py).
+app_names = ["Clock", "Quotes", "Weather", "Timer", "Breakout", "Reaction", "Story"]
+app_modules = ["app_clock", "app_quotes", "app_weather", "app_timer", "app_pong", "app_react", "app_story"]
 current_app_idx = 0
 current_app = None
+_pacer = None  # Pacer for an app with FRAME_MS
+_frames_at_load = 0
+_pixels_at_load = 0
+_DEFAULT_DELAY_MS = 50
+USE_ASYNC = True  # asyncio runtime: apps with run() fetch without freezing the UI
+_updates = 0
+_loop_wakes = 0  # times the blocking loop came out of machine.idle()
+_wakes_at_load = 0
+_loaded_at = 0
+update_rates = {}  # app name -> update() calls per second while it ran
+wakeup_rates = {}  # app name -> times per second the loop woke from sleep
 
 
 def switch_app(idx):
-    global current_app, current_app_idx, _switch_requested
+    global current_app, current_app_idx, _switch_requested, _pacer
+    global _frames_at_load, _pixels_at_load, _updates, _wakes_at_load, _loaded_at
     # Disable IRQ during switch to prevent re-entry
     button_a_pin.irq(handler=None)
     _switch_requested = False
 
     # Unload previous app module + its deps to free memory
     if current_app is not None:
+        name = app_names[current_app_idx]
+        frames = display.frames - _frames_at_load
+        pixels = display.total_pixels - _pixels_at_load
+        if frames:
+            print(f"{name}: {frames} frames, {pixels // frames} px/frame pushed")
+        secs = time.ticks_diff(time.ticks_ms(), _loaded_at) / 1000
+        if secs > 0:
+            update_rates[name] = _updates / secs
+            wakeup_rates[name] = (_wake_count() - _wakes_at_load) / secs
+            print(f"{name}: {update_rates[name]:.1f} updates/s, {wakeup_rates[name]:.1f} wakeups/s")
+        if perf.enabled:
+            perf.dump(name)
+        if "netcache" in sys.modules:
+            print(f"net: {sys.modules['netcache'].stats()}")
         mod_name = app_modules[current_app_idx]
-        for m in (mod_name, "llm", "requests"):
+        # netcache stays loaded: its DNS and TLS cache outlive the app
+        for m in (mod_name, "llm", "requests", "arequests", "jsonstream"):
             if m in sys.modules:
                 del sys.modules[m]
         current_app = None
@@ -149,23 +241,133 @@ def switch_app(idx):
     print(f"Switching to {app_names[idx]} (free: {gc.mem_free()})")
     current_app = __import__(app_modules[idx])
     gc.collect()
+    _frames_at_load = display.frames
+    _pixels_at_load = display.total_pixels
+    _updates = 0
+    _wakes_at_load = _wake_count()
+    _loaded_at = time.ticks_ms()
+    _set_wake_buttons(getattr(current_app, "WAKE_ON", ()))
+    frame_ms = getattr(current_app, "FRAME_MS", None)
+    _pacer = Pacer(frame_ms) if frame_ms else None
     current_app.init(display, buttons, led, colors, WIDTH, HEIGHT)
     print(f"Loaded {app_names[idx]} (free: {gc.mem_free()})")
 
     # Re-enable IRQ
-    button_a_pin.irq(trigger=machine.Pin.IRQ_FALLING, handler=_button_a_handler)
+    button_a_pin.irq(trigger=_A_EDGES, handler=_button_a_handler)
 
 
-switch_app(0)
+# The blocking loop sleeps in machine.idle(), which stops the core until an
+# interrupt: the one-shot timer below at the deadline, or a button IRQ.
+_deadline_timer = machine.Timer()
+_due = False
 
-while True:
+
+def _on_deadline(timer):
+    global _due
+    _due = True
+
+
+def _sleep_until(deadline):
+    """Sleep until deadline (ticks_ms) or until an IRQ sets a flag."""
+    global _due, _loop_wakes
+    left = time.ticks_diff(deadline, time.ticks_ms())
+    if left <= 0 or _pending():
+        return
+    _due = False
+    _deadline_timer.init(mode=machine.Timer.ONE_SHOT, period=left, callback=_on_deadline)
+    while not _due and not _pending():
+        machine.idle()  # other interrupts (USB, Wi-Fi) end it too
+        _loop_wakes += 1
+    _deadline_timer.deinit()
+
+
+def _wake_count():
+    """Times the loop has woken from sleep, on whichever loop is running."""
+    if _wake_loop is not None:
+        return runtime.wakes
+    return _loop_wakes
+
+
+def _pending():
+    return _switch_requested or _input_event or _perf_toggle
+
+
+def _current():
+    return current_app
+
+
+def _paint_overlay(screen):
+    perf.paint_overlay(screen, colors)
+
+
+def _toggle_perf():
+    perf.enabled = perf.overlay = not perf.overlay
+    print(f"perf overlay {'on' if perf.overlay else 'off'}")
+    if perf.overlay:
+        perf.reset()
+        perf.refresh(app_names[current_app_idx])
+        display.overlay = _paint_overlay
+    else:
+        display.overlay = None
+        perf.dump()
+        perf.clear_overlay(display, colors)
+
+
+_overlay_at = 0
+
+
+def _timed_update():
+    """current_app.update() with its time, push time and heap use recorded."""
+    global _overlay_at
+    name = app_names[current_app_idx]
+    free = gc.mem_free()
+    display.push_us = 0
+    display.timing = True
+    start = time.ticks_us()
+    try:
+        delay = current_app.update(display, buttons, led, colors, WIDTH, HEIGHT)
+    finally:
+        display.timing = False
+    took = time.ticks_diff(time.ticks_us(), start)
+    used = free - gc.mem_free()
+    # A collection during update() frees more than it used: count as 0
+    perf.record(name, took, display.push_us, used if used > 0 else 0)
+    # The overlay goes out with every frame the app pushes; its numbers
+    # only change every OVERLAY_MS, and then push on their own
+    if perf.overlay and time.ticks_diff(time.ticks_ms(), _overlay_at) >= perf.OVERLAY_MS:
+        _overlay_at = time.ticks_ms()
+        perf.refresh(name)
+        perf.push_overlay(display)
+    return delay
+
+
+def _tick():
+    """One pass of the app loop: handle a switch or run update().
+
+    Returns the delay in ms before the next pass (None = default poll). A
+    switch returns 0 so the new app's first update() gets its own pass.
+    """
+    global _switch_requested, _input_event, _updates, _perf_toggle
+    start = time.ticks_ms()
     try:
         if _switch_requested:
             _switch_requested = False
             led.set_rgb(0, 0, 0)
             switch_app((current_app_idx + 1) % len(app_names))
-
-        current_app.update(display, buttons, led, colors, WIDTH, HEIGHT)
+            return 0
+
+        _input_event = False
+        _updates += 1
+        if _perf_toggle:
+            _perf_toggle = False
+            _toggle_perf()
+        if perf.enabled:
+            delay = _timed_update()
+        else:
+            delay = current_app.update(display, buttons, led, colors, WIDTH, HEIGHT)
+        if _pacer is not None:
+            delay = _pacer.delay(start, delay)
+        return delay
     except Exception as e:
         print(f"Error in {app_names[current_app_idx]}: {e}")
         display.set_pen(colors["BLACK"])
@@ -178,4 +380,25 @@ while True:
         time.sleep(3)
         # Try switching to next app
         switch_app((current_app_idx + 1) % len(app_names))
-    time.sleep(0.05)
+        return 0
+
+
+switch_app(0)
+
+if USE_ASYNC:
+    try:
+        import runtime
+    except ImportError:
+        print("No asyncio on this firmware, using the blocking loop")
+        USE_ASYNC = False
+
+if USE_ASYNC:
+    _wake_loop = runtime.wake
+    runtime.run(_tick, _pending, _current, (display, buttons, led, colors, WIDTH, HEIGHT))
+
+while True:
+    woke = time.ticks_ms()
+    delay = _tick()
+    if delay is None:
+        delay = _DEFAULT_DELAY_MS
+    _sleep_until(time.ticks_add(woke, delay))
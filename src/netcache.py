@@ -0,0 +1,134 @@
+"""DNS and TLS state shared by requests.py and phttp.py.
+
+resolve() caches getaddrinfo() per host:port for TTL seconds. Failures are
+cached too, for NEG_TTL seconds, so a host that won't resolve doesn't stall
+every call on another lookup timeout. wrap() does the TLS handshake with
+one process-wide SSLContext instead of building a new one per request,
+and offers the host's previous session for resumption where the ssl module
+supports it (CPython; MicroPython's ssl has no session API, so there every
+handshake is a full one).
+"""
+
+import socket
+import time
+
+TTL = 300
+NEG_TTL = 30
+_MAX_HOSTS = 8
+
+_dns = {}  # (host, port) -> (expires, addrinfo or the OSError it raised)
+_sessions = {}  # host -> ssl.SSLSession from the last handshake
+_ctx = None
+
+dns_hits = 0
+dns_misses = 0
+handshakes = 0
+resumed = 0
+handshake_ms = 0  # duration of the last handshake
+handshake_ms_total = 0
+
+
+def stats():
+    return {
+        "dns_hits": dns_hits,
+        "dns_misses": dns_misses,
+        "handshakes": handshakes,
+        "resumed": resumed,
+        "handshake_ms": handshake_ms,
+        "handshake_ms_total": handshake_ms_total,
+    }
+
+
+def _ms():
+    try:
+        return time.ticks_ms()
+    except AttributeError:  # CPython
+        return int(time.monotonic() * 1000)
+
+
+def _since(start):
+    """ms from start (a _ms() value) to now, across a ticks_ms wrap."""
+    try:
+        return time.ticks_diff(time.ticks_ms(), start)
+    except AttributeError:  # CPython
+        return _ms() - start
+
+
+def resolve(host, port):
+    """getaddrinfo(host, port) for a TCP socket, first entry, cached."""
+    global dns_hits, dns_misses
+    now = time.time()
+    key = (host, port)
+    hit = _dns.get(key)
+    if hit is not None and hit[0] > now:
+        dns_hits += 1
+        if isinstance(hit[1], OSError):
+            raise hit[1]
+        return hit[1]
+
+    dns_misses += 1
+    if len(_dns) >= _MAX_HOSTS:
+        for k in list(_dns):
+            if _dns[k][0] <= now:
+                del _dns[k]
+        if len(_dns) >= _MAX_HOSTS:
+            _dns.pop(next(iter(_dns)))
+    try:
+        ai = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)[0]
+    except OSError as e:
+        _dns[key] = (now + NEG_TTL, e)
+        raise
+    _dns[key] = (now + TTL, ai)
+    return ai
+
+
+def forget(host, port):
+    """Drop host:port after a failed connect, in case its address moved."""
+    _dns.pop((host, port), None)
+
+
+def context():
+    """The shared client SSLContext (no certificate checks, as before)."""
+    global _ctx
+    if _ctx is None:
+        try:
+            import tls
+        except ImportError:
+            import ssl as tls
+
+        ctx = tls.SSLContext(tls.PROTOCOL_TLS_CLIENT)
+        if hasattr(ctx, "check_hostname"):
+            ctx.check_hostname = False
+        ctx.verify_mode = tls.CERT_NONE
+        _ctx = ctx
+    return _ctx
+
+
+def wrap(sock, host):
+    """Handshake on a connected socket, resuming host's last session if we can."""
+    global handshakes, resumed, handshake_ms, handshake_ms_total
+    ctx = context()
+    start = _ms()
+    session = _sessions.get(host)
+    if session is not None:
+        sock = ctx.wrap_socket(sock, server_hostname=host, session=session)
+    else:
+        sock = ctx.wrap_socket(sock, server_hostname=host)
+    handshake_ms = _since(start)
+    handshake_ms_total += handshake_ms
+    handshakes += 1
+
+    if getattr(sock, "session_reused", False):
+        resumed += 1
+    session = getattr(sock, "session", None)
+    if session is not None:
+        _sessions[host] = session
+    return sock
+
+
+def clear():
+    """Forget all cached addresses, sessions and the context."""
+    global _ctx
+    _dns.clear()
+    _sessions.clear()
+    _ctx = None
@@ -0,0 +1,37 @@
+"""Fixed frame grid for apps that set FRAME_MS.
+
+main.py counts the delay update() returns from when update() was called,
+so a frame that starts late (a slow push, sleep overshoot, an IRQ) pushes
+every later frame back with it. An app that sets FRAME_MS = n opts out of
+that: while update() returns n (or None), its calls are put on a grid n ms
+apart. A late frame runs at once and the next one is still due on the
+grid; only when a whole frame has been missed does the grid restart from
+now, rather than running a burst of frames to catch up. Any other delay
+(a title screen waiting for a button) is taken as usual, and the grid
+restarts from there, or from whenever a button wakes the app first.
+"""
+
+import time
+
+
+class Pacer:
+    def __init__(self, frame_ms):
+        self.frame_ms = frame_ms
+        self.next = None  # ticks_ms the next frame is due
+
+    def delay(self, start, delay):
+        """The delay to use, counted from start (ticks_ms when update() was
+        called), given the delay update() returned. May be <= 0: run again
+        at once."""
+        if delay is not None and delay != self.frame_ms:
+            self.next = time.ticks_add(start, delay)
+            return delay
+        base = self.next
+        if base is None or time.ticks_diff(start, base) < 0:
+            base = start  # first frame, or woken before the slot
+        due = time.ticks_add(base, self.frame_ms)
+        now = time.ticks_ms()
+        if time.ticks_diff(now, due) >= self.frame_ms:
+            due = now  # a frame behind: drop it rather than catch up
+        self.next = due
+        return time.ticks_diff(due, start)
@@ -0,0 +1,145 @@
+"""Per-app frame timing and heap churn, for finding slow or allocating apps.
+
+While enabled, main.py times every update() call and records, per app:
+
+    update  us spent in update(), display pushes included
+    push    us of that spent in display.update()
+    heap    bytes of heap update() used (gc.mem_free before - after)
+
+each in a fixed-size ring of the last SIZE samples, summarised as
+p50 / p95 / max. Hold A for a second to toggle it and the on-screen
+overlay; dump() prints the same numbers over serial (from the REPL:
+import perf; perf.enabled = True ... perf.dump()).
+
+The overlay is painted into every frame the app pushes (main.py sets it
+as the Screen's overlay hook), so an app that clears the whole screen
+each frame doesn't wipe it. Only its numbers wait for OVERLAY_MS.
+
+When disabled main.py takes the untimed path and nothing here runs.
+"""
+
+from array import array
+
+SIZE = 64  # samples kept per measure per app
+OVERLAY_MS = 500  # how often the overlay's numbers are recomputed
+
+enabled = False  # record samples
+overlay = False  # and draw them
+_apps = {}  # app name -> (update, push, heap) Rings
+
+
+class Ring:
+    def __init__(self, size=SIZE):
+        self._buf = array("l", [0] * size)
+        self._i = 0
+        self.count = 0  # samples ever added
+
+    def add(self, v):
+        self._buf[self._i] = v
+        self._i += 1
+        if self._i == len(self._buf):
+            self._i = 0
+        self.count += 1
+
+    def clear(self):
+        self._i = 0
+        self.count = 0
+
+    def stats(self):
+        """(p50, p95, max) of the samples held, or None when empty."""
+        n = min(self.count, len(self._buf))
+        if not n:
+            return None
+        s = sorted(self._buf[:n])
+        return s[(n - 1) * 50 // 100], s[(n - 1) * 95 // 100], s[-1]
+
+
+def rings(name):
+    r = _apps.get(name)
+    if r is None:
+        r = _apps[name] = (Ring(), Ring(), Ring())
+    return r
+
+
+def record(name, update_us, push_us, heap):
+    r = rings(name)
+    r[0].add(update_us)
+    r[1].add(push_us)
+    r[2].add(heap)
+
+
+def summary(name):
+    """{"update": (p50, p95, max), "push": ..., "heap": ..., "n": count}"""
+    r = _apps.get(name)
+    if r is None:
+        return None
+    return {"update": r[0].stats(), "push": r[1].stats(), "heap": r[2].stats(), "n": r[0].count}
+
+
+def reset():
+    for r in _apps.values():
+        for ring in r:
+            ring.clear()
+
+
+def _fmt(s):
+    return "%d/%d/%d" % s if s else "-"
+
+
+def dump(name=None):
+    """Print p50/p95/max for one app, or every app measured."""
+    for n in [name] if name else list(_apps):
+        s = summary(n)
+        if s and s["n"]:
+            print(
+                f"perf {n}: n={s['n']} update_us {_fmt(s['update'])}"
+                f" push_us {_fmt(s['push'])} heap_b {_fmt(s['heap'])}"
+            )
+
+
+_OX = 150
+_OY = 2
+_OW = 168
+_OH = 42
+
+
+_lines = ()  # the overlay's text, recomputed by refresh()
+
+
+def refresh(name):
+    """Recompute the overlay's numbers for app name from its rings."""
+    global _lines
+    s = summary(name)
+    _lines = ("p50/p95/max " + name,)
+    if s:
+        _lines += (
+            "upd  " + _fmt(s["update"]) + " us",
+            "push " + _fmt(s["push"]) + " us",
+            "heap " + _fmt(s["heap"]) + " B",
+        )
+
+
+def paint_overlay(display, colors):
+    """Stats box in the top-right corner, drawn over the app with the
+    numbers of the last refresh(); pushed with the app's next frame."""
+    display.set_pen(colors["BLACK"])
+    display.rectangle(_OX, _OY, _OW, _OH)
+    y = _OY + 2
+    for i, line in enumerate(_lines):
+        display.set_pen(colors["YELLOW" if i == 0 else "WHITE"])
+        display.text(line, _OX + 3, y, -1, 1)
+        y += 10
+
+
+def push_overlay(display):
+    """Push the box on its own, when the app isn't pushing frames: the
+    Screen's overlay hook paints it."""
+    display.invalidate(_OX, _OY, _OW, _OH)
+    display.update()
+
+
+def clear_overlay(display, colors):
+    """Blank the overlay box; the app repaints the area when it next draws."""
+    display.set_pen(colors["BLACK"])
+    display.rectangle(_OX, _OY, _OW, _OH)
+    display.update()
@@ -7,7 +7,8 @@ Inspired by micropython-lib/requests and SpotlightKid/mrequests.
 
 import json
 import socket
-import ssl
+
+import netcache
 
 
 def post_json(url, headers=None, body=None):
@@ -28,15 +29,16 @@ def post_json(url, headers=None, body=None):
     data = json.dumps(body) if body else ""
 
     # Connect
-    ai = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)[0]
+    ai = netcache.resolve(host, port)
     sock = socket.socket(ai[0], socket.SOCK_STREAM, ai[2])
     try:
-        sock.connect(ai[-1])
+        try:
+            sock.connect(ai[-1])
+        except OSError:
+            netcache.forget(host, port)
+            raise
         if proto == "https:":
-            ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
-            sock = ctx.wrap_socket(sock, server_hostname=host)
+            sock = netcache.wrap(sock, host)
 
         # On MicroPython, ssl socket has read/write/readline directly.
         # On CPython, we need makefile() for readline support.
@@ -1,8 +1,41 @@
 import os
+import time
 
 
 def filesystem_info():
     statvfs = os.statvfs("/")
     total_kb = (statvfs[0] * statvfs[2]) / 1024
     free_kb = (statvfs[0] * statvfs[3]) / 1024
-    print(f"Total: {total_kb:.0f} KB, Free: {free_kb:.0f} KB")
\ No newline at end of file
+    print(f"Total: {total_kb:.0f} KB, Free: {free_kb:.0f} KB")
+
+
+def _first_sunday(year, month):
+    """Day of first Sunday in given month."""
+    t = time.localtime(time.mktime((year, month, 1, 0, 0, 0, 0, 0)))
+    wday = t[6]
+    return 1 + (6 - wday) % 7
+
+
+def _utc_offset():
+    """Sydney: UTC+11 (AEDT) Oct first Sun 2am -> Apr first Sun 3am, else UTC+10."""
+    utc = time.localtime()
+    year, month, day, hour = utc[0], utc[1], utc[2], utc[3]
+
+    if month > 4 and month < 10:
+        return 10
+    if month == 4:
+        boundary = _first_sunday(year, 4)
+        if day < boundary or (day == boundary and hour < 16):
+            return 11
+        return 10
+    if month == 10:
+        boundary = _first_sunday(year, 10)
+        if day > boundary or (day == boundary and hour >= 16):
+            return 11
+        return 10
+    return 11
+
+
+def local_time():
+    """time.localtime() for Sydney."""
+    return time.localtime(time.time() + _utc_offset() * 3600)
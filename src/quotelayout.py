@@ -0,0 +1,122 @@
+"""Line breaking for quotes in PicoGraphics' bitmap8 font.
+
+Used at build time by data/build_pack.py, whose output carries each quote's
+lines and scale so the device only draws them, and on the device when it
+falls back to the gz-JSON quote files.
+
+bitmap8 is ASCII-only, so text is first normalised: typographic quotes and
+dashes become ASCII, anything else non-ASCII becomes "?". Widths are the
+per-character advance (glyph width + 1 px letter spacing) at scale 1, the
+same sum display.measure_text() makes. advances(display) re-reads them
+from a device if the firmware font ever changes.
+"""
+
+# Advance in px at scale 1 for chr(32) .. chr(126)
+ADVANCE = bytes((
+    3, 2, 4, 6, 6, 6, 6, 2, 3, 3, 6, 6, 3, 5, 2, 6,  #  !"#$%&'()*+,-./
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 2, 3, 5, 5, 5, 6,  # 0123456789:;<=>?
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 4, 6, 6, 6, 6, 6, 6,  # @ABCDEFGHIJKLMNO
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 3, 6, 3, 6, 6,  # PQRSTUVWXYZ[\]^_
+    3, 6, 6, 6, 6, 6, 5, 6, 6, 2, 4, 5, 3, 6, 6, 6,  # `abcdefghijklmno
+    6, 6, 5, 6, 5, 6, 6, 6, 6, 6, 6, 4, 2, 4, 6,  # pqrstuvwxyz{|}~
+))
+HEIGHT = 8  # glyph height at scale 1
+LINE = 10  # line pitch at scale 1 (glyph + 2 px leading)
+
+# Quote box on the 320x240 screen, below the HH:MM header and above the
+# title/author line
+BOX_X = 10
+BOX_Y = 40
+BOX_W = 300
+BOX_H = 160
+SCALES = (4, 3, 2, 1)
+
+_ASCII = {
+    "‘": "'", "’": "'", "‚": "'", "′": "'",
+    "“": '"', "”": '"', "„": '"', "″": '"',
+    "–": "-", "—": "-", "―": "-", "−": "-",
+    "…": "...", " ": " ", "\t": " ", "\n": " ", "\r": " ",
+}
+
+
+def normalize(text):
+    """text as printable ASCII bitmap8 can draw."""
+    if all(" " <= c <= "~" for c in text):
+        return text
+    out = []
+    for c in text:
+        if " " <= c <= "~":
+            out.append(c)
+        elif c in _ASCII:
+            out.append(_ASCII[c])
+        else:
+            try:
+                import unicodedata  # CPython: é -> e
+
+                c = unicodedata.normalize("NFKD", c).encode("ascii", "ignore").decode()
+            except ImportError:
+                c = ""
+            out.append(c if c and all(" " <= x <= "~" for x in c) else "?")
+    return "".join(out)
+
+
+def width(text, scale=1):
+    """Width in px of ASCII text, as display.measure_text(text, scale)."""
+    w = 0
+    for c in text:
+        w += ADVANCE[ord(c) - 32]
+    return w * scale
+
+
+def wrap(text, scale, max_w=BOX_W):
+    """Greedy word wrap: list of (start, end) into text, spaces trimmed.
+    A word wider than a line gets a line to itself (and overhangs)."""
+    lines = []
+    n = len(text)
+    i = 0
+    while i < n:
+        while i < n and text[i] == " ":
+            i += 1
+        if i >= n:
+            break
+        start = end = i
+        w = 0
+        while i < n:
+            j = i
+            while j < n and text[j] != " ":
+                j += 1
+            gap = width(text[end:i]) if end > start else 0  # spaces before the word
+            ww = width(text[i:j])
+            if end > start and (w + gap + ww) * scale > max_w:
+                break
+            w += gap + ww
+            end = j
+            i = j
+            while i < n and text[i] == " ":
+                i += 1
+        lines.append((start, end))
+        i = end
+    return lines
+
+
+def layout(prefix, annot, suffix):
+    """(text, annot_start, annot_end, scale, lines) for one quote.
+
+    scale is the largest in SCALES whose wrapped lines fit the quote box;
+    at scale 1 lines past the box bottom are dropped.
+    """
+    prefix, annot, suffix = normalize(prefix), normalize(annot), normalize(suffix)
+    text = prefix + annot + suffix
+    a0 = len(prefix)
+    a1 = a0 + len(annot)
+    for scale in SCALES:
+        lines = wrap(text, scale)
+        if len(lines) * LINE * scale - (LINE - HEIGHT) * scale <= BOX_H:
+            return text, a0, a1, scale, lines
+    fit = (BOX_H + (LINE - HEIGHT)) // LINE
+    return text, a0, a1, 1, lines[:fit]
+
+
+def advances(display):
+    """Re-measure ADVANCE from the real font on a device."""
+    return bytes(display.measure_text(chr(c), 1) for c in range(32, 127))
@@ -0,0 +1,77 @@
+"""Random-access reader for quotes.pack (built by data/build_pack.py).
+
+    pack = QuotePack()
+    for nsfw, title, author, text, a0, a1, scale, lines in pack.get(7 * 60 + 1):
+        ...
+
+text[a0:a1] is the time phrase; lines are (start, end) slices of text
+already wrapped for bitmap8 at scale (see quotelayout.py).
+
+The 1440-entry offset table (5.8 KB) is read once when the pack is opened;
+after that a lookup is one seek, one read of a few hundred bytes and one
+small inflate.
+"""
+
+import struct
+
+_MAGIC = b"QPK2"
+_MINUTES = 1440
+_WBITS = 10  # 1 KB window, so inflating needs ~1 KB beyond the output
+
+
+def _inflate(data):
+    try:
+        import deflate
+    except ImportError:
+        import zlib  # CPython, or MicroPython before 1.21
+
+        return zlib.decompress(data, -_WBITS, 4 * len(data))
+    import io
+
+    return deflate.DeflateIO(io.BytesIO(data), deflate.RAW, _WBITS).read()
+
+
+class QuotePack:
+    def __init__(self, path="quotes.pack"):
+        self._f = open(path, "rb")
+        if self._f.read(4) != _MAGIC:
+            self._f.close()
+            raise ValueError("Not a quote pack: " + path)
+        self._index = bytearray(4 * (_MINUTES + 1))
+        self._f.readinto(self._index)
+        self.bytes_read = 0  # block bytes read by get(), for benchmarks
+
+    def close(self):
+        self._f.close()
+
+    def get(self, minute):
+        """Quotes for minute (h * 60 + m) as a list of
+        (nsfw, title, author, text, a0, a1, scale, lines) tuples."""
+        start, end = struct.unpack_from("<II", self._index, 4 * minute)
+        if start == end:
+            return []
+        self._f.seek(start)
+        block = self._f.read(end - start)
+        self.bytes_read += len(block)
+        raw = _inflate(block)
+        del block
+
+        out = []
+        i = 1
+        for _ in range(raw[0]):
+            nsfw = raw[i] & 1 == 1
+            scale, a0, a1, n = struct.unpack_from("<BHHB", raw, i + 1)
+            i += 7
+            lines = []
+            for _ in range(n):
+                lines.append(struct.unpack_from("<HH", raw, i))
+                i += 4
+            strings = []
+            for _ in range(3):
+                n = raw[i] | raw[i + 1] << 8
+                i += 2
+                strings.append(str(raw[i : i + n], "utf-8"))
+                i += n
+            title, author, text = strings
+            out.append((nsfw, title, author, text, a0, a1, scale, lines))
+        return out
@@ -1,65 +1,243 @@
 import socket
+import time
+
+import netcache
+
+
+_READ_SIZE = 1024  # largest single read while draining a body of unknown size
 
 
 class Response:
-    def __init__(self, f):
+    def __init__(self, f, sock=None):
         self.raw = f
         self.encoding = "utf-8"
         self._cached = None
+        self._sock = sock  # underlying socket when raw is a makefile() wrapper
+        self._length = -1  # bytes of body left, -1 = unknown
+        self._chunked = False
+        self._chunk_left = 0  # bytes left in the current chunk
+        self._keep_alive = False
+        self._redirect = None
+        self._release = None  # set by Session: hands the connection back
 
     def close(self):
         if self.raw:
-            self.raw.close()
-            self.raw = None
+            self._close_raw()
         self._cached = None
 
+    def _close_raw(self):
+        self.raw.close()
+        if self._sock is not None and self._sock is not self.raw:
+            self._sock.close()
+        self.raw = None
+        self._sock = None
+
+    def _done(self):
+        # Body fully read: keep-alive connections go back to the pool
+        if self._release is not None:
+            self._release()
+            self._release = None
+            self.raw = None
+            self._sock = None
+        else:
+            self._close_raw()
+
+    def _next_chunk(self):
+        line = self.raw.readline()
+        if not line:
+            raise ValueError("Truncated chunked body")
+        self._chunk_left = int(line.split(b";", 1)[0], 16)
+        if self._chunk_left == 0:
+            # Skip trailers up to the blank line that ends the body
+            while True:
+                line = self.raw.readline()
+                if not line or line == b"\r\n":
+                    break
+            return False
+        return True
+
+    def read(self, n=_READ_SIZE):
+        """Read at most n bytes of body. Returns b"" once it is exhausted.
+
+        Handles Content-Length, chunked and read-until-close bodies, so the
+        caller's memory use is bounded by n whatever the framing.
+        """
+        return self._pull(False, n)
+
+    def readline(self, limit=_READ_SIZE):
+        """Read one body line, ending included; b"" once it is exhausted.
+
+        Returns as soon as the line is in, so it suits bodies that arrive a
+        piece at a time (server-sent events). Lines longer than limit come
+        back in limit-sized pieces.
+        """
+        line = self._pull(True, limit)
+        while line and line[-1:] != b"\n" and len(line) < limit:
+            more = self._pull(True, limit - len(line))
+            if not more:
+                break
+            line += more  # a line split across chunks
+        return line
+
+    def readinto(self, buf):
+        """Read body bytes into the writable buffer buf without allocating.
+
+        Returns the number of bytes read, 0 once the body is exhausted.
+        """
+        if self.raw is None:
+            return 0
+        try:
+            n = self._room(len(buf))
+            if not n:
+                return 0
+            k = self.raw.readinto(memoryview(buf)[:n]) or 0
+            self._took(k)
+            return k
+        except:
+            self._abort()
+            raise
+
+    def content_into(self, buf):
+        """Read the whole body into the bytearray buf and return a memoryview
+        of it. buf grows in place if the body doesn't fit, so one buffer
+        reused across requests settles at the largest body and the heap
+        sees no per-request body allocations. The view is valid until buf
+        is next reused.
+        """
+        if not self._chunked and self._length > len(buf):
+            buf.extend(bytes(self._length - len(buf)))
+        n = 0
+        while True:
+            if n == len(buf):
+                # Grow only if body remains: a view of buf may be held, and
+                # a bytearray with views can't be resized. _room() reads the
+                # next chunk header, and releases the connection at the end
+                if self.raw is None or not self._room(1):
+                    break
+                buf.extend(bytes(max(_READ_SIZE, n >> 2)))
+            k = self.readinto(memoryview(buf)[n:])
+            if not k:
+                break
+            n += k
+        return memoryview(buf)[:n]
+
+    def _pull(self, line, n):
+        if self.raw is None:
+            return b""
+        try:
+            n = self._room(n)
+            if not n:
+                return b""
+            data = self.raw.readline(n) if line else self.raw.read(n)
+            self._took(len(data))
+            return data
+        except:
+            self._abort()
+            raise
+
+    def _room(self, n):
+        # How much of the next n bytes belong to the body; 0 (and the
+        # connection released) once it is complete
+        if self._chunked:
+            if self._chunk_left == 0 and not self._next_chunk():
+                self._done()
+                return 0
+            return min(n, self._chunk_left)
+        if self._length == 0:
+            self._done()
+            return 0
+        if self._length > 0:
+            return min(n, self._length)
+        return n
+
+    def _took(self, k):
+        if self._chunked:
+            if not k:
+                raise ValueError("Truncated chunked body")
+            self._chunk_left -= k
+            if self._chunk_left == 0:
+                self.raw.readline()  # CRLF after the chunk data
+        elif self._length > 0:
+            if not k:
+                raise ValueError("Truncated body")
+            self._length -= k
+        elif not k:
+            self._done()
+
+    def _abort(self):
+        # A half-read connection can't be reused
+        self._release = None
+        if self.raw is not None:
+            self._close_raw()
+
+    def iter_content(self, chunk_size=_READ_SIZE):
+        while True:
+            data = self.read(chunk_size)
+            if not data:
+                return
+            yield data
+
+    def iter_lines(self):
+        """Yield body lines without their line endings as they arrive.
+
+        Whole lines, however long: readline()'s limit-sized pieces are
+        joined until the newline (a server-sent event can run past 1 KB).
+        """
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            while line[-1:] != b"\n":
+                more = self.readline()
+                if not more:
+                    break
+                line += more
+            yield line.rstrip(b"\r\n")
+
     @property
     def content(self):
         if self._cached is None:
-            try:
-                self._cached = self.raw.read()
-            finally:
-                self.raw.close()
-                self.raw = None
+            if self._length >= 0 and not self._chunked:
+                # Size is known: one read, one allocation
+                data = self.read(self._length) if self._length else b""
+                if self._length > 0:
+                    # Short read from a non-blocking stream: keep going
+                    data = bytearray(data)
+                    while self._length > 0:
+                        data.extend(self.read(self._length))
+                self._cached = data
+                self.read()  # reaches the end and releases the connection
+            else:
+                buf = bytearray()
+                while True:
+                    data = self.read(_READ_SIZE)
+                    if not data:
+                        break
+                    buf.extend(data)
+                self._cached = buf
         return self._cached
 
     @property
     def text(self):
         return str(self.content, self.encoding)
 
-    def json(self):
-        import json
+    def json(self, fields=None):
+        """Parse the body. With fields (dotted key paths, see jsonstream),
+        stream-parse straight off the socket and keep only those values."""
+        if fields is None:
+            import json
 
-        return json.loads(self.content)
+            return json.loads(self.content)
 
+        import jsonstream
 
-def request(
-    method,
-    url,
-    data=None,
-    json=None,
-    headers=None,
-    stream=None,
-    auth=None,
-    timeout=None,
-    parse_headers=True,
-):
-    if headers is None:
-        headers = {}
-    else:
-        headers = headers.copy()
-
-    redirect = None  # redirection url, None means no redirection
-    chunked_data = data and getattr(data, "__next__", None) and not getattr(data, "__len__", None)
+        out = jsonstream.select(self.read, fields)
+        while self.read():
+            pass  # drain trailing bytes so the connection can be released
+        return out
 
-    if auth is not None:
-        import binascii
-
-        username, password = auth
-        formatted = b"{}:{}".format(username, password)
-        formatted = str(binascii.b2a_base64(formatted)[:-1], "ascii")
-        headers["Authorization"] = "Basic {}".format(formatted)
 
+def _split_url(url):
     try:
         proto, dummy, host, path = url.split("/", 3)
     except ValueError:
@@ -68,8 +246,6 @@ def request(
     if proto == "http:":
         port = 80
     elif proto == "https:":
-        import tls
-
         port = 443
     else:
         raise ValueError("Unsupported protocol: " + proto)
@@ -77,13 +253,12 @@ def request(
     if ":" in host:
         host, port = host.split(":", 1)
         port = int(port)
+    return proto, host, port, path
 
-    ai = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
-    ai = ai[0]
 
-    resp_d = None
-    if parse_headers is not False:
-        resp_d = {}
+def _connect(proto, host, port, timeout):
+    """Open a socket and return (sock, stream) ready for write/readline."""
+    ai = netcache.resolve(host, port)
 
     s = socket.socket(ai[0], socket.SOCK_STREAM, ai[2])
 
@@ -93,109 +268,304 @@ def request(
         s.settimeout(timeout)
 
     try:
-        s.connect(ai[-1])
+        try:
+            s.connect(ai[-1])
+        except OSError:
+            netcache.forget(host, port)
+            raise
         if proto == "https:":
-            context = tls.SSLContext(tls.PROTOCOL_TLS_CLIENT)
-            context.verify_mode = tls.CERT_NONE
-            s = context.wrap_socket(s, server_hostname=host)
-        s.write(b"%s /%s HTTP/1.0\r\n" % (method, path))
-
-        if "Host" not in headers:
-            headers["Host"] = host
+            s = netcache.wrap(s, host)
+    except OSError:
+        s.close()
+        raise
 
-        if json is not None:
-            assert data is None
-            from json import dumps
+    # MicroPython sockets have write/readline directly; CPython needs makefile()
+    if hasattr(s, "readline"):
+        return s, s
+    return s, s.makefile("rwb")
 
-            data = dumps(json)
 
-            if "Content-Type" not in headers:
-                headers["Content-Type"] = "application/json"
+def _write(f, v):
+    f.write(v.encode() if isinstance(v, str) else v)
 
-        if data:
-            if chunked_data:
-                if "Transfer-Encoding" not in headers and "Content-Length" not in headers:
-                    headers["Transfer-Encoding"] = "chunked"
-            elif "Content-Length" not in headers:
-                headers["Content-Length"] = str(len(data))
 
-        if "Connection" not in headers:
-            headers["Connection"] = "close"
-
-        # Iterate over keys to avoid tuple alloc
-        for k in headers:
-            s.write(k)
-            s.write(b": ")
-            s.write(headers[k])
-            s.write(b"\r\n")
-
-        s.write(b"\r\n")
-
-        if data:
-            if chunked_data:
-                if headers.get("Transfer-Encoding", None) == "chunked":
-                    for chunk in data:
-                        s.write(b"%x\r\n" % len(chunk))
-                        s.write(chunk)
-                        s.write(b"\r\n")
-                    s.write("0\r\n\r\n")
-                else:
-                    for chunk in data:
-                        s.write(chunk)
+def _send(f, method, host, path, headers, data, version):
+    chunked_data = data and getattr(data, "__next__", None) and not getattr(data, "__len__", None)
+    if isinstance(data, str):
+        data = data.encode()  # so Content-Length counts bytes, not chars
+
+    _write(f, "%s /%s HTTP/%s\r\n" % (method, path, version))
+
+    if "Host" not in headers:
+        headers["Host"] = host
+
+    if data:
+        if chunked_data:
+            if "Transfer-Encoding" not in headers and "Content-Length" not in headers:
+                headers["Transfer-Encoding"] = "chunked"
+        elif "Content-Length" not in headers:
+            headers["Content-Length"] = str(len(data))
+
+    # Iterate over keys to avoid tuple alloc
+    for k in headers:
+        _write(f, k)
+        _write(f, b": ")
+        _write(f, headers[k])
+        _write(f, b"\r\n")
+
+    _write(f, b"\r\n")
+
+    if data:
+        if chunked_data:
+            if headers.get("Transfer-Encoding", None) == "chunked":
+                for chunk in data:
+                    _write(f, b"%x\r\n" % len(chunk))
+                    _write(f, chunk)
+                    _write(f, b"\r\n")
+                _write(f, b"0\r\n\r\n")
             else:
-                s.write(data)
+                for chunk in data:
+                    _write(f, chunk)
+        else:
+            _write(f, data)
+
+    if hasattr(f, "flush"):
+        f.flush()
 
-        l = s.readline()
+
+def _read_head(f, sock, parse_headers):
+    """Read status line and headers into a new Response."""
+    resp = Response(f, sock)
+    resp_d = None
+    if parse_headers is not False:
+        resp_d = {}
+
+    l = f.readline()
+    # print(l)
+    l = l.split(None, 2)
+    if len(l) < 2:
+        # Invalid response
+        raise ValueError("HTTP error: BadStatusLine:\n%s" % l)
+    resp._keep_alive = l[0] == b"HTTP/1.1"
+    status = int(l[1])
+    reason = ""
+    if len(l) > 2:
+        reason = l[2].rstrip()
+    while True:
+        l = f.readline()
+        if not l or l == b"\r\n":
+            break
         # print(l)
-        l = l.split(None, 2)
-        if len(l) < 2:
-            # Invalid response
-            raise ValueError("HTTP error: BadStatusLine:\n%s" % l)
-        status = int(l[1])
-        reason = ""
-        if len(l) > 2:
-            reason = l[2].rstrip()
-        while True:
-            l = s.readline()
-            if not l or l == b"\r\n":
-                break
-            # print(l)
-            if l.startswith(b"Transfer-Encoding:"):
-                if b"chunked" in l:
-                    raise ValueError("Unsupported " + str(l, "utf-8"))
-            elif l.startswith(b"Location:") and not 200 <= status <= 299:
-                if status in [301, 302, 303, 307, 308]:
-                    redirect = str(l[10:-2], "utf-8")
-                else:
-                    raise NotImplementedError("Redirect %d not yet supported" % status)
-            if parse_headers is False:
-                pass
-            elif parse_headers is True:
-                l = str(l, "utf-8")
-                k, v = l.split(":", 1)
-                resp_d[k] = v.strip()
+        lower = l.lower()
+        if lower.startswith(b"transfer-encoding:"):
+            if b"chunked" in lower:
+                resp._chunked = True
+        elif lower.startswith(b"content-length:"):
+            resp._length = int(l[15:])
+        elif lower.startswith(b"connection:"):
+            resp._keep_alive = b"close" not in lower
+        elif l.startswith(b"Location:") and not 200 <= status <= 299:
+            if status in [301, 302, 303, 307, 308]:
+                resp._redirect = str(l[10:-2], "utf-8")
             else:
-                parse_headers(l, resp_d)
+                raise NotImplementedError("Redirect %d not yet supported" % status)
+        if parse_headers is False:
+            pass
+        elif parse_headers is True:
+            l = str(l, "utf-8")
+            k, v = l.split(":", 1)
+            resp_d[k] = v.strip()
+        else:
+            parse_headers(l, resp_d)
+
+    resp.status_code = status
+    resp.reason = reason
+    if resp_d is not None:
+        resp.headers = resp_d
+    return resp
+
+
+def _no_body(method, resp):
+    if method == "HEAD" or resp.status_code in (204, 304):
+        resp._length = 0
+        resp._chunked = False
+
+
+def _prepare(headers, data, json, auth):
+    if headers is None:
+        headers = {}
+    else:
+        headers = headers.copy()
+
+    if auth is not None:
+        import binascii
+
+        username, password = auth
+        formatted = b"{}:{}".format(username, password)
+        formatted = str(binascii.b2a_base64(formatted)[:-1], "ascii")
+        headers["Authorization"] = "Basic {}".format(formatted)
+
+    if json is not None:
+        assert data is None
+        from json import dumps
+
+        data = dumps(json)
+
+        if "Content-Type" not in headers:
+            headers["Content-Type"] = "application/json"
+    return headers, data
+
+
+def request(
+    method,
+    url,
+    data=None,
+    json=None,
+    headers=None,
+    stream=None,
+    auth=None,
+    timeout=None,
+    parse_headers=True,
+):
+    headers, body = _prepare(headers, data, json, auth)
+    proto, host, port, path = _split_url(url)
+
+    if "Connection" not in headers:
+        headers["Connection"] = "close"
+
+    s, f = _connect(proto, host, port, timeout)
+    try:
+        _send(f, method, host, path, headers, body, "1.0")
+        resp = _read_head(f, s, parse_headers)
+        _no_body(method, resp)
     except OSError:
+        f.close()
         s.close()
         raise
 
+    redirect = resp._redirect
     if redirect:
-        s.close()
+        resp.close()
         # Use the host specified in the redirect URL, as it may not be the same as the original URL.
         headers.pop("Host", None)
-        if status in [301, 302, 303]:
+        if resp.status_code in [301, 302, 303]:
             return request("GET", redirect, None, None, headers, stream)
         else:
             return request(method, redirect, data, json, headers, stream)
-    else:
-        resp = Response(s)
-        resp.status_code = status
-        resp.reason = reason
-        if resp_d is not None:
-            resp.headers = resp_d
+    return resp
+
+
+class Session:
+    """Keeps one idle HTTP/1.1 connection per host:port for reuse.
+
+    Opt-in alternative to the module-level functions, which open a fresh
+    socket (and TLS handshake) per call. A pooled connection is dropped after
+    idle_timeout seconds, or whenever free heap is under min_free, since an
+    idle TLS socket pins tens of KB of mbedtls buffers. If the server has
+    closed a pooled socket, the request is retried once on a new one.
+    """
+
+    def __init__(self, idle_timeout=30, min_free=24_000):
+        self.idle_timeout = idle_timeout
+        self.min_free = min_free
+        self._pool = {}  # (proto, host, port) -> (sock, stream, last_used)
+        self.hits = 0
+        self.misses = 0
+        self.reconnects = 0
+        self.evictions = 0
+
+    @property
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "reconnects": self.reconnects,
+            "evictions": self.evictions,
+        }
+
+    def _evict(self, now):
+        low = False
+        try:
+            import gc
+
+            low = gc.mem_free() < self.min_free
+        except AttributeError:
+            pass  # CPython: no gc.mem_free
+        for key in list(self._pool):
+            if low or now - self._pool[key][2] > self.idle_timeout:
+                self._drop(key)
+                self.evictions += 1
+
+    def _drop(self, key):
+        s, f, _ = self._pool.pop(key)
+        f.close()
+        if s is not f:
+            s.close()
+
+    def close(self):
+        for key in list(self._pool):
+            self._drop(key)
+
+    def request(self, method, url, data=None, json=None, headers=None, timeout=None, parse_headers=True):
+        headers, body = _prepare(headers, data, json, None)
+        proto, host, port, path = _split_url(url)
+        key = (proto, host, port)
+        if "Connection" not in headers:
+            headers["Connection"] = "keep-alive"
+
+        self._evict(time.time())
+        conn = self._pool.pop(key, None)
+        if conn is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        while True:
+            if conn is None:
+                s, f = _connect(proto, host, port, timeout)
+                reused = False
+            else:
+                s, f = conn[0], conn[1]
+                reused = True
+            try:
+                _send(f, method, host, path, headers, body, "1.1")
+                resp = _read_head(f, s, parse_headers)
+                _no_body(method, resp)
+                break
+            except (OSError, ValueError):
+                f.close()
+                if s is not f:
+                    s.close()
+                if not reused:
+                    raise
+                # Server closed the idle socket under us: reconnect once
+                self.reconnects += 1
+                conn = None
+
+        # Only a body with a known end leaves the connection reusable
+        if resp._keep_alive and (resp._chunked or resp._length >= 0):
+            resp._release = lambda: self._put(key, s, f)
+
+        redirect = resp._redirect
+        if redirect:
+            resp.close()
+            headers.pop("Host", None)
+            if resp.status_code in [301, 302, 303]:
+                return self.request("GET", redirect, headers=headers, timeout=timeout)
+            return self.request(method, redirect, data, json, headers, timeout)
         return resp
 
+    def _put(self, key, s, f):
+        if key in self._pool:
+            self._drop(key)
+        self._pool[key] = (s, f, time.time())
+
+    def get(self, url, **kw):
+        return self.request("GET", url, **kw)
+
+    def post(self, url, **kw):
+        return self.request("POST", url, **kw)
+
 
 def head(url, **kw):
     return request("HEAD", url, **kw)
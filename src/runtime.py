@@ -0,0 +1,99 @@
+"""Optional asyncio runtime for the app loop.
+
+Runs the same update()/deadline contract as the blocking loop in main.py,
+but inside an event loop. An app may additionally define
+
+    async def run(display, buttons, led, colors, WIDTH, HEIGHT)
+
+which is started after init() and cancelled when the app is switched away.
+Slow work (network fetches) belongs there: while it awaits a socket,
+update() keeps being called to draw progress, and the A-button switch is
+still handled. Works on MicroPython (asyncio/uasyncio) and CPython.
+"""
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+import time
+
+_DEFAULT_DELAY_MS = 50
+# Set by wake() to end an idle_ms() early. ThreadSafeFlag is MicroPython's
+# event that an IRQ handler may set; on CPython (sim/) IRQs run on the
+# loop's own thread, where an Event does the same.
+_flag = asyncio.ThreadSafeFlag() if hasattr(asyncio, "ThreadSafeFlag") else asyncio.Event()
+wakes = 0  # times main() has come out of idle_ms()
+
+
+def sleep_ms(ms):
+    """Awaitable sleep in ms on both MicroPython and CPython asyncio."""
+    if hasattr(asyncio, "sleep_ms"):
+        return asyncio.sleep_ms(ms)
+    return asyncio.sleep(ms / 1000)
+
+
+def wake():
+    """End the loop's current sleep now. Safe to call from an IRQ handler."""
+    _flag.set()
+
+
+async def idle_ms(ms):
+    """Sleep ms, or until wake(): the scheduler sleeps until then, running
+    only other tasks, instead of the loop polling for IRQ flags."""
+    try:
+        if hasattr(asyncio, "wait_for_ms"):
+            await asyncio.wait_for_ms(_flag.wait(), ms)
+        else:
+            await asyncio.wait_for(_flag.wait(), ms / 1000)
+    except asyncio.TimeoutError:
+        pass
+    _flag.clear()
+
+
+async def _guard(name, coro):
+    try:
+        await coro
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"Error in {name} task: {e}")
+
+
+async def main(tick, pending, current, args):
+    """Drive the app loop forever.
+
+    tick() runs one iteration of main.py's loop body (switch check + update)
+    and returns the delay in ms, or None for the default poll. pending()
+    reports an IRQ flag that should cut the sleep short; the IRQ handler
+    also calls wake() so the sleep ends without polling. current() returns
+    the loaded app module; when it changes, the old app's task is cancelled
+    and the new app's run() coroutine, if any, is started.
+    """
+    global wakes
+    app = None
+    task = None
+    while True:
+        if current() is not app:
+            if task is not None:
+                task.cancel()
+                task = None
+            app = current()
+            if hasattr(app, "run"):
+                task = asyncio.create_task(_guard(app.__name__, app.run(*args)))
+                # Let run() claim its work before update() is first called
+                await sleep_ms(0)
+
+        woke = time.ticks_ms()
+        delay = tick()
+        if delay is None:
+            delay = _DEFAULT_DELAY_MS
+        left = time.ticks_diff(time.ticks_add(woke, delay), time.ticks_ms())
+        if left > 0 and not pending():
+            await idle_ms(left)
+            wakes += 1
+        else:
+            await sleep_ms(0)  # always give background tasks a turn
+
+
+def run(tick, pending, current, args):
+    asyncio.run(main(tick, pending, current, args))
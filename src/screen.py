@@ -0,0 +1,198 @@
+"""Dirty-region wrapper around PicoGraphics.
+
+Apps draw through a Screen exactly as they would through the raw display.
+Every draw call records the rectangle it touched. update() pushes nothing
+when nothing was drawn, and with partial=True only those rectangles, so a
+clock that changes two digits no longer re-sends the whole frame.
+
+Partial pushes are off by default: every PicoGraphics has partial_update(),
+but only the e-ink drivers implement it. On the ST7789 (Pico Display 2) it
+is the base class's no-op, so a partial push would never reach the LCD.
+"""
+
+import time
+
+_MAX_RECTS = 8  # beyond this, damage collapses into one bounding box
+_FULL_RATIO = 0.6  # push the whole frame once damage covers this much of it
+_CHAR_W = 6  # bitmap8 advance at scale 1, used when measure_text is missing
+_CHAR_H = 8
+
+
+class Screen:
+    def __init__(self, display, partial=False):
+        self._d = display
+        self.width, self.height = display.get_bounds()
+        self._partial = partial
+        self._pen = None
+        self._dirty = []  # [x, y, w, h] damaged since the last update()
+        self._full = False
+        self.frames = 0
+        self.frame_pixels = 0  # pixels pushed by the last update()
+        self.total_pixels = 0
+        self.timing = False  # when set, update() adds its duration to push_us
+        self.push_us = 0
+        self.overlay = None  # called with the Screen before each push, to draw on top
+
+    def __getattr__(self, name):
+        # create_pen, set_font, set_backlight, ... go straight through
+        return getattr(self._d, name)
+
+    def _damage(self, x, y, w, h):
+        if self._full:
+            return
+        if x < 0:
+            w += x
+            x = 0
+        if y < 0:
+            h += y
+            y = 0
+        if x + w > self.width:
+            w = self.width - x
+        if y + h > self.height:
+            h = self.height - y
+        if w <= 0 or h <= 0:
+            return
+
+        # Merge into an overlapping or touching rect
+        for r in self._dirty:
+            if x <= r[0] + r[2] and r[0] <= x + w and y <= r[1] + r[3] and r[1] <= y + h:
+                x2 = max(x + w, r[0] + r[2])
+                y2 = max(y + h, r[1] + r[3])
+                r[0] = min(x, r[0])
+                r[1] = min(y, r[1])
+                r[2] = x2 - r[0]
+                r[3] = y2 - r[1]
+                return
+
+        self._dirty.append([x, y, w, h])
+        if len(self._dirty) > _MAX_RECTS:
+            self._collapse()
+
+    def _collapse(self):
+        x1 = min(r[0] for r in self._dirty)
+        y1 = min(r[1] for r in self._dirty)
+        x2 = max(r[0] + r[2] for r in self._dirty)
+        y2 = max(r[1] + r[3] for r in self._dirty)
+        self._dirty = [[x1, y1, x2 - x1, y2 - y1]]
+
+    def invalidate(self, x=None, y=None, w=None, h=None):
+        """Mark a region (or the whole screen) as needing a push."""
+        if x is None:
+            self._full = True
+            self._dirty = []
+        else:
+            self._damage(x, y, w, h)
+
+    # Drawing — forwarded to the display, recording damage
+
+    def set_pen(self, pen):
+        self._pen = pen
+        self._d.set_pen(pen)
+
+    def clear(self):
+        self._d.clear()
+        self.invalidate()
+
+    def clear_rect(self, x, y, w, h, pen):
+        """Fill a region with a background pen and mark it damaged.
+
+        This is the partial-redraw counterpart to clear(): wipe only what is
+        about to change, then draw into it.
+        """
+        prev = self._pen
+        self._d.set_pen(pen)
+        self._d.rectangle(x, y, w, h)
+        if prev is not None:
+            self._d.set_pen(prev)
+        self._damage(x, y, w, h)
+
+    def rectangle(self, x, y, w, h):
+        self._d.rectangle(x, y, w, h)
+        self._damage(x, y, w, h)
+
+    def circle(self, x, y, r):
+        self._d.circle(x, y, r)
+        self._damage(x - r, y - r, 2 * r + 1, 2 * r + 1)
+
+    def triangle(self, x1, y1, x2, y2, x3, y3):
+        self._d.triangle(x1, y1, x2, y2, x3, y3)
+        x = min(x1, x2, x3)
+        y = min(y1, y2, y3)
+        self._damage(x, y, max(x1, x2, x3) - x + 1, max(y1, y2, y3) - y + 1)
+
+    def line(self, x1, y1, x2, y2, *args):
+        self._d.line(x1, y1, x2, y2, *args)
+        t = args[0] if args else 1
+        x = min(x1, x2) - t
+        y = min(y1, y2) - t
+        self._damage(x, y, abs(x2 - x1) + 2 * t + 1, abs(y2 - y1) + 2 * t + 1)
+
+    def pixel(self, x, y):
+        self._d.pixel(x, y)
+        self._damage(x, y, 1, 1)
+
+    def text(self, text, x, y, wordwrap=-1, scale=2, *args, **kw):
+        self._d.text(text, x, y, wordwrap, scale, *args, **kw)
+        self._damage(x, y, *self._text_size(text, x, y, wordwrap, scale))
+
+    def _text_size(self, text, x, y, wordwrap, scale):
+        lines = text.count("\n") + 1
+        if hasattr(self._d, "measure_text"):
+            w = self._d.measure_text(text, scale)
+        else:
+            w = len(text) * _CHAR_W * scale
+        if 0 < wordwrap < w:
+            # Wrapped: exact line count depends on word breaks, so damage
+            # the full wrap width down to the bottom of the screen.
+            return wordwrap, self.height - y
+        return w, lines * _CHAR_H * scale
+
+    def update(self):
+        if self.overlay is not None and (self._full or self._dirty):
+            pen = self._pen
+            self.overlay(self)
+            if pen is not None:
+                self.set_pen(pen)
+        if not self.timing:
+            self._push()
+            return
+        start = time.ticks_us()
+        self._push()
+        self.push_us += time.ticks_diff(time.ticks_us(), start)
+
+    def _push(self):
+        area = self.width * self.height
+        if self._full:
+            pushed = area
+            self._d.update()
+        elif not self._dirty:
+            pushed = 0
+        else:
+            pushed = 0
+            for r in self._dirty:
+                pushed += r[2] * r[3]
+            if not self._partial or pushed > area * _FULL_RATIO:
+                pushed = area
+                self._d.update()
+            else:
+                for r in self._dirty:
+                    self._d.partial_update(r[0], r[1], r[2], r[3])
+        self._dirty = []
+        self._full = False
+        self.frames += 1
+        self.frame_pixels = pushed
+        self.total_pixels += pushed
+
+
+# Eight points on a radius-8 circle, clockwise from 12 o'clock
+_SPIN = ((0, -8), (6, -6), (8, 0), (6, 6), (0, 8), (-6, 6), (-8, 0), (-6, -6))
+
+
+def spinner(display, x, y, frame, pen, bg):
+    """Draw one frame of a small busy indicator centred on (x, y)."""
+    display.clear_rect(x - 11, y - 11, 23, 23, bg)
+    display.set_pen(pen)
+    for i in (frame, frame - 1, frame - 2):
+        dx, dy = _SPIN[i % 8]
+        display.circle(x + dx, y + dy, 3 if i == frame else 2)
+    display.update()
@@ -0,0 +1,308 @@
+"""Benchmark: every app in main.py's app_modules, driven through scripted
+scenarios on the simulated board (sim/).
+
+Run with: python tests/bench_apps.py [--write] [scenario ...]
+
+Each scenario loads the app fresh, calls init() and then runs main.py's
+update loop on the fake clock, with button presses scripted on it:
+
+    clock    an hour of ticks
+    quotes   ten minutes across an hour change (prefetch + swap), each
+             minute's quotes charged 1 ms of parsing
+    weather  fetches from a local server replaying tests/data/weather.json
+    timer    a 5-minute countdown, then the finish screen
+    pong     a Breakout game with the paddle kept under the ball, to the
+             end of the wall (or 10 minutes)
+    react    50 reaction rounds, pressing 180-320 ms after GO
+    story    two stories streamed from a local server replaying
+             tests/data/openrouter_reply.json
+
+and reports, per scenario:
+
+    updates     update() calls, and pushes to the panel (frames)
+    upd/s       update() calls per wall-second (CPython, no tracing)
+    draw/frame  draw calls (text, rectangle, ... and pushes) per frame
+    px/frame    pixels pushed per frame
+    frame ms    median time between update()s that pushed, with each push
+                taking as long as the SPI transfer would (sim SPI_HZ)
+    jitter      p95 of how far those times are from the median, ms
+    alloc/upd   mean tracemalloc peak above the pre-update baseline, B:
+                heap update() needed at once; 0 means it allocated nothing.
+                Measured in a second run with the simulated panel not
+                drawing, so NumPy's buffers don't count. CPython boxes ints
+                above 256, which MicroPython doesn't, so a few dozen bytes
+                can be integer arithmetic that is free on the device
+
+Everything but upd/s is deterministic, bar some of alloc/upd in the
+scenarios that read sockets (allowed for below). The numbers are compared
+with the baseline in tests/data/bench_apps.json, and --write replaces it, so a
+change that makes an app draw or allocate more shows up in review.
+"""
+
+import importlib.util
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.append(str(ROOT))
+import sim  # noqa: E402
+from sim.clock import EPOCH, Clock  # noqa: E402
+from sim.picographics import SPI_HZ  # noqa: E402
+
+DATA = Path(__file__).parent / "data"
+BASELINE = DATA / "bench_apps.json"
+WEATHER = (DATA / "weather.json").read_bytes()
+STORY = json.loads((DATA / "openrouter_reply.json").read_text())["choices"][0]["message"]["content"]
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Recorded Open-Meteo and OpenRouter replies (SSE when asked to stream)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, body, ctype="application/json"):
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._send(WEATHER)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if not body.get("stream"):
+            self._send(json.dumps({"choices": [{"message": {"content": STORY}}]}).encode())
+            return
+        out = [b": OPENROUTER PROCESSING\n\n"]
+        for word in STORY.split(" "):
+            event = {"choices": [{"delta": {"content": word + " "}}]}
+            out.append(b"data: " + json.dumps(event).encode() + b"\n\n")
+        out.append(b"data: [DONE]\n\n")
+        self._send(b"".join(out), "text/event-stream")
+
+    def log_message(self, *args):
+        pass
+
+
+class Measured:
+    """An app whose update() records time and tracemalloc peaks."""
+
+    def __init__(self, app):
+        self.app = app
+        self.WAKE_ON = getattr(app, "WAKE_ON", ())
+        self.alloc = 0
+
+    def update(self, *args):
+        if not tracemalloc.is_tracing():
+            return self.app.update(*args)
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        delay = self.app.update(*args)
+        self.alloc += tracemalloc.get_traced_memory()[1] - base
+        return delay
+
+
+def run_until(dev, app, done, limit_ms, step_ms=100):
+    """Run in step_ms slices until done() or limit_ms has passed."""
+    end = dev.clock.ms + limit_ms
+    while not done() and dev.clock.ms < end:
+        dev.run(app, step_ms)
+
+
+# Scenarios: (dev, app module, measured app) -> None, run on a fresh Device
+
+
+def clock_hour(dev, mod, app):
+    dev.run(app, 3_600_000)
+
+
+def quotes_hour_change(dev, mod, app):
+    # Parsing is instant here: charge each minute's quotes the ~1 ms it
+    # takes on the board, so the prefetch spreads over updates as it does there
+    load = mod._load
+    mod._load = lambda hour, into: sim.charge(load(hour, into), 1000)
+    dev.run(app, 600_000)
+
+
+def weather_refresh(dev, mod, app):
+    for t in (5_000, 60_000, 120_000):
+        dev.press("X", at=dev.clock.ms + t)
+    dev.run(app, 180_000)
+
+
+def timer_5min(dev, mod, app):
+    dev.press("X", at=dev.clock.ms + 1000)  # start the default 5 minutes
+    dev.run(app, 5 * 60_000 + 5_000)
+    dev.press("X")  # reset from the finish screen
+    dev.run(app, 2_000)
+
+
+def pong_game(dev, mod, app):
+    dev.press("X", at=dev.clock.ms + 500)
+    dev.run(app, 600)
+    end = dev.clock.ms + 600_000
+    while not mod._game_over and dev.clock.ms < end:
+        # Centre the paddle under the ball, as a perfect player would
+        x = (mod._ball_x >> mod._FP) + mod._ball_size // 2 - mod._paddle_w // 2
+        mod._paddle_x = max(0, min(x, dev.WIDTH - mod._paddle_w))
+        dev.run(app, mod._FRAME_MS)
+
+
+def react_50(dev, mod, app):
+    rng = random.Random(1)
+    dev.press("X")
+    for _ in range(50):
+        run_until(dev, app, lambda: mod._state == "go", 10_000, 10)
+        dev.press("X", at=dev.clock.ms + rng.randint(180, 320))
+        run_until(dev, app, lambda: mod._state == "result", 2_000, 10)
+        dev.run(app, 500)
+        dev.press("X")
+
+
+def story_twice(dev, mod, app):
+    for _ in range(2):
+        dev.press("X", at=dev.clock.ms + 200)
+        dev.run(app, 400)
+        run_until(dev, app, lambda: not mod._loading, 60_000)
+        dev.run(app, 2_000)
+
+
+SCENARIOS = {
+    "clock": ("app_clock", clock_hour, EPOCH),
+    "quotes": ("app_quotes", quotes_hour_change, EPOCH + 9 * 3600 + 56 * 60),  # 20:56 in Sydney
+    "weather": ("app_weather", weather_refresh, EPOCH),
+    "timer": ("app_timer", timer_5min, EPOCH),
+    "pong": ("app_pong", pong_game, EPOCH),
+    "react": ("app_react", react_50, EPOCH),
+    "story": ("app_story", story_twice, EPOCH),
+}
+
+
+def _device_requests():
+    """src/requests.py as `requests`, as on the device (CPython's requests
+    package would otherwise be imported by app_weather and llm)."""
+    spec = importlib.util.spec_from_file_location("requests", ROOT / "src" / "requests.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def run(name, server, trace):
+    module, scenario, start = SCENARIOS[name]
+    clock = sim.install(Clock(start=start))
+    saved = {m: sys.modules.pop(m, None) for m in ("requests", "llm", "arequests", "netcache")}
+    try:
+        sys.modules["requests"] = _device_requests()
+        dev = sim.Device(clock, draw=not trace, spi_hz=SPI_HZ)
+        if trace:
+            tracemalloc.start()
+        t0 = time.perf_counter()
+        mod = dev.load(module)
+        if module == "app_weather":
+            mod._URL = "http://127.0.0.1:%d/v1/forecast" % server.server_port
+        elif module == "app_story":
+            import llm
+
+            llm._ENDPOINT = "http://127.0.0.1:%d/api/v1/chat/completions" % server.server_port
+        app = Measured(mod)
+        scenario(dev, mod, app)
+        wall = time.perf_counter() - t0
+        if trace:
+            tracemalloc.stop()
+    finally:
+        sim.uninstall()
+        for m, old in saved.items():
+            sys.modules.pop(m, None)
+            if old is not None:
+                sys.modules[m] = old
+
+    p = dev.panel
+    frames = max(p.updates, 1)
+    iv = sorted(dev.intervals()) or [0]
+    mid = iv[len(iv) // 2]
+    off = sorted(abs(i - mid) for i in iv)
+    return {
+        "sim_s": round(clock.ms / 1000, 1),
+        "updates": dev.updates,
+        "frames": p.updates,
+        "draw_per_frame": round(p.draw_calls() / frames, 1),
+        "px_per_frame": round(p.pushed / frames),
+        "frame_ms": round(mid / 1000, 1),
+        "jitter_ms": round(off[(len(off) - 1) * 95 // 100] / 1000, 1),
+        "alloc_per_update": round(app.alloc / max(dev.updates, 1)),
+        "updates_per_s": round(dev.updates / wall),
+    }
+
+
+def _differs(col, old, new):
+    if col == "updates_per_s":
+        return False
+    if col == "alloc_per_update":  # reads off a socket vary with timing
+        return abs(new - old) > max(64, old // 5)
+    return new != old
+
+
+def main():
+    args = sys.argv[1:]
+    write = "--write" in args
+    names = [a for a in args if a != "--write"] or list(SCENARIOS)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cwd = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Quote files from data/, weather cache written to a scratch dir
+        (Path(tmp) / "quotes_gz").symlink_to(ROOT / "data" / "quotes_gz")
+        os.chdir(tmp)
+        try:
+            for name in names:
+                r = run(name, server, trace=False)
+                r["alloc_per_update"] = run(name, server, trace=True)["alloc_per_update"]
+                results[name] = r
+        finally:
+            os.chdir(cwd)
+    server.shutdown()
+
+    try:
+        baseline = json.loads(BASELINE.read_text())
+    except OSError:
+        baseline = {}
+    cols = ("updates", "frames", "updates_per_s", "draw_per_frame", "px_per_frame", "frame_ms", "jitter_ms",
+            "alloc_per_update")
+    heads = ("updates", "frames", "upd/s", "draw/frame", "px/frame", "frame ms", "jitter", "alloc/upd")
+    print(f"{'':>8} {'sim s':>7}" + "".join(f" {h:>11}" for h in heads))
+    for name, r in results.items():
+        old = baseline.get(name, {})
+        row = f"{name:>8} {r['sim_s']:>7}"
+        for c in cols:
+            cell = f"{r[c]:,}"
+            if c in old and _differs(c, old[c], r[c]):
+                cell += "*"
+            row += f" {cell:>11}"
+        print(row)
+    changed = [
+        n for n, r in results.items()
+        if n not in baseline or any(c not in baseline[n] or _differs(c, baseline[n][c], r[c]) for c in r)
+    ]
+    if write:
+        baseline.update(results)
+        BASELINE.write_text(json.dumps(baseline, indent=1, sort_keys=True) + "\n")
+        print(f"wrote {BASELINE}")
+    elif changed:
+        print(f"* differs from {BASELINE.name} for: {', '.join(changed)} (--write to update)")
+
+
+if __name__ == "__main__":
+    main()
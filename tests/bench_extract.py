@@ -0,0 +1,87 @@
+"""Benchmark: llm._extract_content vs the old per-character loop.
+
+Run with: python tests/bench_extract.py
+
+Replies are the recorded OpenRouter response in tests/data with its
+content repeated to reach each size.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+sys.modules.setdefault("env", MagicMock(OPENROUTER_API_KEY=""))
+import llm
+
+REPLY = json.loads((Path(__file__).parent / "data" / "openrouter_reply.json").read_text())
+
+
+def _old_extract(raw):
+    """The previous implementation, minus the error checks."""
+    msg = raw.find('"message"')
+    ct = raw.find('"content"', msg)
+    i = raw.find(":", ct + 9) + 1
+    while raw[i] in " \t\n\r":
+        i += 1
+    i += 1
+    n = len(raw)
+    parts = []
+    while i < n and raw[i] != '"':
+        if raw[i] == "\\":
+            i += 1
+            if i >= n:
+                break
+            c = raw[i]
+            if c == "n":
+                parts.append("\n")
+            elif c == "t":
+                parts.append("\t")
+            elif c == '"':
+                parts.append('"')
+            elif c == "\\":
+                parts.append("\\")
+            else:
+                parts.append(c)
+        else:
+            parts.append(raw[i])
+        i += 1
+    return "".join(parts)
+
+
+def _reply_of_size(size):
+    doc = json.loads(json.dumps(REPLY))
+    story = doc["choices"][0]["message"]["content"]
+    text = story
+    while len(json.dumps(dict(doc, choices=[{"message": {"content": text}}]))) < size:
+        text += "\n" + story
+    doc["choices"][0]["message"]["content"] = text
+    return json.dumps(doc, separators=(",", ":")), text
+
+
+def _time(fn, arg, target=0.2):
+    n = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < target:
+        fn(arg)
+        n += 1
+    return (time.perf_counter() - start) / n * 1000
+
+
+def main():
+    print(f"{'size':>8} {'old ms':>9} {'new ms':>9} {'bytes ms':>9} {'speedup':>8}")
+    for kb in (1, 4, 16, 64):
+        raw, expected = _reply_of_size(kb * 1024)
+        body = raw.encode()
+        assert llm._extract_content(raw) == expected
+        assert llm._extract_content(body) == expected
+        old = _time(_old_extract, raw)
+        new = _time(llm._extract_content, raw)
+        new_b = _time(llm._extract_content, body)
+        print(f"{len(raw):>8} {old:>9.3f} {new:>9.3f} {new_b:>9.3f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
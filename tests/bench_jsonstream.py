@@ -0,0 +1,66 @@
+"""Benchmark: jsonstream.select vs json.loads on open-meteo responses.
+
+Run with: python tests/bench_jsonstream.py
+
+Peak allocation is measured with tracemalloc and includes the body buffer
+json.loads needs (the socket read), since select() never holds it.
+"""
+
+import io
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+import app_weather  # only for _FIELDS
+import jsonstream
+
+WEATHER = (Path(__file__).parent / "data" / "weather.json").read_bytes()
+
+
+def _with_hourly(hours):
+    """The same reply with an hourly block, as if &hourly=... were added."""
+    doc = json.loads(WEATHER)
+    doc["hourly"] = {
+        "time": ["2026-10-18T%02d:00" % (h % 24) for h in range(hours)],
+        "temperature_2m": [round(15 + (h % 24) * 0.4, 1) for h in range(hours)],
+        "relative_humidity_2m": [50 + h % 40 for h in range(hours)],
+        "precipitation_probability": [h * 7 % 100 for h in range(hours)],
+        "wind_speed_10m": [round(5 + h % 13 * 1.1, 1) for h in range(hours)],
+        "weather_code": [(0, 1, 2, 3, 61)[h % 5] for h in range(hours)],
+    }
+    return json.dumps(doc).encode()
+
+
+def _measure(fn, repeat=50):
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return peak, (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    print(f"{'body':>10} {'parser':>12} {'peak KB':>9} {'ms':>8}")
+    for label, body in (("recorded", WEATHER), ("+168h", _with_hourly(168)), ("+384h", _with_hourly(384))):
+
+        def full():
+            raw = io.BytesIO(body).read()  # whole body in RAM, as content does
+            return json.loads(raw)
+
+        def stream():
+            return jsonstream.select(io.BytesIO(body).read, app_weather._FIELDS)
+
+        assert stream()["daily"] == {k: v[:3] for k, v in full()["daily"].items()}
+        for name, fn in (("json.loads", full), ("select", stream)):
+            peak, ms = _measure(fn)
+            print(f"{len(body):>10} {name:>12} {peak / 1024:>9.1f} {ms:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Benchmark and fuzzer: app_pong's game logic headless (app_pong.play).
+
+Run with: python tests/bench_pong.py [--games N] [--seed S] [--replay FILE]
+
+No display, no clock: each game is stepped as fast as the interpreter
+goes, so this times the physics apart from drawing (bench_apps.py times
+whole frames). Two kinds of game are played:
+
+    auto     the autopilot, seeds S..S+N-1: it rarely misses, so each
+             game runs to a cleared wall (thousands of steps)
+    script   random input logs, 2,000 steps of runs of left/still/right
+             from a seeded RNG: the paddle mostly misses, so games are
+             short and many
+
+After every step the ball is checked against invariants:
+
+    bounds   it is inside the screen sides and below the top
+    tunnel   it does not overlap a standing brick
+    stuck    it has been back to the paddle within _STUCK_STEPS
+
+A game that breaks one has its input log saved to pong-<kind>-<n>.log in
+the current directory, and --replay FILE plays such a log again (check
+that it fails the same way, then fix and replay).
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+import app_pong as pong  # noqa: E402
+
+WIDTH, HEIGHT = 320, 240
+_STUCK_STEPS = 120 * 60  # a minute of play without the paddle
+
+
+class Broken(Exception):
+    pass
+
+
+class Checker:
+    """play()'s check callback: raises Broken when an invariant fails."""
+
+    def __init__(self):
+        self.since_paddle = 0
+        self.falling = True
+
+    def __call__(self, n):
+        p = pong
+        x, y = p._ball_x >> p._FP, p._ball_y >> p._FP
+        if not 0 <= x <= WIDTH - p._ball_size or y < 0:
+            raise Broken("bounds: ball at %d,%d after step %d" % (x, y, n))
+        for row in range(p._BRICK_ROWS):
+            top = p._BRICK_TOP + row * p._BRICK_DY
+            if y + p._ball_size <= top or y >= top + p._BRICK_H:
+                continue
+            for col in range(p._BRICK_COLS):
+                left = p._brick_x0 + col * p._BRICK_DX
+                if p._alive[row] >> col & 1 and x + p._ball_size > left and x < left + p._BRICK_W:
+                    raise Broken("tunnel: ball at %d,%d inside brick %d,%d after step %d" % (x, y, row, col, n))
+        if self.falling and p._ball_dy < 0 and y > HEIGHT // 2:
+            self.since_paddle = 0
+        self.falling = p._ball_dy > 0
+        self.since_paddle += 1
+        if self.since_paddle > _STUCK_STEPS:
+            raise Broken("stuck: %d steps without the paddle, at step %d" % (self.since_paddle, n))
+
+
+def random_script(rng, steps=2000):
+    """An input log of runs of one direction, as a player holds buttons."""
+    log = bytearray()
+    while len(log) < steps:
+        log.extend(bytes([rng.choice((pong.LEFT, pong.STILL, pong.RIGHT))]) * rng.randint(1, 60))
+    return log[:steps]
+
+
+def fuzz(kind, games, seed):
+    """Play games of kind, checking every step; returns (steps, failures)."""
+    rng = random.Random(seed)
+    total = 0
+    failures = []
+    for i in range(games):
+        log = bytearray()
+        inputs = random_script(rng) if kind == "script" else None
+        try:
+            total += pong.play(WIDTH, HEIGHT, inputs, log, seed + i, check=Checker())
+        except Broken as e:
+            name = "pong-%s-%d.log" % (kind, seed + i)
+            Path(name).write_bytes(log)
+            failures.append("%s: %s" % (name, e))
+    return total, failures
+
+
+def timed(kind, games, seed):
+    """Play games of kind unchecked; returns (games/s, steps/s, steps)."""
+    rng = random.Random(seed)
+    scripts = [random_script(rng) for _ in range(games)] if kind == "script" else [None] * games
+    steps = 0
+    t0 = time.perf_counter()
+    for i, inputs in enumerate(scripts):
+        steps += pong.play(WIDTH, HEIGHT, inputs, seed=seed + i)
+    wall = time.perf_counter() - t0
+    return games / wall, steps / wall, steps
+
+
+def main():
+    args = sys.argv[1:]
+    opts = dict(zip(args[::2], args[1::2]))
+    if "--replay" in opts:
+        log = Path(opts["--replay"]).read_bytes()
+        try:
+            n = pong.play(WIDTH, HEIGHT, log, check=Checker())
+            print("%d steps, score %d, lives %d, %d bricks left" % (n, pong._score, pong._lives, pong._bricks_left))
+        except Broken as e:
+            print(e)
+        return
+    games = int(opts.get("--games", 200))
+    seed = int(opts.get("--seed", 1))
+
+    print(f"{'':>8} {'games':>7} {'games/s':>9} {'steps':>10} {'steps/s':>11} {'us/step':>8}")
+    failed = []
+    for kind in ("auto", "script"):
+        gps, sps, steps = timed(kind, games, seed)
+        print(f"{kind:>8} {games:>7,} {gps:>9,.0f} {steps:>10,} {sps:>11,.0f} {1e6 / sps:>8.2f}")
+        failed += fuzz(kind, games, seed)[1]
+    for f in failed:
+        print(f)
+    print("%d games broke an invariant" % len(failed) if failed else "no invariant broken")
+
+
+if __name__ == "__main__":
+    main()
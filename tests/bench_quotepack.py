@@ -0,0 +1,77 @@
+"""Benchmark: one minute's quotes from quotes.pack vs the hourly gz-JSON files.
+
+Run with: python tests/bench_quotepack.py
+
+For each approach, per lookup: bytes read from flash, peak Python heap
+(tracemalloc) and time. The pack is built into a temp dir first.
+"""
+
+import gzip
+import importlib.util
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from quotepack import QuotePack
+
+DATA = Path(__file__).parent.parent / "data"
+
+
+def _build(path):
+    spec = importlib.util.spec_from_file_location("build_pack", DATA / "build_pack.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    mod.build(DATA / "quotes_gz", path)
+
+
+def _gz_lookup(minute):
+    path = DATA / "quotes_gz" / ("%02d.json.gz" % (minute // 60))
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        quotes = json.load(f)
+    q = quotes.get("%02d:%02d" % (minute // 60, minute % 60))
+    return path.stat().st_size, q
+
+
+def _measure(fn, minutes):
+    read = peak = 0
+    worst_peak = 0
+    start = time.perf_counter()
+    for m in minutes:
+        tracemalloc.start()
+        n = fn(m)
+        _, p = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        read += n
+        peak += p
+        worst_peak = max(worst_peak, p)
+    ms = (time.perf_counter() - start) / len(minutes) * 1000
+    return read / len(minutes), peak / len(minutes), worst_peak, ms
+
+
+def main():
+    minutes = random.Random(1).sample(range(1440), 200)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "quotes.pack"
+        _build(path)
+        pack = QuotePack(str(path))
+
+        def pack_lookup(m):
+            before = pack.bytes_read
+            pack.get(m)
+            return pack.bytes_read - before
+
+        print(f"{len(minutes)} random minutes; pack file {path.stat().st_size:,} bytes, index {len(pack._index):,} bytes")
+        print(f"{'':>8} {'read B':>9} {'peak B':>9} {'worst B':>9} {'ms':>7}")
+        for name, fn in (("gz-json", lambda m: _gz_lookup(m)[0]), ("pack", pack_lookup)):
+            read, peak, worst, ms = _measure(fn, minutes)
+            print(f"{name:>8} {read:>9,.0f} {peak:>9,.0f} {worst:>9,} {ms:>7.3f}")
+        pack.close()
+
+
+if __name__ == "__main__":
+    main()
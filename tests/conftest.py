@@ -0,0 +1,46 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).parent.parent / "src"
+ROOT = SRC.parent
+
+
+@pytest.fixture
+def urequests():
+    """src/requests.py, loaded under another name so it doesn't shadow
+    CPython's requests package."""
+    if str(SRC) not in sys.path:
+        sys.path.append(str(SRC))  # for its own imports (netcache)
+    spec = importlib.util.spec_from_file_location("urequests", SRC / "requests.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="session")
+def quote_pack(tmp_path_factory):
+    """quotes.pack built from data/quotes_gz by data/build_pack.py."""
+    data = SRC.parent / "data"
+    spec = importlib.util.spec_from_file_location("build_pack", data / "build_pack.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    path = tmp_path_factory.mktemp("pack") / "quotes.pack"
+    mod.build(data / "quotes_gz", path)
+    return path
+
+
+@pytest.fixture
+def device():
+    """A simulated board (sim/) with its clock installed for the test."""
+    if str(ROOT) not in sys.path:
+        sys.path.append(str(ROOT))
+    import sim
+
+    clock = sim.install()
+    try:
+        yield sim.Device(clock)
+    finally:
+        sim.uninstall()
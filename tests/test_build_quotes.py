@@ -0,0 +1,80 @@
+"""Tests for data/build_quotes.py, the hourly quote file build."""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+DATA = Path(__file__).parent.parent / "data"
+sys.path.append(str(DATA))
+import build_quotes
+
+
+def _hours(out_dir):
+    return {p.name: p.read_bytes() for p in sorted(Path(out_dir).glob("*.json.gz"))}
+
+
+def test_json_source_matches_repo_files(tmp_path):
+    r = build_quotes.build(DATA / "quotes.json", tmp_path / "out", jobs=2)
+    assert r["rebuilt"] == 24
+    assert _hours(tmp_path / "out") == _hours(DATA / "quotes_gz")  # byte for byte
+
+
+def test_level_is_opt_in(tmp_path):
+    build_quotes.build(DATA / "quotes.json", tmp_path / "out", jobs=1, level=1)
+    for name, data in _hours(tmp_path / "out").items():
+        assert gzip.decompress(data) == gzip.decompress((DATA / "quotes_gz" / name).read_bytes())
+
+
+def test_incremental_and_deterministic(tmp_path):
+    src = tmp_path / "quotes.json"
+    quotes = json.loads((DATA / "quotes.json").read_text())
+    src.write_text(json.dumps(quotes))
+    out = tmp_path / "out"
+
+    assert build_quotes.build(src, out, jobs=1)["rebuilt"] == 24
+    first = _hours(out)
+    assert build_quotes.build(src, out, jobs=1)["rebuilt"] == 0
+
+    quotes["07:01"]["title"][0] = "Edited"
+    src.write_text(json.dumps(quotes))
+    assert build_quotes.build(src, out, jobs=1)["rebuilt"] == 1
+    edited = _hours(out)
+    assert [n for n in first if first[n] != edited[n]] == ["07.json.gz"]
+
+    (out / "03.json.gz").unlink()
+    assert build_quotes.build(src, out, jobs=1)["rebuilt"] == 1
+    assert build_quotes.build(src, out, jobs=1, force=True)["rebuilt"] == 24
+    assert _hours(out) == edited
+
+
+def test_csv_split(tmp_path):
+    rows = [
+        ("00:01", "one minute past midnight", "At One Minute Past Midnight we left.", "T1", "A1", "sfw"),
+        ("00:01", "00:01", "It was 00:01, then 00:01 again", "T2", "A2", "nsfw"),
+        ("13:30", "half past one", "İt was Half past one.", "T3", "A3", "unknown"),
+    ]
+    csv = tmp_path / "quotes.csv"
+    csv.write_text("\n".join("|".join(r) for r in rows) + "\n", encoding="utf-8")
+    combined = tmp_path / "all.json"
+    r = build_quotes.build(csv, tmp_path / "out", jobs=1, combined=combined)
+    assert r["quotes"] == 3
+
+    q = json.loads(combined.read_text())
+    assert q["00:01"]["prefix"] == ["At ", "It was "]
+    assert q["00:01"]["suffix"] == [" we left.", ", then 00:01 again"]
+    assert q["00:01"]["annot"] == ["one minute past midnight", "00:01"]
+    assert q["13:30"]["prefix"] == ["İt was "]
+    assert q["13:30"]["suffix"] == ["."]
+    assert list(q["00:01"]) == ["annot", "title", "author", "nsfw", "prefix", "suffix"]
+    hour = json.loads(gzip.decompress((tmp_path / "out" / "13.json.gz").read_bytes()))
+    assert hour == {"13:30": q["13:30"]}
+
+
+def test_csv_missing_annot(tmp_path):
+    csv = tmp_path / "quotes.csv"
+    csv.write_text("02:00|two o'clock|It was late.|T|A|sfw\n")
+    with pytest.raises(ValueError, match="02:00"):
+        build_quotes.read_source(csv)
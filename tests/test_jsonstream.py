@@ -0,0 +1,99 @@
+"""Tests for the streaming JSON selector."""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+import jsonstream
+
+WEATHER = (Path(__file__).parent / "data" / "weather.json").read_bytes()
+FIELDS = (
+    "current.temperature_2m",
+    "current.weather_code",
+    "daily.time[0..2]",
+    "daily.temperature_2m_max[1]",
+)
+
+
+@pytest.mark.parametrize("bufsize", [1, 3, 64, 4096])
+def test_select_weather(bufsize):
+    out = jsonstream.select(io.BytesIO(WEATHER).read, FIELDS, bufsize)
+    full = json.loads(WEATHER)
+    assert out == {
+        "current": {
+            "temperature_2m": full["current"]["temperature_2m"],
+            "weather_code": full["current"]["weather_code"],
+        },
+        "daily": {
+            "time": full["daily"]["time"][:3],
+            "temperature_2m_max": [full["daily"]["temperature_2m_max"][1]],
+        },
+    }
+
+
+def test_whole_subtree_and_escapes():
+    doc = {
+        "skip": {"deep": [1, {"x": "a\"]}"}, [], {}], "s": "\\u00e9"},
+        "keep": {"s": "café \"q\" \\ \n \U0001f600", "n": [-1.5e3, 0, True, False, None]},
+    }
+    raw = json.dumps(doc).encode()
+    for bufsize in (1, 2, 7, 1000):
+        assert jsonstream.select(io.BytesIO(raw).read, ("keep",), bufsize) == {"keep": doc["keep"]}
+
+
+def test_missing_fields_are_absent():
+    out = jsonstream.select(io.BytesIO(WEATHER).read, ("current.nope", "nothing.here"))
+    assert out == {"current": {}}
+
+
+def test_truncated_input_raises():
+    with pytest.raises(ValueError):
+        jsonstream.select(io.BytesIO(WEATHER[:200]).read, FIELDS)
+
+
+def test_select_from_buffer():
+    buf = bytearray(WEATHER) + b"stale tail from a reused buffer"
+    view = memoryview(buf)[: len(WEATHER)]
+    out = jsonstream.select(view, ("current.temperature_2m", "daily.time[0]"))
+    full = json.loads(WEATHER)
+    assert out == {
+        "current": {"temperature_2m": full["current"]["temperature_2m"]},
+        "daily": {"time": full["daily"]["time"][:1]},
+    }
+
+
+def test_items_one_member_at_a_time():
+    doc = {"07:00": {"a": [1, 2]}, "07:01": "x", "07:02": []}
+    got = list(jsonstream.items(io.BytesIO(json.dumps(doc).encode()).read, 5))
+    assert got == list(doc.items())
+    assert list(jsonstream.items(b" {} ")) == []
+
+
+def _fed(raw, fields, size):
+    sel = jsonstream.Selector(fields)
+    for i in range(0, len(raw), size):
+        sel.feed(raw[i : i + size])
+    return sel.result()
+
+
+@pytest.mark.parametrize("size", [1, 3, 64, 4096])
+def test_selector_matches_select(size):
+    assert _fed(WEATHER, FIELDS, size) == jsonstream.select(WEATHER, FIELDS)
+    doc = {
+        "skip": {"deep": [1, {"x": "a\"]}"}, [], {}], "s": "\\u00e9"},
+        "ke\\y": [1, 2],
+        "keep": {"s": "café \"q\" \\ \n \U0001f600", "n": [-1.5e3, 0, True, False, None]},
+        "n": 7,
+    }
+    raw = json.dumps(doc).encode()
+    fields = ("keep", "n", "ke\\y[1]", "skip.deep")
+    assert _fed(raw, fields, size) == jsonstream.select(raw, fields)
+
+
+def test_selector_truncated_input_raises():
+    with pytest.raises(ValueError):
+        _fed(WEATHER[:200], FIELDS, 64)
@@ -5,6 +5,8 @@ import sys
 from pathlib import Path
 from unittest.mock import MagicMock
 
+import pytest
+
 # Add src/ to path (at end so CPython's requests is found first)
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
@@ -16,6 +18,13 @@ sys.modules["env"] = env_mock
 import llm
 
 
+@pytest.fixture(autouse=True)
+def device_requests(monkeypatch, urequests):
+    """llm reads replies with src/requests.py's Response.content_into."""
+    monkeypatch.setattr(llm, "requests", urequests)
+    monkeypatch.setattr(llm, "_session", None)
+
+
 def test_prompt_basic():
     """Basic prompt returns a non-empty string."""
     reply = llm.prompt("Say hello in 5 words or less")
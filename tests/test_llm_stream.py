@@ -0,0 +1,202 @@
+"""Tests for llm against a local OpenRouter stand-in (plain and server-sent events)."""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+sys.modules.setdefault("env", MagicMock(OPENROUTER_API_KEY=""))
+
+TOKENS = ["Once ", "a snail ", "raced a ", "glacier", " and—sur", "prisingly— ", "lost.\nThe end."]
+DELAY = 0.1
+_sleep = time.sleep  # the server keeps real time while sim's clock is installed
+
+
+class SSEHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path == "/bad":
+            err = json.dumps({"error": {"message": "No credits", "code": 402}}, separators=(",", ":")).encode()
+            self.send_response(402)
+            self.send_header("Content-Length", str(len(err)))
+            self.end_headers()
+            self.wfile.write(err)
+            return
+        if not body.get("stream"):
+            reply = {"choices": [{"message": {"role": "assistant", "content": "".join(TOKENS)}}]}
+            out = json.dumps(reply, ensure_ascii=False).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(out)))
+            self.end_headers()
+            self.wfile.write(out)
+            return
+        chunked = self.request_version == "HTTP/1.1"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.close_connection = True
+        self.end_headers()
+
+        def send(data):
+            if chunked:
+                data = b"%x\r\n%s\r\n" % (len(data), data)
+            self.wfile.write(data)
+            self.wfile.flush()
+
+        send(b": OPENROUTER PROCESSING\n\n")
+        for tok in TOKENS:
+            _sleep(DELAY)
+            event = {"choices": [{"delta": {"content": tok}}]}
+            line = b"data: " + json.dumps(event).encode() + b"\n\n"
+            send(line[:9])  # split events across writes
+            send(line[9:])
+        if self.path == "/long":
+            # web search citations: one event well over requests' 1 KB read
+            cite = {"type": "url_citation", "url_citation": {"url": "https://example.com/", "content": "x" * 1500}}
+            event = {"choices": [{"delta": {"content": "", "annotations": [cite]}}]}
+            send(b"data: " + json.dumps(event).encode() + b"\n\n")
+        send(b'data: {"choices": [], "usage": {"total_tokens": 9}}\n\ndata: [DONE]\n\n')
+        if chunked:
+            self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def llm(monkeypatch, urequests):
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), SSEHandler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    sys.modules.pop("arequests", None)
+    import llm
+
+    monkeypatch.setattr(llm, "requests", urequests)
+    monkeypatch.setattr(llm, "_session", None)
+    monkeypatch.setattr(llm, "_ENDPOINT", "http://127.0.0.1:%d/v1" % srv.server_port)
+    yield llm
+    srv.shutdown()
+    srv.server_close()
+
+
+def _recorder():
+    start = time.monotonic()
+    got = []
+    return got, lambda text: got.append((time.monotonic() - start, text))
+
+
+def test_prompt_streams_deltas(llm):
+    got, on_delta = _recorder()
+    reply = llm.prompt("hi", on_delta=on_delta)
+    assert reply == "".join(TOKENS)
+    assert [t for _, t in got] == TOKENS
+    assert got[0][0] < got[-1][0] - DELAY * 4  # first words well before the end
+
+
+def test_prompt_async_streams_deltas(llm):
+    got, on_delta = _recorder()
+    reply = asyncio.run(llm.prompt_async("hi", on_delta=on_delta))
+    assert reply == "".join(TOKENS)
+    assert got[0][0] < got[-1][0] - DELAY * 4
+
+
+def test_prompt_reads_into_shared_buffer(llm):
+    buf = llm._rxbuf
+    assert llm.prompt("hi") == "".join(TOKENS)
+    assert llm.prompt("again") == "".join(TOKENS)
+    assert llm._rxbuf is buf
+    assert llm._session.stats["hits"] == 1
+
+
+def test_prompt_streams_events_longer_than_a_read(llm, monkeypatch):
+    monkeypatch.setattr(llm, "_ENDPOINT", llm._ENDPOINT.replace("/v1", "/long"))
+    got, on_delta = _recorder()
+    assert llm.prompt("hi", on_delta=on_delta) == "".join(TOKENS)
+    assert [t for _, t in got] == TOKENS
+
+
+def test_stream_error_body(llm, monkeypatch):
+    monkeypatch.setattr(llm, "_ENDPOINT", llm._ENDPOINT.replace("/v1", "/bad"))
+    with pytest.raises(OSError, match="No credits"):
+        llm.prompt("hi", on_delta=print)
+    with pytest.raises(OSError, match="No credits"):
+        asyncio.run(llm.prompt_async("hi", on_delta=print))
+
+
+def test_story_paints_lines_as_they_complete(llm, device, monkeypatch):
+    import app_story
+
+    display = device.display
+    app_story.init(*device.args)
+
+    painted = []  # (time, line) for each story line drawn mid-stream
+    start = time.monotonic()
+    text = display.text
+
+    def spy(s, px, y, *rest):
+        if app_story._loading and app_story._TEXT_Y <= y < app_story._TEXT_BOTTOM:
+            painted.append((time.monotonic() - start, s))
+        return text(s, px, y, *rest)
+
+    monkeypatch.setattr(display, "text", spy)
+    device.press("X")
+    device.clock.advance(1)
+    app_story.update(*device.args)
+
+    assert app_story._story == "".join(TOKENS)
+    lines = [s for _, s in painted if s != "Searching..."]
+    assert lines == ["Once a snail raced a glacier", "and—surprisingly— lost."]  # 300 px of bitmap8 at scale 2
+    first = next(t for t, line in painted if line == lines[0])
+    assert painted[-1][0] - first > DELAY  # line 1 was up before the reply ended
+
+
+def test_wrap_keeps_unfinished_line(device, monkeypatch):
+    import app_story
+
+    d = device.panel
+    monkeypatch.setattr(d, "measure_text", lambda text, scale: len(text) * 6 * scale)
+    assert app_story._wrap(d, "ab cd", 60) == ([], "ab cd")
+    assert app_story._wrap(d, "ab cd ef", 60) == (["ab cd"], "ef")
+    assert app_story._wrap(d, "ab  \n  cd ", 60) == (["ab  "], "cd ")
+    assert app_story._wrap(d, "abcdefgh ij", 60) == (["abcdefgh"], "ij")
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_extract_content_escapes(ensure_ascii, monkeypatch):
+    import llm
+
+    reply = json.loads((Path(__file__).parent / "data" / "openrouter_reply.json").read_text())
+    content = 'tab\t "quoted" back\\slash /’ é 🦦\nend\\'
+    reply["choices"][0]["message"]["content"] = content
+    raw = json.dumps(reply, ensure_ascii=ensure_ascii)
+    assert llm._extract_content(raw) == content
+    buf = bytearray(raw.encode()) + b'stale "content":"x"'
+    assert llm._extract_content(buf, len(raw.encode())) == content
+    # content_into()'s view, searched in windows smaller than most keys
+    monkeypatch.setattr(llm, "_FIND_STEP", 5)
+    view = memoryview(buf)[: len(raw.encode())]
+    assert llm._extract_content(view) == content
+    assert llm._extract_content(memoryview(buf), len(view)) == content
+
+
+def test_extract_content_lone_surrogate_and_errors():
+    import llm
+
+    assert llm._extract_content('{"choices":[{"message":{"content":"a\\ud83eb"}}]}') == "a�b"
+    with pytest.raises(OSError, match='Bad "key"'):
+        llm._extract_content(b'{"error": {"message": "Bad \\"key\\"", "code": 401}}')
+    with pytest.raises(OSError, match='Bad "key"'):
+        llm._extract_content(memoryview(b'{"error": {"message": "Bad \\"key\\"", "code": 401}}'))
+    with pytest.raises(OSError, match="Empty response"):
+        llm._extract_content('{"choices":[{"message":{"content": null}}]}')
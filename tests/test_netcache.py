@@ -0,0 +1,133 @@
+"""Tests for the shared DNS/TLS cache against a local self-signed TLS server."""
+
+import importlib
+import json
+import socket
+import ssl
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+import netcache
+import phttp
+
+CERT = Path(__file__).parent / "data" / "localhost.pem"
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self._reply({"path": self.path})
+
+    def do_POST(self):
+        self._reply(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+
+    def _reply(self, obj):
+        body = json.dumps(obj).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def tls_server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    srv.daemon_threads = True
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ctx.load_cert_chain(CERT)
+    ctx.maximum_version = ssl.TLSVersion.TLSv1_2  # session is ready right after the handshake
+    srv.socket = ctx.wrap_socket(srv.socket, server_side=True)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    srv.url = "https://localhost:%d" % srv.server_port
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    importlib.reload(netcache)  # zero the counters, same module object
+    yield
+    netcache.clear()
+
+
+def test_resolve_caches_hits_and_failures(monkeypatch):
+    calls = []
+    real = socket.getaddrinfo
+
+    def counting(host, *args):
+        calls.append(host)
+        if host == "nowhere.invalid":
+            raise OSError(-2, "Name or service not known")
+        return real(host, *args)
+
+    monkeypatch.setattr(socket, "getaddrinfo", counting)
+    a = netcache.resolve("localhost", 80)
+    assert netcache.resolve("localhost", 80) is a
+    for _ in range(2):
+        with pytest.raises(OSError):
+            netcache.resolve("nowhere.invalid", 80)
+    assert calls == ["localhost", "nowhere.invalid"]
+    assert netcache.stats()["dns_hits"] == 2
+    assert netcache.stats()["dns_misses"] == 2
+
+    monkeypatch.setattr(netcache, "TTL", -1)
+    netcache.forget("localhost", 80)
+    netcache.resolve("localhost", 80)
+    netcache.resolve("localhost", 80)
+    assert calls.count("localhost") == 3  # expired entries are looked up again
+
+
+def test_resolve_bounded(monkeypatch):
+    monkeypatch.setattr(socket, "getaddrinfo", lambda host, port, *a: [(2, 1, 6, "", (host, port))])
+    for port in range(20):
+        netcache.resolve("h", port)
+    assert len(netcache._dns) <= netcache._MAX_HOSTS
+
+
+def test_tls_context_and_session_shared(urequests, tls_server):
+    assert urequests.get(tls_server.url + "/a").json() == {"path": "/a"}
+    ctx = netcache.context()
+    assert urequests.get(tls_server.url + "/b").json() == {"path": "/b"}
+    assert phttp.post_json(tls_server.url + "/c", body={"n": 1}) == {"n": 1}
+    assert netcache.context() is ctx
+
+    st = netcache.stats()
+    assert st["dns_misses"] == 1
+    assert st["dns_hits"] == 2
+    assert st["handshakes"] == 3
+    assert st["resumed"] == 2  # second request and phttp reuse the first session
+    assert st["handshake_ms_total"] >= st["handshake_ms"] >= 0
+
+
+def test_failed_connect_forgets_address(urequests):
+    s = socket.socket()
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()  # nothing listens there now
+    with pytest.raises(OSError):
+        urequests.get("http://127.0.0.1:%d/" % port)
+    assert ("127.0.0.1", port) not in netcache._dns
+
+
+def test_handshake_ms_across_ticks_wrap(device, monkeypatch):
+    import sim
+    from sim.clock import TICKS_PERIOD
+
+    clock = sim.install(sim.Clock(ticks=TICKS_PERIOD - 5))
+
+    class SlowContext:
+        def wrap_socket(self, sock, server_hostname=None):
+            clock.advance(20)
+            return sock
+
+    monkeypatch.setattr(netcache, "_ctx", SlowContext())
+    netcache.wrap(object(), "localhost")
+    assert netcache.stats()["handshake_ms"] == 20
@@ -0,0 +1,55 @@
+"""Tests for pacing.py's frame grid, on the simulated clock."""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from pacing import Pacer
+
+
+def test_late_frames_stay_on_the_grid(device):
+    clock = device.clock
+    p = Pacer(16)
+    start = clock.ticks_ms()
+    assert p.delay(start, 16) == 16
+    # The next frame starts 3 ms late and takes 5 ms: still due at 32
+    clock.advance(19)
+    start = clock.ticks_ms()
+    clock.advance(5)
+    assert p.delay(start, 16) == 13
+    clock.advance(8)  # sleep to 19 + 13
+    start = clock.ticks_ms()
+    assert p.delay(start, None) == 16  # None is a frame too
+
+
+def test_missed_frame_restarts_the_grid(device):
+    clock = device.clock
+    p = Pacer(16)
+    start = clock.ticks_ms()
+    p.delay(start, 16)
+    clock.advance(16)
+    start = clock.ticks_ms()
+    clock.advance(40)  # a frame that took 40 ms
+    assert p.delay(start, 16) == 40  # run again now, not twice to catch up
+    start = clock.ticks_ms()
+    assert p.delay(start, 16) == 16
+
+
+def test_other_delays_leave_the_grid(device):
+    clock = device.clock
+    p = Pacer(16)
+    start = clock.ticks_ms()
+    assert p.delay(start, 200) == 200  # e.g. a title screen
+    clock.advance(203)
+    start = clock.ticks_ms()
+    assert p.delay(start, 16) == 13  # the grid restarted at 200
+
+
+def test_early_wake_restarts_the_grid(device):
+    clock = device.clock
+    p = Pacer(16)
+    start = clock.ticks_ms()
+    p.delay(start, 200)
+    clock.advance(50)  # X pressed on the title screen: the game starts
+    start = clock.ticks_ms()
+    assert p.delay(start, 16) == 16
@@ -0,0 +1,111 @@
+"""Tests for perf.py's rings and main.py's perf overlay (under sim/)."""
+
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+import perf
+
+
+def test_ring_keeps_last_samples():
+    r = perf.Ring(10)
+    assert r.stats() is None
+    for v in range(1, 26):
+        r.add(v)
+    assert r.count == 25
+    assert r.stats() == (20, 24, 25)  # only 16..25 are held
+    r.clear()
+    assert r.stats() is None
+
+
+def test_record_and_dump(capsys, monkeypatch):
+    monkeypatch.setattr(perf, "_apps", {})
+    for i in range(100):
+        perf.record("Pong", 1000 + i, 500, 0 if i % 10 else 64)
+    s = perf.summary("Pong")
+    assert s["n"] == 100
+    assert s["update"] == (1067, 1095, 1099)
+    assert s["heap"] == (0, 64, 64)
+    perf.dump()
+    assert "perf Pong: n=100 update_us 1067/1095/1099 push_us 500/500/500 heap_b 0/64/64" in capsys.readouterr().out
+
+
+def _long_press_a(clock, at):
+    from sim import machine
+
+    clock.at(at, lambda: machine.drive(12, 0))
+    clock.at(at + 1200, lambda: machine.drive(12, 1))
+
+
+def test_long_press_toggles_overlay_in_main():
+    sys.path.append(str(Path(__file__).parent.parent))
+    import sim
+
+    panels = []
+
+    def setup(clock):
+        _long_press_a(clock, 2000)
+        clock.at(5000, lambda: panels.append(sys.modules["main"].display._d.panel.copy()))
+        _long_press_a(clock, 7000)
+
+    tracemalloc.start()
+    try:
+        g = sim.run_main(10_000, setup=setup)
+        p = g["perf"]
+        assert not p.enabled  # toggled on, then off again
+        assert g["current_app_idx"] == 0  # a long press doesn't switch
+        s = p.summary("Clock")
+        assert s["n"] > 0
+        assert s["heap"][2] > 0  # the clock formats a string per update
+        # While on, the overlay box was on the panel
+        box = panels[0][perf._OY : perf._OY + perf._OH, perf._OX : perf._OX + perf._OW]
+        assert (box == g["colors"]["YELLOW"]).any()
+    finally:
+        tracemalloc.stop()
+        sim.uninstall()
+
+
+def test_long_press_leaves_the_app_alone():
+    """The timer starts on X: the gesture must not reach it."""
+    sys.path.append(str(Path(__file__).parent.parent))
+    import sim
+    from sim import machine
+
+    seen = {}
+
+    def setup(clock):
+        clock.at(3000, lambda: sys.modules["main"].switch_app(3))  # after the boot
+        _long_press_a(clock, 4000)
+        clock.at(6000, lambda: seen.update(running=sys.modules["app_timer"]._running))
+        clock.at(7000, lambda: machine.drive(14, 0))  # X still starts it
+        clock.at(7100, lambda: machine.drive(14, 1))
+
+    try:
+        g = sim.run_main(8000, setup=setup)
+        assert g["perf"].overlay
+        assert g["app_names"][g["current_app_idx"]] == "Timer"
+        assert seen == {"running": False}
+        assert sys.modules["app_timer"]._running
+    finally:
+        sim.uninstall()
+
+
+def test_overlay_on_every_frame_of_a_full_redraw_app(device):
+    """Pong clears the screen every frame; each pushed frame still has the box."""
+    perf.refresh("Breakout")
+    device.display.overlay = lambda s: perf.paint_overlay(s, device.colors)
+    pong = device.load("app_pong")
+    device.press("X")
+    panel = device.panel
+    yellow = device.colors["YELLOW"]
+    frames = 0
+    for _ in range(60):
+        pushed = panel.updates
+        device.run(pong, pong._FRAME_MS)
+        if panel.updates == pushed:
+            continue
+        frames += 1
+        box = panel.panel[perf._OY : perf._OY + perf._OH, perf._OX : perf._OX + perf._OW]
+        assert (box == yellow).any()
+    assert frames >= 30
@@ -0,0 +1,270 @@
+"""Tests for app_pong (Breakout), run on the simulated board."""
+
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+
+def _start(device):
+    pong = device.load("app_pong")
+    device.press("X")
+    device.run(pong, 100)
+    return pong
+
+
+def _brick_centre(pong, row, col):
+    return (pong._BRICK_TOP + row * pong._BRICK_DY + pong._BRICK_H // 2,
+            pong._brick_x0 + col * pong._BRICK_DX + pong._BRICK_W // 2)
+
+
+def test_wall_drawn_from_row_bitmasks(device):
+    pong = _start(device)
+    assert list(pong._alive) == [pong._ROW_FULL] * pong._BRICK_ROWS
+    pong._alive[1] &= ~(1 << 3)
+    pong._alive[4] = 0
+    device.step(pong)
+    fb = device.panel.fb
+    for row in range(pong._BRICK_ROWS):
+        pen = device.colors[pong._BRICK_COLORS[row]]
+        for col in range(pong._BRICK_COLS):
+            standing = (row, col) != (1, 3) and row != 4
+            assert (fb[_brick_centre(pong, row, col)] == pen) == standing, (row, col)
+
+
+def _launch(device, pong, x, y, dx, dy):
+    """Put the ball at (x, y) moving (dx, dy) px per step, then run an
+    update() one physics step later."""
+    pong._ball_x, pong._ball_y = x << pong._FP, y << pong._FP
+    pong._ball_dx, pong._ball_dy = dx << pong._FP, dy << pong._FP
+    pong._acc_us = 0
+    pong._last_us = device.clock.ticks_us()
+    steps = pong._steps
+    device.clock.advance_us(pong._STEP_US)
+    device.step(pong)
+    assert pong._steps == steps + 1
+
+
+def _brick_left_top(pong, row, col):
+    return pong._brick_x0 + col * pong._BRICK_DX, pong._BRICK_TOP + row * pong._BRICK_DY
+
+
+def test_ball_knocks_out_one_brick(device):
+    pong = _start(device)
+    x, y = _brick_left_top(pong, 4, 2)
+    _launch(device, pong, x + 10, y + pong._BRICK_H + 1, 0, -3)
+    assert pong._alive[4] == pong._ROW_FULL & ~(1 << 2)
+    assert pong._bricks_left == pong._BRICK_ROWS * pong._BRICK_COLS - 1
+    assert pong._score == 1 and pong._score_text == "1"
+    assert pong._ball_dy > 0  # off the bottom face
+    assert pong._ball_y >> pong._FP >= y + pong._BRICK_H
+
+
+def test_fast_ball_does_not_tunnel(device):
+    pong = _start(device)
+    x, y = _brick_left_top(pong, 4, 5)
+    # 40 px in one update would jump clean over a 10 px brick
+    _launch(device, pong, x + 10, y + pong._BRICK_H + 2, 0, -40)
+    assert pong._alive[4] == pong._ROW_FULL & ~(1 << 5)
+    assert list(pong._alive[:4]) == [pong._ROW_FULL] * 4
+    assert pong._ball_dy > 0
+
+
+def test_side_hit_bounces_horizontally(device):
+    pong = _start(device)
+    pong._alive[4] = 1 << 4  # a lone brick, approached from its left
+    x, y = _brick_left_top(pong, 4, 4)
+    _launch(device, pong, x - pong._ball_size - 1, y + 1, 3, 0)
+    assert pong._alive[4] == 0
+    assert pong._ball_dx < 0 and pong._ball_dy == 0
+    assert pong._ball_x >> pong._FP <= x - pong._ball_size
+
+
+def test_several_bricks_in_one_update(device):
+    pong = _start(device)
+    x, y = _brick_left_top(pong, 4, 3)
+    # Straddling the gap between bricks 2 and 3: both go
+    _launch(device, pong, x - pong._ball_size // 2, y + pong._BRICK_H + 1, 0, -3)
+    assert pong._alive[4] == pong._ROW_FULL & ~(0b11 << 2)
+    assert pong._score == 2
+
+
+class FloatBall:
+    """app_pong's ball as it was in float maths, kept as the reference the
+    fixed-point version is held to."""
+
+    def __init__(self, pong, width, height):
+        """Starting from pong's current state."""
+        self.p = pong
+        self.width, self.height = width, height
+        self.alive = bytearray(pong._alive)
+        one = pong._ONE
+        self.x, self.y = pong._ball_x / one, pong._ball_y / one
+        self.dx, self.dy = pong._ball_dx / one, pong._ball_dy / one
+        self.speed = pong._speed / one
+
+    def knock(self, bx, by):
+        p = self.p
+        n = 0
+        for row in range(p._BRICK_ROWS):
+            y = p._BRICK_TOP + row * p._BRICK_DY
+            if by + p._ball_size <= y or by >= y + p._BRICK_H:
+                continue
+            for col in range(p._BRICK_COLS):
+                x = p._brick_x0 + col * p._BRICK_DX
+                if self.alive[row] & (1 << col) and bx + p._ball_size > x and bx < x + p._BRICK_W:
+                    self.alive[row] &= ~(1 << col)
+                    n += 1
+        self.speed += 0.05 * (1000 / p._HZ) / 16 * n  # 0.05 px per 16 ms
+        return n
+
+    def step(self, paddle_x):
+        """One physics step."""
+        p = self.p
+        mx, my = self.dx, self.dy
+        steps = int(max(abs(mx), abs(my)) / p._SWEEP_STEP) + 1
+        sx, sy = mx / steps, my / steps
+        for _ in range(steps):
+            self.x += sx
+            if self.knock(int(self.x), int(self.y)):
+                self.x -= sx
+                sx, self.dx = -sx, -self.dx
+            self.y += sy
+            if self.knock(int(self.x), int(self.y)):
+                self.y -= sy
+                sy, self.dy = -sy, -self.dy
+        if self.x <= 0:
+            self.x, self.dx = 0.0, abs(self.dx)
+        elif self.x >= self.width - p._ball_size:
+            self.x, self.dx = float(self.width - p._ball_size), -abs(self.dx)
+        if self.y <= 0:
+            self.y, self.dy = 0.0, abs(self.dy)
+        top = self.height - p._PADDLE_Y_OFFSET - p._paddle_h
+        if (self.dy > 0
+                and top <= self.y + p._ball_size <= top + p._paddle_h + 4
+                and self.x + p._ball_size >= paddle_x
+                and self.x <= paddle_x + p._paddle_w):
+            self.dy = -abs(self.dy)
+            self.y = float(top - p._ball_size)
+            hit = (self.x + p._ball_size / 2 - paddle_x) / p._paddle_w
+            self.dx = self.speed * (hit - 0.5) * 2
+
+
+def test_fixed_point_tracks_float_reference(device):
+    pong = _start(device)
+    ref = FloatBall(pong, device.WIDTH, device.HEIGHT)
+    one = pong._ONE
+    rng = random.Random(7)
+    frames = returns = 0
+    while pong._bricks_left and frames < 5000:
+        # Same inputs to both: frame time, and a paddle that roughly
+        # follows the ball, off centre by a random amount
+        dt = rng.choice((16, 16, 16, 17, 20, 33))
+        px = (pong._ball_x >> pong._FP) - pong._paddle_w // 2 + rng.randint(-20, 20)
+        px = max(0, min(px, device.WIDTH - pong._paddle_w))
+        pong._paddle_x = px
+        falling = ref.dy > 0
+        device.clock.advance(dt)
+        steps = pong._steps
+        device.step(pong)
+        for _ in range(pong._steps - steps):
+            ref.step(px)
+        frames += 1
+        assert pong._lives == 3, "the scripted paddle missed"
+        assert abs(pong._ball_x / one - ref.x) < 1, frames
+        assert abs(pong._ball_y / one - ref.y) < 1, frames
+        assert pong._alive == ref.alive, frames
+        for v in (pong._ball_x, pong._ball_y, pong._ball_dx, pong._ball_dy, pong._speed):
+            assert type(v) is int and -(1 << 30) <= v < 1 << 30  # a MicroPython small int
+        if falling and ref.dy < 0 and pong._ball_dy < 0:
+            # Off the paddle. Its angle turns a position difference into a
+            # growing direction difference, for any arithmetic, so check
+            # the angle and compare the next flight from a common start
+            assert abs(pong._ball_dx / one - ref.dx) < 0.01, frames
+            ref.x, ref.y = pong._ball_x / one, pong._ball_y / one
+            ref.dx, ref.dy = pong._ball_dx / one, pong._ball_dy / one
+            returns += 1
+    assert not pong._bricks_left
+    assert returns > 10
+
+
+def test_fixed_step_and_frame_pacing(device):
+    from sim.picographics import SPI_HZ
+
+    # Pushes take as long as the SPI transfer: a full frame is ~20 ms
+    device.panel.spi_hz = SPI_HZ
+    pong = _start(device)
+    # A paddle the width of the screen and no bricks (no row flashes): the
+    # ball bounces for good
+    pong._paddle_w = device.WIDTH
+    pong._paddle_x = 0
+    pong._alive[:] = bytes(pong._BRICK_ROWS)
+    steps = pong._steps
+    device.frames_at.clear()
+    device.run(pong, 2000)
+    # 120 physics steps a second, whatever the frame rate
+    assert abs(pong._steps - steps - 240) <= 1
+    iv = sorted(device.intervals())
+    mid = iv[len(iv) // 2]
+    assert 19_000 < mid < 21_000  # push-bound: ~50 fps, not 60
+    jitter = sorted(abs(i - mid) for i in iv)[(len(iv) - 1) * 95 // 100]
+    assert jitter <= 1000  # p95, us
+
+
+def _frame_peaks(device, pong, n=20):
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(n):
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            device.step(pong)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+            device.clock.advance(pong._FRAME_MS)
+    finally:
+        tracemalloc.stop()
+    return sorted(peaks)[n // 2]
+
+
+def test_frame_heap_does_not_grow_with_the_wall(device):
+    # Drawing off, so only update()'s own allocations are seen
+    device.panel.draw = False
+    device.display = device.panel
+    pong = _start(device)
+    full = _frame_peaks(device, pong)
+    for row in range(pong._BRICK_ROWS):
+        pong._alive[row] = 0
+    pong._alive[0] = 1
+    pong._bricks_left = 1
+    pong._reset_ball(device.WIDTH, device.HEIGHT)
+    one = _frame_peaks(device, pong)
+    assert full == one
+    # What is left is CPython boxing ints above 256 (the fixed-point ball),
+    # which MicroPython keeps as small ints; none of it is per brick
+    assert full <= 512
+
+
+def test_headless_replay_is_exact():
+    # No device fixture: play() needs no display or clock
+    import app_pong as pong
+
+    log = bytearray()
+    steps = pong.play(seed=3, log=log)
+    assert not pong._bricks_left and pong._game_over  # the autopilot wins
+    assert len(log) == steps and set(log) <= {pong.LEFT, pong.STILL, pong.RIGHT}
+    end = (pong._score, pong._lives, pong._ball_x, pong._ball_y, pong._ball_dx, pong._ball_dy, pong._paddle_x)
+    again = bytearray()
+    assert pong.play(inputs=log, log=again) == steps
+    assert again == log
+    assert (pong._score, pong._lives, pong._ball_x, pong._ball_y, pong._ball_dx, pong._ball_dy, pong._paddle_x) == end
+
+
+def test_headless_script_loses_balls():
+    import app_pong as pong
+
+    # A paddle parked at the left misses everything
+    steps = pong.play(inputs=bytes([pong.LEFT]) * 10_000)
+    assert steps < 10_000
+    assert pong._lives == 0 and pong._game_over and pong._bricks_left
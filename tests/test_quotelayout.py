@@ -0,0 +1,69 @@
+"""Host-side checks of the pre-wrapped quote layouts against the bitmap8 table."""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+import quotelayout as ql
+
+QUOTES = Path(__file__).parent.parent / "data" / "quotes_gz"
+
+
+def _all_quotes():
+    for hour in range(24):
+        for q in json.load(gzip.open(QUOTES / ("%02d.json.gz" % hour))).values():
+            for i in range(len(q["annot"])):
+                yield q["prefix"][i], q["annot"][i], q["suffix"][i]
+
+
+def test_table_covers_printable_ascii():
+    assert len(ql.ADVANCE) == 127 - 32
+    assert all(2 <= a <= ql.HEIGHT for a in ql.ADVANCE)
+    assert ql.width("Hi there", 2) == 2 * sum(ql.ADVANCE[ord(c) - 32] for c in "Hi there")
+
+
+def test_every_quote_fits_the_box():
+    scales = set()
+    for prefix, annot, suffix in _all_quotes():
+        text, a0, a1, scale, lines = ql.layout(prefix, annot, suffix)
+        scales.add(scale)
+        assert all(" " <= c <= "~" for c in text)
+        assert text[a0:a1] == ql.normalize(annot)
+        assert len(lines) * ql.LINE * scale - (ql.LINE - ql.HEIGHT) * scale <= ql.BOX_H
+        for start, end in lines:
+            line = text[start:end]
+            assert line == line.strip() and line
+            if " " in line:  # a lone over-long word may overhang
+                assert ql.width(line, scale) <= ql.BOX_W
+        if scale > 1:
+            # Nothing dropped, and it would not have fitted one size up
+            assert " ".join(text[s:e] for s, e in lines).split() == text.split()
+            up = ql.SCALES[ql.SCALES.index(scale) - 1] if scale != ql.SCALES[0] else None
+            if up:
+                assert len(ql.wrap(text, up)) * ql.LINE * up - (ql.LINE - ql.HEIGHT) * up > ql.BOX_H
+    assert len(scales) > 1
+
+
+def test_lines_are_greedy():
+    text = "aaaa bbbb cccc dddd"
+    w = ql.width("aaaa bbbb")
+    assert ql.wrap(text, 1, w) == [(0, 9), (10, 19)]
+    assert ql.wrap(text, 1, w - 1) == [(0, 4), (5, 9), (10, 14), (15, 19)]
+    assert ql.wrap("  x  ", 1) == [(2, 3)]
+
+
+@pytest.mark.parametrize(
+    "raw, ascii",
+    [("it’s “ten” — past…", "it's \"ten\" - past..."), ("café\tnoon", "cafe noon"), ("日", "?")],
+)
+def test_normalize(raw, ascii):
+    assert ql.normalize(raw) == ascii
+
+
+def test_advances_reads_the_display_font(device, monkeypatch):
+    monkeypatch.setattr(device.panel, "measure_text", lambda text, scale: 5 * scale)
+    assert ql.advances(device.panel) == bytes([5] * 95)
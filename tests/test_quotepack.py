@@ -0,0 +1,49 @@
+"""Tests for the binary quote pack against the hourly gz-JSON files."""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from quotelayout import layout, normalize
+from quotepack import QuotePack
+
+QUOTES = Path(__file__).parent.parent / "data" / "quotes_gz"
+
+
+def test_every_minute_matches_source(quote_pack):
+    pack = QuotePack(str(quote_pack))
+    try:
+        for hour in range(24):
+            src = json.load(gzip.open(QUOTES / ("%02d.json.gz" % hour)))
+            for m in range(60):
+                key = "%02d:%02d" % (hour, m)
+                got = pack.get(hour * 60 + m)
+                if key not in src:
+                    assert got == []
+                    continue
+                q = src[key]
+                assert got == [
+                    (q["nsfw"][i] == "nsfw", normalize(q["title"][i]), normalize(q["author"][i]))
+                    + layout(q["prefix"][i], q["annot"][i], q["suffix"][i])
+                    for i in range(len(q["annot"]))
+                ]
+    finally:
+        pack.close()
+
+
+def test_lookup_reads_one_small_block(quote_pack):
+    pack = QuotePack(str(quote_pack))
+    pack.get(7 * 60 + 1)
+    assert 0 < pack.bytes_read < 4096
+    pack.close()
+
+
+def test_not_a_pack(tmp_path):
+    bad = tmp_path / "x.pack"
+    bad.write_bytes(b"nope" * 10)
+    with pytest.raises(ValueError):
+        QuotePack(str(bad))
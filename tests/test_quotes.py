@@ -0,0 +1,123 @@
+"""Tests for the quote clock's hour cache and next-hour prefetch."""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+QUOTES = Path(__file__).parent.parent / "data" / "quotes_gz"
+
+
+@pytest.fixture
+def quotes(device, monkeypatch):
+    import sim
+
+    sys.modules.pop("app_quotes", None)
+    import app_quotes
+
+    monkeypatch.setattr(app_quotes, "_QUOTES_DIR", str(QUOTES))
+    monkeypatch.setattr(app_quotes, "_PACK_FILE", "no-such.pack")
+    clock = {"t": (2026, 10, 18, 7, 50, 0, 6, 291)}
+    monkeypatch.setattr(app_quotes, "local_time", lambda: clock["t"])
+    loads = []
+    real_load = app_quotes._load
+    # A minute's quotes take time to parse on the board; charge 1 ms each
+    monkeypatch.setattr(app_quotes, "_load", lambda h, into: loads.append(h) or sim.charge(real_load(h, into), 1000))
+    app_quotes.clock = clock
+    app_quotes.loads = loads
+    app_quotes.device = device
+    return app_quotes
+
+
+def _at(app, hour, minute, sec=0):
+    """update() at hour:minute:sec; returns its delay and the texts drawn."""
+    app.clock["t"] = (2026, 10, 18, hour, minute, sec, 6, 291)
+    panel = app.device.panel
+    panel.reset_stats()
+    delay = app.update(*app.device.args)
+    return delay, panel.texts
+
+
+def test_one_sfw_quote_per_minute(quotes):
+    from quotelayout import layout, normalize
+
+    raw = json.load(gzip.open(QUOTES / "07.json.gz"))
+    _at(quotes, 7, 50)
+    assert set(quotes._quotes) == set(raw)
+    for key, picked in quotes._quotes.items():
+        q = raw[key]
+        rows = [
+            (normalize(q["title"][i]), normalize(q["author"][i]))
+            + layout(q["prefix"][i], q["annot"][i], q["suffix"][i])
+            for i in range(len(q["annot"]))
+        ]
+        nsfw = [q["nsfw"][i] for i, r in enumerate(rows) if r == picked]
+        assert nsfw
+        if any(v != "nsfw" for v in q["nsfw"]):
+            assert "nsfw" not in nsfw
+
+
+def test_prefetch_then_swap(quotes, monkeypatch):
+    monkeypatch.setattr(quotes, "_STEP_US", 0)
+    quotes.init(*quotes.device.args)
+    delay, texts = _at(quotes, 7, 50)
+    assert texts[0] == "07:50"
+    assert quotes.loads == [7]
+    assert delay == 60_000
+
+    delay, _ = _at(quotes, 7, 56)
+    assert quotes._loader is None and delay == 60_000
+
+    delay, _ = _at(quotes, 7, 57)
+    assert quotes._next_hour == 8
+    steps = 0
+    while quotes._loader is not None:
+        assert delay == quotes._STEP_MS
+        delay, _ = _at(quotes, 7, 57, 1)
+        steps += 1
+    assert steps >= 55  # spread over many frames
+    assert len(quotes._next) >= 55
+    prefetched = quotes._next
+
+    # The hour change swaps in the prefetched dict without reading the file
+    delay, texts = _at(quotes, 8, 0)
+    assert quotes.loads == [7, 8]
+    assert quotes._quotes is prefetched
+    assert quotes._hour == 8 and quotes._next is None
+    _, _, text, a0, a1, scale, lines = quotes._quotes["08:00"]
+    assert "".join(texts[1:-1]) == "".join(text[s:e] for s, e in lines)
+    assert text[a0:a1] in texts
+
+    # A minute change is just a lookup
+    _at(quotes, 8, 1)
+    assert quotes.loads == [7, 8]
+
+
+def test_unfinished_prefetch_completed_at_swap(quotes, monkeypatch):
+    monkeypatch.setattr(quotes, "_STEP_US", 0)  # one minute per update()
+    _at(quotes, 7, 50)
+    _at(quotes, 7, 59, 59)
+    assert quotes._loader is not None
+    _at(quotes, 8, 0)
+    assert quotes.loads == [7, 8]
+    assert len(quotes._quotes) >= 55
+
+
+def test_missing_hour_file(quotes, monkeypatch, tmp_path):
+    monkeypatch.setattr(quotes, "_QUOTES_DIR", str(tmp_path))
+    _, texts = _at(quotes, 3, 0)
+    assert "No quote for this minute." in texts
+
+
+def test_pack_gives_same_quotes(quotes, monkeypatch, quote_pack):
+    _at(quotes, 7, 50)
+    from_gz = dict(quotes._quotes)
+    monkeypatch.setattr(quotes, "_PACK_FILE", str(quote_pack))
+    monkeypatch.setattr(quotes, "_QUOTES_DIR", "no-such-dir")
+    _at(quotes, 8, 0)
+    _at(quotes, 7, 0)
+    assert quotes._quotes == from_gz
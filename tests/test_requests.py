@@ -0,0 +1,199 @@
+"""Tests for src/requests.py against a local HTTP/1.1 server."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+BIG = bytes(range(256)) * 1024  # 256 KB
+
+
+def _chunks(path):
+    if path == "/chunked/small":
+        return [b"%d," % i for i in range(500)]
+    if path == "/chunked/large":
+        return [BIG[:100], BIG, b"x"]
+    if path == "/chunked/json":
+        body = json.dumps({"n": list(range(100))}).encode()
+        return [body[i : i + 7] for i in range(0, len(body), 7)]
+    return None
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.connections.add(self.connection)
+        chunks = _chunks(self.path)
+        if chunks is not None:
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for c in chunks:
+                self.wfile.write(b"%x;ext=1\r\n%s\r\n" % (len(c), c))
+            self.wfile.write(b"0\r\nX-Trailer: yes\r\n\r\n")
+            return
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.path == "/close":
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        n = int(self.headers["Content-Length"])
+        body = self.rfile.read(n)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    srv.daemon_threads = True
+    srv.connections = set()
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    srv.url = "http://127.0.0.1:%d" % srv.server_port
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_plain_request(urequests, server):
+    r = urequests.get(server.url + "/a")
+    assert r.status_code == 200
+    assert r.json() == {"path": "/a"}
+
+
+def test_post_json_unicode(urequests, server):
+    r = urequests.post(server.url + "/echo", json={"t": "naïve ☕"})
+    assert r.json() == {"t": "naïve ☕"}
+
+
+def test_session_reuses_connection(urequests, server):
+    s = urequests.Session()
+    for i in range(3):
+        r = s.get(server.url + "/%d" % i)
+        assert r.json() == {"path": "/%d" % i}
+    assert s.stats["misses"] == 1
+    assert s.stats["hits"] == 2
+    assert len(server.connections) == 1
+    s.close()
+
+
+def test_session_server_close_not_pooled(urequests, server):
+    s = urequests.Session()
+    assert s.get(server.url + "/close").json() == {"path": "/close"}
+    assert s._pool == {}
+    s.get(server.url + "/b").content
+    assert s.stats == {"hits": 0, "misses": 2, "reconnects": 0, "evictions": 0}
+    s.close()
+
+
+def test_session_reconnects_when_server_drops_socket(urequests, server):
+    s = urequests.Session()
+    s.get(server.url + "/a").content
+    # Server side closes the idle keep-alive connection
+    for c in list(server.connections):
+        c.shutdown(2)
+    time.sleep(0.05)
+    assert s.get(server.url + "/b").json() == {"path": "/b"}
+    assert s.stats["hits"] == 1
+    assert s.stats["reconnects"] == 1
+    s.close()
+
+
+def test_session_idle_timeout_evicts(urequests, server):
+    s = urequests.Session(idle_timeout=0)
+    s.get(server.url + "/a").content
+    time.sleep(1.1)
+    s.get(server.url + "/b").content
+    assert s.stats["evictions"] == 1
+    assert s.stats["misses"] == 2
+    s.close()
+
+
+def test_unread_response_not_pooled(urequests, server):
+    s = urequests.Session()
+    r = s.get(server.url + "/a")
+    r.close()
+    assert s._pool == {}
+    s.close()
+
+
+def test_chunked_small(urequests, server):
+    r = urequests.get(server.url + "/chunked/small")
+    assert r.text == "".join("%d," % i for i in range(500))
+
+
+def test_chunked_large_iter_content_is_bounded(urequests, server):
+    r = urequests.get(server.url + "/chunked/large")
+    total = bytearray()
+    for part in r.iter_content(4096):
+        assert 0 < len(part) <= 4096
+        total.extend(part)
+    assert total == BIG[:100] + BIG + b"x"
+
+
+def test_content_into_exact_fit_does_not_grow(urequests, server):
+    body = b"".join(_chunks("/chunked/small"))
+    s = urequests.Session()
+    buf = bytearray(len(body))
+    view = memoryview(buf)  # a caller's view from the last reply pins buf's size
+    assert s.get(server.url + "/chunked/small").content_into(buf) == body
+    assert len(buf) == len(body)
+    assert s.stats["hits"] == 0
+    assert s.get(server.url + "/a").json() == {"path": "/a"}
+    assert s.stats["hits"] == 1  # the chunked body was read to its end
+    view.release()
+    s.close()
+
+
+def test_chunked_json_and_keep_alive(urequests, server):
+    s = urequests.Session()
+    assert s.get(server.url + "/chunked/json").json() == {"n": list(range(100))}
+    # Chunked body has a known end, so the connection is reused
+    assert s.get(server.url + "/a").json() == {"path": "/a"}
+    assert s.stats["hits"] == 1
+    s.close()
+
+
+def test_content_into_reuses_buffer(urequests, server):
+    s = urequests.Session()
+    buf = bytearray(64)
+    body = s.get(server.url + "/a").content_into(buf)
+    assert bytes(body) == b'{"path": "/a"}'
+    del body
+    assert len(buf) == 64  # fitted, no growth
+    # Chunked body bigger than the buffer: grows in place, same object
+    body = s.get(server.url + "/chunked/large").content_into(buf)
+    assert body == BIG[:100] + BIG + b"x"
+    del body
+    size = len(buf)
+    assert s.get(server.url + "/chunked/small").content_into(buf) == "".join("%d," % i for i in range(500)).encode()
+    assert len(buf) == size
+    assert s.stats["hits"] == 2  # every body was read to its end and pooled
+    s.close()
+
+
+def test_readinto_bounded(urequests, server):
+    r = urequests.get(server.url + "/chunked/large")
+    buf = bytearray(1000)
+    total = bytearray()
+    while True:
+        n = r.readinto(buf)
+        if not n:
+            break
+        total.extend(buf[:n])
+    assert total == BIG[:100] + BIG + b"x"
@@ -0,0 +1,154 @@
+"""Tests for the asyncio runtime, on the simulated board and a local server.
+
+The server holds each reply until the test releases it, and the runtime's
+sleeps run the sim clock on, so nothing here waits on real time; the
+real-time limit in _until() only guards against a hang.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+WEATHER = (Path(__file__).parent / "data" / "weather.json").read_bytes()
+
+
+class HeldHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests += 1
+        self.server.release.wait(10)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(WEATHER)))
+        self.end_headers()
+        try:
+            self.wfile.write(WEATHER)
+        except BrokenPipeError:
+            pass  # client was cancelled mid-request
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), HeldHandler)
+    srv.daemon_threads = True
+    srv.requests = 0
+    srv.release = threading.Event()
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.release.set()
+    srv.shutdown()
+
+
+@pytest.fixture
+def host(device, monkeypatch, server, tmp_path):
+    """Just enough of main.py's loop to drive runtime.main()."""
+    import sim
+
+    monkeypatch.chdir(tmp_path)  # weather cache goes here
+    for m in ("runtime", "app_weather", "arequests"):
+        sys.modules.pop(m, None)
+    import app_weather
+    import runtime
+
+    sim.clock_runtime(runtime)
+    monkeypatch.setattr(app_weather, "_URL", "http://127.0.0.1:%d/v1/forecast" % server.server_port)
+
+    class Host:
+        switch_requested = False
+        switches = 0
+        app = app_weather
+
+        def tick(self):
+            if self.switch_requested:
+                self.switch_requested = False
+                self.switches += 1
+                self.app = Idle
+                return 0
+            return self.app.update(*self.args)
+
+    class Idle:
+        __name__ = "idle"
+
+        @staticmethod
+        def update(*args):
+            return 20
+
+    h = Host()
+    h.device = device
+    h.display = device.display
+    h.args = device.args
+    h.runtime = runtime
+    app_weather.init(*h.args)
+    return h
+
+
+def _run(h, script):
+    """Run runtime.main() alongside the coroutine script()."""
+
+    async def go():
+        main = asyncio.create_task(h.runtime.main(h.tick, lambda: h.switch_requested, lambda: h.app, h.args))
+        try:
+            await script()
+        finally:
+            main.cancel()
+            try:
+                await main
+            except asyncio.CancelledError:
+                pass
+
+    asyncio.run(go())
+
+
+async def _until(done, limit_s=5):
+    """Let the loop run until done()."""
+    start = time.monotonic()
+    while not done():
+        assert time.monotonic() - start < limit_s, "timed out"
+        await asyncio.sleep(0)
+
+
+def test_fetch_in_background_keeps_ui_running(host, server):
+    """The spinner keeps drawing while the request is in flight."""
+    import app_weather
+
+    clock = host.device.clock
+
+    async def script():
+        await _until(lambda: clock.ms >= 300 and server.requests == 1)
+        assert app_weather._fetching
+        assert host.display.frames >= 3  # init + spinner frames
+        server.release.set()
+        await _until(lambda: app_weather._data is not None and not app_weather._fetching)
+
+    _run(host, script)
+    assert app_weather._data["current"]["temperature_2m"] == 22.4
+
+
+def test_switch_while_fetch_in_flight(host, server):
+    """A switch is handled at once and cancels the pending fetch."""
+    import app_weather
+
+    clock = host.device.clock
+
+    async def script():
+        await _until(lambda: clock.ms >= 200)
+        assert app_weather._fetching
+        host.switch_requested = True  # as main.py's button A IRQ does
+        host.runtime.wake()
+        woke = clock.ms
+        await _until(lambda: host.switches == 1)
+        assert clock.ms - woke < app_weather._SPIN_MS  # didn't sleep out the spinner's delay
+        await _until(lambda: not app_weather._fetching)  # the run() task was cancelled
+
+    _run(host, script)
+    assert not server.release.is_set()  # the reply never came
+    assert app_weather._data is None
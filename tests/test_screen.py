@@ -0,0 +1,81 @@
+"""Tests for the dirty-region Screen wrapper, over the simulated panel."""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from screen import Screen
+
+
+def test_clear_pushes_full_frame(device):
+    s, d = device.display, device.panel
+    s.clear()
+    s.text("hello", 10, 10, 320, 2)
+    s.update()
+    assert s.frame_pixels == 320 * 240
+    assert d.calls["update"] == 1
+
+
+def test_partial_update_pushes_only_damage(device):
+    d = device.panel
+    d.partial = True  # a driver that implements partial_update()
+    s = Screen(d, partial=True)
+    s.clear_rect(268, 70, 52, 24, 0)
+    s.text(":42", 268, 70, 320, 3)
+    s.update()
+    assert s.frame_pixels == 52 * 24
+    assert d.calls["partial_update"] == 1 and "update" not in d.calls
+    assert d.pushed == 52 * 24
+
+
+def test_nothing_dirty_pushes_nothing(device):
+    s, d = device.display, device.panel
+    s.update()
+    assert s.frame_pixels == 0
+    assert d.calls == {}
+
+
+def test_overlapping_rects_merge(device):
+    s = device.display
+    s.rectangle(0, 0, 10, 10)
+    s.rectangle(5, 5, 10, 10)
+    s.rectangle(100, 100, 4, 4)
+    assert s._dirty == [[0, 0, 15, 15], [100, 100, 4, 4]]
+
+
+def test_partial_pushes_are_opt_in(device):
+    # PicoGraphics always has partial_update(); the LCD drivers ignore it
+    s, d = device.display, device.panel
+    s.rectangle(0, 0, 10, 10)
+    s.update()
+    assert s.frame_pixels == 320 * 240
+    assert d.calls["update"] == 1 and "partial_update" not in d.calls
+    assert (d.panel == d.fb).all()
+
+
+def test_clear_rect_restores_pen(device):
+    s, d = device.display, device.panel
+    s.set_pen(7)
+    s.clear_rect(0, 0, 10, 10, 3)
+    assert (d.fb[:10, :10] == 3).all()
+    assert d.pen == 7
+
+
+def test_overlay_hook_draws_before_each_push(device):
+    s, d = device.display, device.panel
+    seen = []
+
+    def overlay(screen):
+        seen.append(d.calls.get("update", 0))
+        screen.set_pen(9)
+        screen.rectangle(0, 0, 4, 4)
+
+    s.overlay = overlay
+    s.set_pen(7)
+    s.update()
+    assert seen == []  # nothing to push, nothing drawn
+    s.rectangle(100, 100, 10, 10)
+    s.update()
+    assert seen == [0] and d.calls["update"] == 1
+    assert (d.panel[:4, :4] == 9).all()
+    assert d.pen == 7  # the app's pen is back
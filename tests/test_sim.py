@@ -0,0 +1,184 @@
+"""Tests for the headless hardware stand-ins in sim/."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "src"))
+import quotelayout
+import sim
+from sim import machine
+from sim.clock import Clock
+from sim.picographics import PicoGraphics, diff, rgb565
+from sim.pimoroni import Button
+
+APPS = ["app_clock", "app_quotes", "app_timer", "app_pong", "app_react"]  # no network
+
+
+def test_ticks_wrap():
+    c = Clock(ticks=(1 << 30) - 5)
+    a = c.ticks_ms()
+    c.advance(10)
+    b = c.ticks_ms()
+    assert b < a
+    assert c.ticks_diff(b, a) == 10
+    assert c.ticks_diff(a, b) == -10
+    assert c.ticks_add(a, 10) == b
+
+
+def test_events_fire_in_order_at_their_time():
+    c = Clock()
+    seen = []
+    c.at(30, lambda: seen.append(("b", c.ms)))
+    c.at(10, lambda: seen.append(("a", c.ms)))
+    c.sleep_ms(20)
+    assert seen == [("a", 10)]
+    c.sleep(0.05)
+    assert seen == [("a", 10), ("b", 30)]
+    assert c.ms == 70
+
+
+def test_localtime_is_utc_8_tuple():
+    c = Clock(start=Clock.mktime((2026, 3, 1, 12, 30, 0, 0, 0)))
+    c.advance(90_000)
+    assert c.localtime() == (2026, 3, 1, 12, 31, 30, 6, 60)
+
+
+def test_button_read_repeats_while_held(device):
+    clock = device.clock
+    b = Button(13)
+    assert not b.read()
+    machine.drive(13, 0)
+    assert b.read() and b.is_pressed
+    assert not b.read()
+    clock.advance(201)
+    assert b.read()  # auto-repeat
+    machine.drive(13, 1)
+    assert not b.read() and not b.is_pressed
+
+
+def test_pin_irq_edges(device):
+    edges = []
+    pin = machine.Pin(12, machine.Pin.IN, machine.Pin.PULL_UP)
+    pin.irq(trigger=machine.Pin.IRQ_FALLING, handler=lambda p: edges.append(p.value()))
+    device.press("A", at=5, hold=20)
+    device.clock.advance(100)
+    assert edges == [0]
+    pin.irq(handler=None)
+    device.press("A", at=200)
+    device.clock.advance(200)
+    assert edges == [0]
+
+
+def test_drawing():
+    d = PicoGraphics()
+    d.set_pen(d.create_pen(255, 0, 0))
+    d.rectangle(-5, -5, 10, 10)
+    assert d.pixels == 25
+    assert (d.fb[:5, :5] == rgb565(255, 0, 0)).all()
+    d.circle(100, 100, 10)
+    assert 300 < d.pixels - 25 < 330  # ~pi r^2
+    before = d.pixels
+    d.triangle(0, 100, 20, 100, 0, 120)
+    assert 200 < d.pixels - before < 240
+    assert d.measure_text("Hi there", 2) == quotelayout.width("Hi there", 2)
+    assert d.calls == {"create_pen": 1, "set_pen": 1, "rectangle": 1, "circle": 1, "triangle": 1}
+    assert d.draw_calls() == 3
+
+
+def test_text_wraps_at_words():
+    d = PicoGraphics()
+    d.set_pen(1)
+    d.text("aaa bbb", 0, 0, d.measure_text("aaa b", 1), 1)
+    rows = np.flatnonzero(d.fb.any(axis=1))
+    assert rows[0] == 0 and rows[-1] == 15  # two 8 px lines
+
+
+def test_partial_update_leaves_missed_areas_stale():
+    d = PicoGraphics(partial=True)
+    d.set_pen(5)
+    d.rectangle(0, 0, 20, 20)
+    d.rectangle(100, 100, 20, 20)
+    d.partial_update(0, 0, 20, 20)
+    assert diff(d.panel, d.fb) == (400, (100, 100, 20, 20))
+    d.update()
+    assert diff(d.panel, d.fb) == (0, None)
+
+
+def test_partial_update_is_a_no_op_on_the_lcd():
+    d = PicoGraphics()  # the ST7789 driver, as on the Pico Display 2
+    d.set_pen(5)
+    d.rectangle(0, 0, 20, 20)
+    d.partial_update(0, 0, 20, 20)
+    assert diff(d.panel, d.fb) == (400, (0, 0, 20, 20))
+    assert d.pushed == 0
+
+
+@pytest.mark.parametrize("name", APPS)
+def test_app_runs_headless(device, monkeypatch, name):
+    monkeypatch.chdir(ROOT / "data")  # app_quotes reads quotes_gz/
+    device.record = True
+    app = device.load(name)
+    for t in (1000, 1500, 8000, 8100):
+        device.press("X", at=t)
+    device.run(app, 130_000)  # two minute changes for the clocks
+    assert device.updates > 2
+    assert device.panel.updates >= 1
+    assert device.panel.frames
+    assert device.panel.draw_calls() > 0
+
+
+def test_clock_frames_diff_by_minute(device):
+    device.record = True
+    app = device.load("app_clock")
+    device.run(app, 61_000)
+    frames = device.panel.frames
+    changed = [diff(a, b) for a, b in zip(frames, frames[1:])]
+    assert any(n for n, _ in changed)
+
+
+def test_clock_colon_where_text_drew_it(device):
+    app = device.load("app_clock")
+    device.run(app, 100)
+    # The blitted colon stays in the old text(":", 118, 50) cell and is as
+    # wide as the font's ':' less its 1 px spacing
+    ink = (quotelayout.ADVANCE[ord(":") - 32] - 1) * app._SCALE
+    g = app._glyphs[":"]
+    assert (app._COLON_X, app._COLON_Y) == (118, 50)
+    assert max(g[i] + g[i + 2] for i in range(0, len(g), 4)) == ink == app._COLON_W
+
+
+def test_run_main_boots_and_switches_apps():
+    def press_a(clock):
+        clock.at(5000, lambda: machine.drive(12, 0))
+        clock.at(5100, lambda: machine.drive(12, 1))
+
+    try:
+        g = sim.run_main(8000, setup=press_a)
+        assert g["app_names"][g["current_app_idx"]] == "Quotes"
+        assert "Clock" in g["wakeup_rates"]
+        assert g["display"].frames > 0
+    finally:
+        sim.uninstall()
+
+
+def test_blocking_loop_sleeps_until_deadline_or_irq(monkeypatch):
+    def setup(clock):
+        monkeypatch.setitem(sys.modules, "runtime", None)  # firmware without asyncio
+        clock.at(30_000, lambda: machine.drive(12, 0))
+        clock.at(30_100, lambda: machine.drive(12, 1))
+
+    try:
+        g = sim.run_main(31_000, setup=setup)
+        assert not g["USE_ASYNC"]
+        # Woken by the deadline timer or the IRQ only, not a 10 ms poll
+        assert g["wakeup_rates"]["Clock"] <= g["update_rates"]["Clock"] * 1.5
+        assert g["wakeup_rates"]["Clock"] < 10
+        assert g["app_names"][g["current_app_idx"]] == "Quotes"
+        assert g["_loaded_at"] - 30_100 < 5  # the release's IRQ ended the sleep
+    finally:
+        sim.uninstall()
@@ -0,0 +1,59 @@
+"""Tests for app_timer's countdown pie, run on the simulated board."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from screen import Screen
+
+
+def _countdown(device, minutes):
+    """Start a countdown of minutes; yields after each second's update()."""
+    timer = device.load("app_timer")
+    while timer._duration_options[timer._duration_idx] != minutes:
+        device.press("Y")
+        device.run(timer, 200)
+    device.press("X")
+    device.run(timer, 100)
+    assert timer._running
+    while not timer._finished:
+        device.run(timer, 1000)
+        yield timer
+
+
+@pytest.mark.parametrize("partial", [False, True])
+def test_ticks_paint_what_a_full_redraw_would(device, partial):
+    """What reaches the LCD after each tick is what a full redraw shows.
+    With partial pushes, that checks the tick's dirty rects too."""
+    panel = device.panel
+    if partial:
+        panel.partial = True
+        device.display = Screen(panel, partial=True)
+    colours = set()
+    for timer in _countdown(device, 1):
+        if timer._finished:
+            break
+        ticked = panel.panel.copy()
+        timer._draw_screen(device.display, device.colors, device.WIDTH, device.HEIGHT)
+        assert (panel.panel == ticked).all(), timer._remaining
+        colours.add(timer._pie_pen)
+    assert len(colours) == 3  # green, yellow and red repaints were crossed
+
+
+def test_tick_draws_a_handful(device):
+    panel = device.panel
+    calls = []
+    for timer in _countdown(device, 5):
+        before = panel.draw_calls()
+        pen = timer._pie_pen
+        device.run(timer, 1000)
+        if timer._finished or timer._pie_pen != pen:
+            continue
+        calls.append(panel.draw_calls() - before)
+        if len(calls) == 120:
+            break
+    # Slice, digits box, the wedge under it (up to 6), digits, bar end, push
+    assert max(calls) <= 11
+    assert sum(calls) / len(calls) <= 8
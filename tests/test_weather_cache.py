@@ -0,0 +1,88 @@
+"""Tests for the weather app's on-flash forecast cache."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+WEATHER = json.loads((Path(__file__).parent / "data" / "weather.json").read_bytes())
+
+
+@pytest.fixture
+def weather(device, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    sys.modules.pop("app_weather", None)
+    import app_weather
+
+    return app_weather
+
+
+def _init(app, device):
+    """init() app; returns the texts it drew."""
+    device.panel.reset_stats()
+    app.init(*device.args)
+    return device.panel.texts
+
+
+def _switch_back():
+    """main.py unloads the module on a switch; importing it again starts clean."""
+    sys.modules.pop("app_weather", None)
+    import app_weather
+
+    return app_weather
+
+
+def test_cached_forecast_drawn_on_init(weather, device, tmp_path):
+    assert "Loading..." in _init(weather, device)
+    assert weather._refresh
+
+    weather._got(WEATHER)
+    assert json.loads((tmp_path / "weather.json").read_text())[1] == WEATHER
+    assert not (tmp_path / "weather.tmp").exists()
+
+    app = _switch_back()
+    texts = _init(app, device)
+    assert "Loading..." not in texts
+    assert "%sC" % WEATHER["current"]["temperature_2m"] in texts
+    assert not app._refresh  # fresh enough: no fetch
+
+
+def test_stale_cache_drawn_then_refreshed(weather, device):
+    _init(weather, device)
+    weather._got(WEATHER)
+
+    app = _switch_back()
+    device.clock.advance(11 * 60_000)
+    texts = _init(app, device)
+    assert "%sC" % WEATHER["current"]["temperature_2m"] in texts
+    assert app._refresh
+
+    # A failed refresh keeps the old forecast on screen
+    app._failed(OSError("offline"))
+    assert app._data == WEATHER
+
+
+def test_saves_rate_limited(weather, device, tmp_path):
+    clock = device.clock
+    _init(weather, device)
+    weather._got(WEATHER)
+    written = (tmp_path / "weather.json").read_text()
+
+    newer = dict(WEATHER, current=dict(WEATHER["current"], temperature_2m=99.9))
+    clock.advance(10 * 60_000)
+    weather._got(newer)
+    assert (tmp_path / "weather.json").read_text() == written
+    assert weather._data == newer  # shown, just not written
+
+    clock.advance(weather._SAVE_INTERVAL * 1000)
+    weather._got(newer)
+    assert json.loads((tmp_path / "weather.json").read_text()) == [clock.time(), newer]
+
+
+def test_corrupt_cache_ignored(weather, device, tmp_path):
+    (tmp_path / "weather.json").write_text('[1, {"current"')
+    assert "Loading..." in _init(weather, device)
+    assert weather._refresh